@@ -0,0 +1,59 @@
+"""
+Compares how the sync and async clients scale with the number of concurrent searches.
+
+Every search goes to a local fake SauceNao that answers after a fixed latency,
+so the throughput shows the client overhead on top of the waiting.
+
+    $ python benchmarks/concurrency.py --latency 0.05 --searches 200
+"""
+
+import argparse
+import asyncio
+import io
+import time
+
+from saucenaopie import AsyncSauceNao, SauceNao
+from saucenaopie.testing import FakeSauceNao
+
+
+def run_sync(fake: FakeSauceNao, searches: int, workers: int) -> float:
+    client = SauceNao("api_key", trusted_parsing=True, transport=fake.transport())
+    files = (io.BytesIO(b"image") for _ in range(searches))
+    started = time.perf_counter()
+    for _, result in client.search_many(files, workers=workers):
+        if isinstance(result, Exception):
+            raise result
+    return time.perf_counter() - started
+
+
+async def run_async(fake: FakeSauceNao, searches: int, concurrency: int) -> float:
+    client = AsyncSauceNao("api_key", trusted_parsing=True, transport=fake.async_transport())
+    files = (io.BytesIO(b"image") for _ in range(searches))
+    started = time.perf_counter()
+    async for _, result in client.search_many(files, concurrency=concurrency):
+        if isinstance(result, Exception):
+            raise result
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.05, help="Server latency in seconds")
+    parser.add_argument("--searches", type=int, default=200)
+    args = parser.parse_args()
+
+    # No limits, the quota handling is not what is measured here
+    fake = FakeSauceNao(latency=args.latency, short_limit=10**9, long_limit=10**9)
+    for concurrency in (1, 4, 16, 64):
+        searches = min(args.searches, concurrency * 20)
+        sync_elapsed = run_sync(fake, searches, concurrency)
+        async_elapsed = asyncio.run(run_async(fake, searches, concurrency))
+        print(
+            f"concurrency {concurrency:>2}: sync {searches / sync_elapsed:7.1f}/s, "
+            f"async {searches / async_elapsed:7.1f}/s "
+            f"(ideal {concurrency / args.latency:7.1f}/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Measures how long AsyncSauceNao blocks the event loop per search.
+
+Runs concurrent searches against FakeSauceNao, which serves pre-encoded responses,
+and measures the CPU time of every callback the event loop runs. The longest ones
+are the steps of a search that kept the loop busy, like parsing or reading a file.
+The ticker lag shows how late a 1 ms timer fires, which also grows with the number
+of ready callbacks and with the executor threads holding the GIL.
+
+    $ python benchmarks/event_loop.py --file image.png --results 100 --parse-threshold 0
+"""
+
+import argparse
+import asyncio
+import io
+import time
+from pathlib import Path
+from typing import List
+
+from saucenaopie import AsyncSauceNao
+from saucenaopie.testing import FakeSauceNao
+
+
+def time_loop_steps(durations: List[float]) -> None:
+    """Record the CPU time of every event loop callback, without the time spent waiting for the GIL."""
+    run = asyncio.Handle._run
+
+    def timed_run(handle: asyncio.Handle) -> None:
+        started = time.thread_time()
+        run(handle)
+        durations.append(time.thread_time() - started)
+
+    asyncio.Handle._run = timed_run
+
+
+def format_percentiles(values: List[float]) -> str:
+    values = sorted(values)
+    return (
+        f"p50 {values[len(values) // 2] * 1000:.2f} ms, "
+        f"p99 {values[int(len(values) * 0.99)] * 1000:.2f} ms, max {values[-1] * 1000:.2f} ms"
+    )
+
+
+async def ticker(lags: List[float], stop: asyncio.Event, interval: float = 0.001) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--file", type=Path, help="Image to upload, 1 MiB of zeros by default")
+    parser.add_argument("--searches", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--results", type=int, default=100, help="Results per response")
+    parser.add_argument("--parse-threshold", type=int, default=None)
+    args = parser.parse_args()
+
+    content = bytes(1024 * 1024)
+    fake = FakeSauceNao(
+        latency=0.005,
+        result_count=args.results,
+        short_limit=args.searches,
+        long_limit=args.searches,
+    )
+    client = AsyncSauceNao(
+        "api_key", parse_threshold=args.parse_threshold, transport=fake.async_transport()
+    )
+    if args.file:
+        files = (args.file for _ in range(args.searches))
+    else:
+        files = (io.BytesIO(content) for _ in range(args.searches))
+
+    steps: List[float] = []
+    time_loop_steps(steps)
+    lags: List[float] = []
+    stop = asyncio.Event()
+    tick = asyncio.ensure_future(ticker(lags, stop))
+    started = time.perf_counter()
+    async for _, result in client.search_many(
+        files, concurrency=args.concurrency, result_limit=args.results
+    ):
+        if isinstance(result, Exception):
+            raise result
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await tick
+    await client.close()
+
+    print(f"{args.searches} searches in {elapsed:.2f}s ({args.searches / elapsed:.0f}/s)")
+    print(f"Event loop steps: {format_percentiles(steps)}")
+    print(f"Ticker lag: {format_percentiles(lags)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
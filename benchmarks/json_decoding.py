@@ -0,0 +1,51 @@
+"""
+Compares the JSON decoders on big search responses.
+
+    $ python benchmarks/json_decoding.py
+"""
+
+import json
+import timeit
+from typing import Any, Callable, Dict
+
+import httpx
+
+from saucenaopie.testing import make_payload
+
+
+def get_decoders() -> Dict[str, Callable[[bytes], Any]]:
+    decoders: Dict[str, Callable[[bytes], Any]] = {
+        "response.json()": lambda content: httpx.Response(200, content=content).json(),
+        "json.loads": json.loads,
+    }
+    try:
+        import orjson
+
+        decoders["orjson"] = orjson.loads
+    except ImportError:
+        print("orjson is not installed, skipping it")
+    try:
+        import msgspec
+
+        decoders["msgspec"] = msgspec.json.decode
+    except ImportError:
+        print("msgspec is not installed, skipping it")
+
+    return decoders
+
+
+def main() -> None:
+    decoders = get_decoders()
+    for result_count in (8, 100, 500):
+        content = json.dumps(make_payload(result_count), ensure_ascii=False).encode()
+        print(f"{result_count} results, {len(content) / 1024:.0f} KiB:")
+        baseline = None
+        for name, decode in decoders.items():
+            number, total = timeit.Timer(lambda: decode(content)).autorange()
+            elapsed = total / number
+            baseline = baseline or elapsed
+            print(f"  {name:>16}: {elapsed * 1e6:8.1f} us ({baseline / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
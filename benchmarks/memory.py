@@ -0,0 +1,41 @@
+"""
+Measures the memory held by a parsed response in every parsing mode.
+
+    $ python benchmarks/memory.py --results 8
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from saucenaopie import SauceNao
+from saucenaopie.testing import make_payload
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--responses", type=int, default=1000)
+    parser.add_argument("--results", type=int, default=8, help="Results per response")
+    args = parser.parse_args()
+
+    clients = {
+        "validated": SauceNao("api_key"),
+        "trusted": SauceNao("api_key", trusted_parsing=True),
+        "lazy": SauceNao("api_key", lazy_results=True),
+    }
+    for name, client in clients.items():
+        # Decode every response anew, like the client does, so nothing is shared between them
+        payloads = [make_payload(args.results) for _ in range(args.responses)]
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        responses = [client._parse_response_data(data) for data in payloads]
+        held = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        del responses, payloads
+
+        print(f"{name:>9}: {held / args.responses / 1024:6.1f} KiB/response on top of the data")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Compares the response parsing modes: validated, trusted and lazy.
+Every parsed response has its best result read, like most callers do.
+
+    $ python benchmarks/parsing.py
+"""
+
+import timeit
+
+from saucenaopie import SauceNao
+from saucenaopie.testing import make_payload
+
+
+def main() -> None:
+    clients = {
+        "validated": SauceNao("api_key"),
+        "trusted": SauceNao("api_key", trusted_parsing=True),
+        "lazy": SauceNao("api_key", lazy_results=True),
+        "lazy+trusted": SauceNao("api_key", trusted_parsing=True, lazy_results=True),
+    }
+    for result_count in (8, 100):
+        data = make_payload(result_count)
+        expected = clients["validated"]._parse_response_data(data).dict()
+        assert all(c._parse_response_data(data).dict() == expected for c in clients.values())
+
+        baseline = None
+        for name, client in clients.items():
+            number, total = timeit.Timer(
+                lambda: client._parse_response_data(data).results[0]
+            ).autorange()
+            elapsed = total / number
+            baseline = baseline or elapsed
+            print(
+                f"{result_count:>3} results, {name:>12}: {elapsed * 1e6:8.1f} us/response "
+                f"({baseline / elapsed:.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
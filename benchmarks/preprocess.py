@@ -0,0 +1,64 @@
+"""
+Measures how much the image preprocessing saves on uploads.
+
+Pass some image files to see the size reduction and the time spent on re-encoding.
+With an API key, every image is searched twice, as is and preprocessed,
+to make sure the best match and its similarity stay the same.
+
+    $ python benchmarks/preprocess.py image1.png image2.jpg --api-key KEY
+"""
+
+import argparse
+import io
+import time
+from pathlib import Path
+
+from saucenaopie import SauceNao
+from saucenaopie.preprocess import ImagePreprocessor
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("files", nargs="+", type=Path)
+    parser.add_argument("--api-key", help="Compare the search results, costs 2 searches per file")
+    parser.add_argument("--max-side", type=int, default=1024)
+    parser.add_argument("--format", default="JPEG")
+    parser.add_argument("--quality", type=int, default=85)
+    args = parser.parse_args()
+
+    preprocessor = ImagePreprocessor(
+        max_side=args.max_side, image_format=args.format, quality=args.quality, min_bytes=None
+    )
+    client = SauceNao(args.api_key) if args.api_key else None
+
+    total_before = total_after = 0
+    for path in args.files:
+        content = path.read_bytes()
+        started = time.perf_counter()
+        processed = preprocessor.process(content)
+        elapsed = time.perf_counter() - started
+        total_before += len(content)
+        total_after += len(processed)
+        print(
+            f"{path.name}: {len(content) / 1024:.0f} KiB -> {len(processed) / 1024:.0f} KiB "
+            f"({len(content) / len(processed):.1f}x) in {elapsed * 1000:.0f} ms"
+        )
+
+        if client is not None:
+            original = client.search(io.BytesIO(content))
+            shrunk = client.search(io.BytesIO(processed))
+            for name, sauce in (("original", original), ("processed", shrunk)):
+                if sauce.results:
+                    best = sauce.results[0]
+                    print(f"  {name}: {best.index} {best.similarity:.1f}% {best.data.first_url}")
+                else:
+                    print(f"  {name}: no results")
+
+    if total_after:
+        print(f"Total: {total_before / total_after:.1f}x less to upload")
+    if client is not None:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Compares the memory used by parsed responses and by a ResultTable holding the same results,
+along with the time the table filters take.
+
+    $ python benchmarks/table.py --responses 20000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from saucenaopie import SauceNao
+from saucenaopie.table import ResultTable
+from saucenaopie.testing import make_payload
+from saucenaopie.types.sauce import BooruSauce
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--responses", type=int, default=10000)
+    parser.add_argument("--results", type=int, default=8, help="Results per response")
+    args = parser.parse_args()
+
+    client = SauceNao("api_key", trusted_parsing=True)
+    validated_client = SauceNao("api_key")
+    data = make_payload(args.results)
+    result_count = args.responses * args.results
+
+    gc.collect()
+    tracemalloc.start()
+    responses = [validated_client._parse_response_data(data) for _ in range(args.responses // 100)]
+    response_bytes = tracemalloc.get_traced_memory()[0] * 100
+    del responses
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    table = ResultTable()
+    for _ in range(args.responses):
+        table.add_response(client._parse_response_data(data))
+    table_bytes = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    print(f"{result_count} results from {args.responses} responses")
+    print(f"SauceResponse objects: ~{response_bytes / result_count:.0f} bytes/result")
+    print(f"ResultTable: {table_bytes / result_count:.0f} bytes/result")
+
+    for name, run in (
+        ("get_likely_results", lambda: table.get_likely_results(must_have_url=True)),
+        ("filter_results_by_index", lambda: table.filter_results_by_index([5, 41])),
+        ("filter_results_by_type", lambda: table.filter_results_by_type(BooruSauce)),
+    ):
+        started = time.perf_counter()
+        selected = run()
+        print(
+            f"{name}: {len(selected)} results in {(time.perf_counter() - started) * 1000:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,14 @@ from discord.ext import commands
 from discord.ext.commands import Context
 
 from saucenaopie import AsyncSauceNao
-from saucenaopie.exceptions import ImageInvalid, LongLimitReached, SauceNaoError, ShortLimitReached
+from saucenaopie.exceptions import (
+    ImageInvalid,
+    LongLimitReached,
+    QueueFull,
+    SauceNaoError,
+    ShortLimitReached,
+)
+from saucenaopie.fairqueue import FairQueue
 from saucenaopie.types.response import SauceResponse
 
 BOT_TOKEN = "50:TOKEN"
@@ -17,19 +24,22 @@ intents = Intents.default()
 intents.message_content = True
 
 bot = commands.Bot(command_prefix="!", intents=intents)
-sauce_nao = AsyncSauceNao(api_key=SAUCENAO_API_KEY)
+# Every user gets a fair share of the searches, no matter how many images they send
+sauce_queue = FairQueue(AsyncSauceNao(api_key=SAUCENAO_API_KEY), max_queued_per_tenant=3)
 
 
 async def search_saucenao(ctx: Context, image_url: str) -> Optional[SauceResponse]:
     """Send a search request to the SauceNao API and handle possible errors."""
     try:
-        return await sauce_nao.search(image_url, from_url=True)
+        return await sauce_queue.search(ctx.author.id, image_url, from_url=True)
     except LongLimitReached:
         await ctx.reply("Your SauceNao profile reached its daily limit of **200 searches**.")
     except ShortLimitReached:
         await ctx.reply(
             "Your SauceNao profile reached its short limit, try again in a few seconds."
         )
+    except QueueFull:
+        await ctx.reply("You've sent too many images at once, wait for the results first.")
     except ImageInvalid:
         await ctx.reply("The image is bad, couldn't get its sources.")
     except SauceNaoError:
@@ -4,7 +4,8 @@ from aiogram import Bot, Dispatcher, html
 from aiogram.types import Message
 
 from saucenaopie import AsyncSauceNao
-from saucenaopie.exceptions import ImageInvalid, LimitReached, SauceNaoError
+from saucenaopie.exceptions import ImageInvalid, LimitReached, QueueFull, SauceNaoError
+from saucenaopie.fairqueue import FairQueue
 
 BOT_TOKEN = "50:TOKEN"
 SAUCENAO_API_KEY = "9201r9hhefh"
@@ -18,7 +19,7 @@ async def start_handler(message: Message) -> None:
 
 
 @dp.message(content_types={"photo", "document"})
-async def get_source(message: Message, bot: Bot, saucenao: AsyncSauceNao) -> None:
+async def get_source(message: Message, bot: Bot, sauce_queue: FairQueue) -> None:
     if message.photo:
         # Choose the biggest photo
         file_id = message.photo[-1].file_id
@@ -28,7 +29,8 @@ async def get_source(message: Message, bot: Bot, saucenao: AsyncSauceNao) -> Non
     await bot.send_chat_action(message.from_user.id, "typing")
     bytes_io = await bot.download(file_id)
     try:
-        sauce = await saucenao.search(bytes_io)
+        # Every user gets a fair share of the searches, no matter how many pictures they send
+        sauce = await sauce_queue.search(message.from_user.id, bytes_io)
         results = sauce.get_likely_results(must_have_url=True)
         if results:
             await message.answer(
@@ -45,20 +47,23 @@ async def get_source(message: Message, bot: Bot, saucenao: AsyncSauceNao) -> Non
             await message.answer(
                 "Sorry, the bot has reached its short limit, try again in ~30 seconds."
             )
+    except QueueFull:
+        await message.answer("You've sent too many pictures at once, wait for the results first.")
     except ImageInvalid:
         await message.answer("The image is bad, couldn't get its sources.")
     except SauceNaoError:
         await message.answer("Some unexpected error has occurred while processing this picture.")
 
 
-async def on_shutdown(saucenao: AsyncSauceNao) -> None:
-    await saucenao.close()
+async def on_shutdown(sauce_queue: FairQueue) -> None:
+    await sauce_queue.client.close()
 
 
 def main() -> None:
     bot = Bot(BOT_TOKEN, parse_mode="HTML")
     dp.shutdown.register(on_shutdown)
-    dp.run_polling(bot, saucenao=AsyncSauceNao(api_key=SAUCENAO_API_KEY))
+    sauce_queue = FairQueue(AsyncSauceNao(api_key=SAUCENAO_API_KEY), max_queued_per_tenant=3)
+    dp.run_polling(bot, sauce_queue=sauce_queue)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,130 @@
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+import httpx
+
+from .exceptions import CircuitOpen, SauceNaoError, UnknownServerError
+from .helper import Helper
+
+
+class CircuitState(Helper):
+    CLOSED = "closed"  # Requests are sent as usual
+    OPEN = "open"  # Requests fail right away
+    HALF_OPEN = "half_open"  # A single probe request is sent to see if SauceNao is back
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests while SauceNao is down. After a few server errors or timeouts
+    in a row the circuit opens and the searches fail right away with
+    :class:`saucenaopie.exceptions.CircuitOpen`, instead of waiting for the timeout and adding
+    to the failed requests. Once the recovery timeout passes, a single probe request is let
+    through, the circuit closes if it succeeds and opens again otherwise.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        on_state_change: Optional[Callable[[str, str], None]] = None,
+    ) -> None:
+        """
+        :param failure_threshold: Number of failures in a row that opens the circuit
+        :param recovery_timeout: Seconds to fail the requests for, before a probe is sent
+        :param on_state_change: Called with the old and the new state on every transition
+        """
+        if failure_threshold < 1:
+            raise ValueError("The failure threshold must be at least 1.")
+
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.on_state_change = on_state_change
+        self.failure_count = 0  # Failures in a row
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current state, look at :class:`CircuitState`."""
+        return self._state
+
+    @staticmethod
+    def is_failure(error: BaseException) -> bool:
+        """Check if the error means that SauceNao is not working."""
+        return isinstance(error, (UnknownServerError, httpx.TransportError))
+
+    def before_request(self) -> bool:
+        """
+        Let the request through or reject it.
+
+        :return: True if the request is the probe, pass it to :meth:`record`
+        :raises CircuitOpen: If the circuit is open or the probe request is in flight
+        """
+        with self._lock:
+            if self._state == CircuitState.CLOSED:
+                return False
+            transition = None
+            if self._state == CircuitState.OPEN:
+                if time.monotonic() - self._opened_at < self.recovery_timeout:
+                    raise CircuitOpen("SauceNao is failing, the request wasn't sent.")
+                transition = self._set_state(CircuitState.HALF_OPEN)
+            elif self._probing:
+                raise CircuitOpen("SauceNao is failing, waiting for the probe request.")
+
+            self._probing = True
+
+        self._notify(transition)
+        return True
+
+    def record(self, error: Optional[BaseException] = None, probe: bool = False) -> None:
+        """
+        Record the outcome of a request that was let through.
+
+        :param error: Exception raised by the request, None if it succeeded
+        :param probe: What :meth:`before_request` returned for the request
+        """
+        failed = error is not None and self.is_failure(error)
+        # SauceNao has answered, even if it was an error about the search
+        answered = error is None or isinstance(error, SauceNaoError)
+        transition = None
+        with self._lock:
+            if probe:
+                self._probing = False
+                if failed:
+                    self.failure_count += 1
+                    self._opened_at = time.monotonic()
+                    transition = self._set_state(CircuitState.OPEN)
+                elif answered:
+                    self.failure_count = 0
+                    transition = self._set_state(CircuitState.CLOSED)
+                else:
+                    # The probe was cancelled or failed locally, so the next request probes instead
+                    self._opened_at = time.monotonic() - self.recovery_timeout
+                    transition = self._set_state(CircuitState.OPEN)
+            # Only the probe changes a circuit that isn't closed,
+            # the requests sent before it opened don't
+            elif self._state == CircuitState.CLOSED:
+                if failed:
+                    self.failure_count += 1
+                    if self.failure_count >= self.failure_threshold:
+                        self._opened_at = time.monotonic()
+                        transition = self._set_state(CircuitState.OPEN)
+                elif answered:
+                    self.failure_count = 0
+
+        self._notify(transition)
+
+    def _set_state(self, state: str) -> Optional[Tuple[str, str]]:
+        if state == self._state:
+            return None
+
+        old_state, self._state = self._state, state
+        return old_state, state
+
+    def _notify(self, transition: Optional[Tuple[str, str]]) -> None:
+        # Called without the lock, so the callback may use the breaker
+        if transition is not None and self.on_state_change is not None:
+            self.on_state_change(*transition)
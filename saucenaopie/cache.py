@@ -0,0 +1,201 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit, urlunsplit
+
+
+class CacheStats:
+    """Cache counters, useful to see how much quota the cache saves."""
+
+    __slots__ = ("hits", "misses", "evictions")
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __repr__(self) -> str:
+        return f"CacheStats(hits={self.hits}, misses={self.misses}, evictions={self.evictions})"
+
+
+class BaseCache(ABC):
+    """
+    Base search cache. It stores raw SauceNao response data,
+    so the cached responses are parsed the same way as fresh ones.
+    """
+
+    blocking = True  # Whether the async client should access the cache from a thread
+
+    def __init__(self) -> None:
+        self.stats = CacheStats()
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get the response data by its key, None if it's missing or expired."""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, data: Dict[str, Any]) -> None:
+        """Store the response data."""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove all the stored responses."""
+        pass
+
+    def close(self) -> None:
+        """Release the resources held by the cache."""
+        pass
+
+
+class MemoryCache(BaseCache):
+    """In-memory LRU cache with size and TTL eviction."""
+
+    blocking = False
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 86400.0) -> None:
+        """
+        :param maxsize: Maximum number of stored responses
+        :param ttl: Seconds to keep a response for, None to keep it until it's evicted by size
+        """
+        super().__init__()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.stats.misses += 1
+                return None
+
+            created, data = item
+            if self.ttl is not None and time.monotonic() - created > self.ttl:
+                del self._data[key]
+                self.stats.evictions += 1
+                self.stats.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.stats.hits += 1
+            return data
+
+    def set(self, key: str, data: Dict[str, Any]) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic(), data)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.stats.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class SQLiteCache(BaseCache):
+    """On-disk cache that survives restarts, backed by SQLite."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        maxsize: Optional[int] = None,
+        ttl: Optional[float] = 86400.0,
+    ) -> None:
+        """
+        :param path: Database file path, it's created if missing
+        :param maxsize: Maximum number of stored responses, None for no limit
+        :param ttl: Seconds to keep a response for, None to keep it forever
+        """
+        super().__init__()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(path), check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS sauce_cache "
+            "(key TEXT PRIMARY KEY, data TEXT NOT NULL, created REAL NOT NULL, used REAL NOT NULL)"
+        )
+        self._connection.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT data, created FROM sauce_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+
+            now = time.time()
+            if self.ttl is not None and now - row[1] > self.ttl:
+                self._connection.execute("DELETE FROM sauce_cache WHERE key = ?", (key,))
+                self._connection.commit()
+                self.stats.evictions += 1
+                self.stats.misses += 1
+                return None
+
+            self._connection.execute("UPDATE sauce_cache SET used = ? WHERE key = ?", (now, key))
+            self._connection.commit()
+            self.stats.hits += 1
+            return json.loads(row[0])
+
+    def set(self, key: str, data: Dict[str, Any]) -> None:
+        with self._lock:
+            now = time.time()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO sauce_cache (key, data, created, used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(data), now, now),
+            )
+            if self.maxsize is not None:
+                cursor = self._connection.execute(
+                    "DELETE FROM sauce_cache WHERE key IN (SELECT key FROM sauce_cache "
+                    "ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                    (self.maxsize,),
+                )
+                self.stats.evictions += max(cursor.rowcount, 0)
+            self._connection.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM sauce_cache")
+            self._connection.commit()
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+def normalize_url(url: str) -> str:
+    """Normalize the URL, so the same image URL always gets the same cache key."""
+    parts = urlsplit(url.strip())
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", parts.query, "")
+    )
+
+
+def make_cache_key(source: Union[bytes, str], params: Dict[str, Any]) -> str:
+    """
+    Make a cache key from the uploaded bytes or the image URL and the search params.
+
+    :param source: Uploaded file content or the image URL
+    :param params: Search params that affect the results, like db and numres
+    """
+    if isinstance(source, str):
+        digest = hashlib.sha256(b"url:" + normalize_url(source).encode())
+    else:
+        digest = hashlib.sha256(b"file:")
+        digest.update(source)
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
@@ -0,0 +1,246 @@
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import httpx
+
+# Headers that describe the original encoding, the stored body is already decoded
+_SKIPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+def make_fingerprint(request: httpx.Request) -> str:
+    """
+    Make a fingerprint of the search request. The API key and the random
+    multipart boundary are left out, so the same search always gets the same one.
+    """
+    digest = hashlib.sha256(f"{request.method} {request.url.path}".encode())
+    params = sorted((k, v) for k, v in request.url.params.multi_items() if k != "api_key")
+    digest.update(json.dumps(params).encode())
+
+    content = request.content
+    content_type = request.headers.get("Content-Type", "")
+    if "boundary=" in content_type:
+        content = content.replace(content_type.split("boundary=", 1)[1].encode(), b"")
+    digest.update(content)
+    return digest.hexdigest()
+
+
+class CassetteEntry:
+    """A recorded response."""
+
+    __slots__ = ("fingerprint", "status_code", "headers", "content", "latency")
+
+    def __init__(
+        self,
+        fingerprint: str,
+        status_code: int,
+        headers: List[Tuple[str, str]],
+        content: bytes,
+        latency: float,
+    ) -> None:
+        self.fingerprint = fingerprint
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.latency = latency
+
+    def to_response(self) -> httpx.Response:
+        return httpx.Response(self.status_code, headers=self.headers, content=self.content)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "fingerprint": self.fingerprint,
+            "status_code": self.status_code,
+            "headers": self.headers,
+            "latency": round(self.latency, 6),
+        }
+        try:
+            data["text"] = self.content.decode()
+        except UnicodeDecodeError:
+            data["base64"] = base64.b64encode(self.content).decode()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CassetteEntry":
+        if "text" in data:
+            content = data["text"].encode()
+        else:
+            content = base64.b64decode(data["base64"])
+        return cls(
+            data["fingerprint"],
+            data["status_code"],
+            [tuple(header) for header in data["headers"]],
+            content,
+            data["latency"],
+        )
+
+
+class Cassette:
+    """
+    Recorded SauceNao responses, stored as gzipped JSON lines.
+    Responses to the same request are replayed in the recorded order, over and over.
+    """
+
+    def __init__(self, entries: Optional[List[CassetteEntry]] = None) -> None:
+        self.entries: List[CassetteEntry] = []
+        self._by_fingerprint: Dict[str, List[CassetteEntry]] = {}
+        self._positions: Dict[Optional[str], int] = {}
+        self._lock = threading.Lock()
+        for entry in entries or ():
+            self.add(entry)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "Cassette":
+        """Load the cassette from the file."""
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return cls([CassetteEntry.from_dict(json.loads(line)) for line in f if line.strip()])
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the cassette to the file, replacing it."""
+        with self._lock:
+            lines = [json.dumps(entry.to_dict(), ensure_ascii=False) for entry in self.entries]
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.writelines(line + "\n" for line in lines)
+
+    def add(self, entry: CassetteEntry) -> None:
+        with self._lock:
+            self.entries.append(entry)
+            self._by_fingerprint.setdefault(entry.fingerprint, []).append(entry)
+
+    def find(self, fingerprint: str, fallback: bool = False) -> Optional[CassetteEntry]:
+        """
+        Get the next recorded response to the request.
+
+        :param fingerprint: Request fingerprint
+        :param fallback: Return the next recorded response of any request if there's no match
+        """
+        with self._lock:
+            entries = self._by_fingerprint.get(fingerprint)
+            key: Optional[str] = fingerprint
+            if entries is None:
+                if not fallback or not self.entries:
+                    return None
+                entries, key = self.entries, None
+
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            return entries[position % len(entries)]
+
+
+class RecordingTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """
+    Sends the requests through the real transport and records the responses to the cassette.
+    Works with both clients: `SauceNao(api_key, transport=RecordingTransport(cassette))`.
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        transport: Union[httpx.BaseTransport, httpx.AsyncBaseTransport, None] = None,
+    ) -> None:
+        """
+        :param cassette: Cassette to record to, save it once you're done
+        :param transport: Transport that sends the requests, the default httpx one if None
+        """
+        self.cassette = cassette
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self._transport is None:
+            self._transport = httpx.HTTPTransport()
+
+        request.read()
+        started = time.perf_counter()
+        response = self._transport.handle_request(request)
+        try:
+            content = response.read()
+        finally:
+            response.close()
+        return self._record(request, response, content, time.perf_counter() - started)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self._transport is None:
+            self._transport = httpx.AsyncHTTPTransport()
+
+        await request.aread()
+        started = time.perf_counter()
+        response = await self._transport.handle_async_request(request)
+        try:
+            content = await response.aread()
+        finally:
+            await response.aclose()
+        return self._record(request, response, content, time.perf_counter() - started)
+
+    def _record(
+        self, request: httpx.Request, response: httpx.Response, content: bytes, latency: float
+    ) -> httpx.Response:
+        headers = [
+            (name, value)
+            for name, value in response.headers.items()
+            if name.lower() not in _SKIPPED_HEADERS
+        ]
+        entry = CassetteEntry(
+            make_fingerprint(request), response.status_code, headers, content, latency
+        )
+        self.cassette.add(entry)
+        return entry.to_response()
+
+    def close(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+
+    async def aclose(self) -> None:
+        if self._transport is not None:
+            await self._transport.aclose()
+
+
+class ReplayTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """
+    Serves the recorded responses without touching the network. The responses go through
+    the same processing as the real ones, including the limit errors, so it's good
+    for load testing: `AsyncSauceNao(api_key, transport=ReplayTransport(cassette))`.
+    """
+
+    def __init__(
+        self, cassette: Cassette, replay_latency: bool = False, fallback: bool = False
+    ) -> None:
+        """
+        :param cassette: Cassette with the recorded responses
+        :param replay_latency: Wait as long as the real request took, instead of answering at once
+        :param fallback: Serve the recorded responses in order to the requests
+         that weren't recorded, instead of failing them
+        """
+        self.cassette = cassette
+        self.replay_latency = replay_latency
+        self.fallback = fallback
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        entry = self._find(request)
+        if self.replay_latency:
+            time.sleep(entry.latency)
+        return entry.to_response()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        entry = self._find(request)
+        if self.replay_latency:
+            await asyncio.sleep(entry.latency)
+        return entry.to_response()
+
+    def _find(self, request: httpx.Request) -> CassetteEntry:
+        entry = self.cassette.find(make_fingerprint(request), self.fallback)
+        if entry is None:
+            raise httpx.TransportError(
+                f"No recorded response to {request.method} {request.url.path}"
+            )
+        return entry
@@ -1,48 +1,409 @@
+import asyncio
+import functools
+import io
+import itertools
+from concurrent.futures import Executor
 from pathlib import Path
-from typing import BinaryIO, Optional, Union
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 import httpx
 
+from ..breaker import CircuitBreaker
+from ..cache import BaseCache
+from ..exceptions import SauceNaoError
 from ..helper import SauceIndex
-from ..types.response import SauceResponse
-from .base import BaseSauceClient, IndexType
+from ..keys import KeyPool
+from ..limiter import RateLimiter
+from ..metrics import MetricsCollector, RequestTimer
+from ..perceptual import PerceptualIndex
+from ..preprocess import ImagePreprocessor
+from ..retry import RetryPolicy
+from ..strategy import CascadeStrategy
+from ..types.response import CascadeResponse, SauceResponse
+from ..validation import UploadValidator
+from .base import BaseSauceClient, IndexesType, IndexType
+
+FileType = TypeVar("FileType", str, Path, BinaryIO)
+
+
+async def _iterate(items: Union[Iterable[FileType], AsyncIterable[FileType]]):
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
 
 
 class AsyncSauceNao(BaseSauceClient):
     def __init__(
         self,
-        api_key: str,
+        api_key: Union[str, Iterable[str], KeyPool],
         test_mode: bool = False,
         timeout: int = 30,
         allow_partial_success: bool = False,
+        rate_limiter: Optional[RateLimiter] = None,
+        cache: Optional[BaseCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        preprocessor: Optional[ImagePreprocessor] = None,
+        trusted_parsing: bool = False,
+        json_loads: Optional[Callable[[bytes], Any]] = None,
+        lazy_results: bool = False,
+        coalesce: bool = False,
+        limits: Optional[httpx.Limits] = None,
+        http2: bool = False,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        metrics: Optional[MetricsCollector] = None,
+        perceptual_index: Optional[PerceptualIndex] = None,
+        validator: Optional[UploadValidator] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        executor: Optional[Executor] = None,
+        parse_threshold: Optional[int] = None,
     ) -> None:
-        super().__init__(api_key, test_mode, timeout, allow_partial_success)
-        self._client = httpx.AsyncClient(
-            base_url=self.base_url, timeout=self.timeout, params=self._default_params
+        """
+        Besides the common arguments, the async client can move blocking work off
+        the event loop. Files are always read in the executor, and so are the image
+        preprocessing, cache key hashing and disk cache access.
+
+        :param executor: Executor for the blocking work, the loop default one if None
+        :param parse_threshold: Parse responses bigger than this number of bytes in the executor,
+         None to always parse them in the event loop. Cached responses are always parsed
+         in the executor if it's set
+        """
+        super().__init__(
+            api_key,
+            test_mode,
+            timeout,
+            allow_partial_success,
+            rate_limiter,
+            cache,
+            retry_policy,
+            preprocessor,
+            trusted_parsing,
+            json_loads,
+            lazy_results,
+            coalesce,
+            limits,
+            http2,
+            transport,
+            metrics,
+            perceptual_index,
+            validator,
+            circuit_breaker,
         )
+        self.executor = executor
+        self.parse_threshold = parse_threshold
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._client = httpx.AsyncClient(**self._get_client_options())
 
     async def close(self):
-        await self._client.aclose()
+        if self.transport is None:  # A passed transport may be shared with other clients
+            await self._client.aclose()
+
+    async def warm_up(self, connections: int = 1) -> None:
+        if connections < 1:
+            raise ValueError("The number of connections must be at least 1.")
+
+        # Concurrent requests can't share a connection, so each of them opens a new one
+        await asyncio.gather(*(self._client.head("/") for _ in range(connections)))
 
     async def search(
         self,
         file: Union[str, Path, BinaryIO],
         *,
-        index: IndexType = SauceIndex.ALL,
+        index: IndexesType = SauceIndex.ALL,
         max_index: Optional[IndexType] = None,
         min_index: Optional[IndexType] = None,
         result_limit: int = 8,
         from_url: bool = False,
     ) -> SauceResponse:
         payload = self._prepare_params(file, index, result_limit, max_index, min_index, from_url)
+        if self.cache is None and not self.coalesce:
+            return await self._search(file, payload, from_url, None)
+
+        if from_url:
+            file, key = self._get_cache_key(file, payload, from_url)
+        else:
+            file, key = await self._run_in_executor(self._get_cache_key, file, payload, from_url)
+
+        cache_key = None
+        if self.cache is not None:
+            if self.cache.blocking:
+                data = await self._run_in_executor(self.cache.get, key)
+            else:
+                data = self.cache.get(key)
+            if data is not None:
+                if self.parse_threshold is None:
+                    sauce = self._parse_response_data(data)
+                else:  # The size of cached data is unknown, so it's always parsed off the loop
+                    sauce = await self._run_in_executor(self._parse_response_data, data)
+                sauce._from_cache = True
+                return sauce
+            cache_key = key
+
+        if not self.coalesce:
+            return await self._search(file, payload, from_url, cache_key)
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._search(file, payload, from_url, cache_key))
+            task.add_done_callback(functools.partial(self._finish_flight, key))
+            self._in_flight[key] = task
+        else:
+            self.coalesced_count += 1
+        # Cancelling one of the waiting searches must not cancel the shared request
+        return await asyncio.shield(task)
+
+    def _finish_flight(self, key: str, task: asyncio.Future) -> None:
+        del self._in_flight[key]
+        if not task.cancelled():
+            task.exception()  # Mark it retrieved, in case every waiting search was cancelled
+
+    async def _search(
+        self,
+        file: Union[str, Path, BinaryIO],
+        payload: dict,
+        from_url: bool,
+        cache_key: Optional[str],
+    ) -> SauceResponse:
+        image_hash = None
+        if self.perceptual_index is not None and not from_url:
+            file, image_hash = await self._run_in_executor(self._get_image_hash, file)
+            if image_hash is not None:
+                sauce = self.perceptual_index.find(image_hash, payload)
+                if sauce is not None:
+                    # A copy, so the stored response isn't marked
+                    sauce = sauce.copy()
+                    sauce._from_cache = True
+                    return sauce
+
+        file = await self._load_file(file, from_url)
+        position = None
+        if self.retry_policy is not None or self.validator is not None:
+            file, position = self._make_rewindable(file, from_url)
+        if self.validator is not None and not from_url:
+            self._validate_upload(file)
+
+        for attempt in itertools.count(1):
+            try:
+                sauce = await self._request(file, payload, from_url, cache_key)
+                break
+            except (SauceNaoError, httpx.HTTPError) as error:
+                delay = self._get_retry_delay(attempt, error)
+                if delay is None:
+                    raise
+
+            await asyncio.sleep(delay)
+            if position is not None:
+                file.seek(position)
+
+        if (
+            image_hash is not None and not sauce.partial
+        ):  # Like the cache, partial results aren't kept
+            self.perceptual_index.add(image_hash, payload, sauce)
+        return sauce
+
+    async def _request(
+        self,
+        file: Union[str, Path, BinaryIO],
+        payload: dict,
+        from_url: bool,
+        cache_key: Optional[str],
+    ) -> SauceResponse:
+        if self.circuit_breaker is None:
+            return await self._request_once(file, payload, from_url, cache_key)
+
+        probe = self._before_request()
+        try:
+            sauce = await self._request_once(file, payload, from_url, cache_key)
+        except BaseException as error:  # A cancelled probe must be released too
+            self.circuit_breaker.record(error, probe)
+            raise
+
+        self.circuit_breaker.record(probe=probe)
+        return sauce
+
+    async def _request_once(
+        self,
+        file: Union[str, Path, BinaryIO],
+        payload: dict,
+        from_url: bool,
+        cache_key: Optional[str],
+    ) -> SauceResponse:
+        api_key = self.key_pool.select()
+        try:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.async_acquire(api_key)
+
+            timer = self.metrics.start_request() if self.metrics is not None else None
+            try:
+                response = await self._send(file, payload, api_key, from_url, timer)
+            except httpx.HTTPError as error:
+                self.key_pool.report_error(api_key, error)
+                if timer is not None:
+                    self.metrics.record_error(error)
+                raise
+
+            if (
+                self.parse_threshold is not None and len(response.content) > self.parse_threshold
+            ) or (cache_key is not None and self.cache.blocking):
+                return await self._run_in_executor(
+                    self._process_response, response, api_key, cache_key, timer
+                )
+            return self._process_response(response, api_key, cache_key, timer)
+        finally:
+            self.key_pool.release(api_key)
+
+    async def _load_file(
+        self, file: Union[str, Path, BinaryIO], from_url: bool
+    ) -> Union[str, BinaryIO]:
+        """Read and preprocess the file in the executor, so the upload doesn't block the loop."""
+        if from_url or (isinstance(file, io.BytesIO) and self.preprocessor is None):
+            return file
+        if self.preprocessor is not None:
+            return await self._run_in_executor(self._preprocess, file, from_url)
+        if isinstance(file, (str, Path)):
+            return io.BytesIO(await self._run_in_executor(Path(file).read_bytes))
+
+        return io.BytesIO(await self._run_in_executor(file.read))
+
+    async def _run_in_executor(self, func: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args))
+
+    async def search_cascade(
+        self,
+        file: Union[str, Path, BinaryIO],
+        strategy: CascadeStrategy,
+        *,
+        result_limit: int = 8,
+        from_url: bool = False,
+    ) -> CascadeResponse:
+        """
+        Search the strategy stages one by one, until the best result is similar enough.
+        Look at :class:`saucenaopie.strategy.CascadeStrategy`.
+
+        :param file: File Path / BytesIO / URL (with from_url=True)
+        :param strategy: Stages to search in and the similarity to stop at
+        :param result_limit: Limit the number of results of every stage
+        :param from_url: Set True if the file is a URL
+        :return: Results of all the searched stages merged into one response
+        """
+        if not from_url and not isinstance(file, (str, Path)) and not file.seekable():
+            file = io.BytesIO(await self._run_in_executor(file.read))
+        file, position = self._make_rewindable(file, from_url)
+        responses = []
+        answered_stage = None
+        for stage, indexes in enumerate(strategy.stages):
+            if position is not None:
+                file.seek(position)
+
+            response = await self.search(
+                file, index=indexes, result_limit=result_limit, from_url=from_url
+            )
+            responses.append(response)
+            if strategy.is_answered(response):
+                answered_stage = stage
+                break
+
+        return strategy.merge(responses, answered_stage)
+
+    async def search_many(
+        self,
+        files: Union[Iterable[FileType], AsyncIterable[FileType]],
+        *,
+        concurrency: int = 4,
+        index: IndexesType = SauceIndex.ALL,
+        max_index: Optional[IndexType] = None,
+        min_index: Optional[IndexType] = None,
+        result_limit: int = 8,
+        from_url: bool = False,
+    ) -> AsyncIterator[Tuple[FileType, Union[SauceResponse, Exception]]]:
+        """
+        Search many files concurrently, keeping at most `concurrency` requests in flight.
+        The files are taken lazily, so you can pass a huge or endless (async) iterable.
+        Results are yielded as soon as each search is finished, errors are yielded instead
+        of being raised, so a single bad file doesn't stop the whole batch.
+
+        :param files: Iterable or async iterable of File Paths / BytesIO / URLs (with from_url=True)
+        :param concurrency: Maximum number of searches running at the same time
+        :return: Async generator of (file, SauceResponse or exception) pairs
+        """
+        if concurrency < 1:
+            raise ValueError("The concurrency must be at least 1.")
+
+        async def run(file: FileType) -> Tuple[FileType, Union[SauceResponse, Exception]]:
+            try:
+                return file, await self.search(
+                    file,
+                    index=index,
+                    max_index=max_index,
+                    min_index=min_index,
+                    result_limit=result_limit,
+                    from_url=from_url,
+                )
+            except Exception as error:
+                return file, error
 
+        iterator = _iterate(files).__aiter__()
+        pending: Set[asyncio.Future] = set()
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < concurrency:
+                    try:
+                        file = await iterator.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                    else:
+                        pending.add(asyncio.ensure_future(run(file)))
+
+                if not pending:
+                    break
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _send(
+        self,
+        file: Union[str, Path, BinaryIO],
+        payload: dict,
+        api_key: str,
+        from_url: bool,
+        timer: Optional[RequestTimer] = None,
+    ) -> httpx.Response:
+        params = {"api_key": api_key}
+        extensions = {"trace": timer.async_trace} if timer is not None else None
         if from_url:
-            payload["url"] = file
-            response = await self._client.post("search.php", params=payload)
+            params.update(payload, url=file)
+            return await self._client.post("search.php", params=params, extensions=extensions)
         elif isinstance(file, (str, Path)):
             with open(file, "rb") as f:
-                response = await self._client.post("search.php", data=payload, files={"file": f})
-        else:
-            response = await self._client.post("search.php", data=payload, files={"file": file})
+                return await self._client.post(
+                    "search.php",
+                    params=params,
+                    data=payload,
+                    files={"file": f},
+                    extensions=extensions,
+                )
 
-        return self._process_response(response)
+        return await self._client.post(
+            "search.php", params=params, data=payload, files={"file": file}, extensions=extensions
+        )
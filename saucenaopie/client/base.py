@@ -1,30 +1,57 @@
+import io
+import json
 import logging
+import time
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import BinaryIO, Dict, List, Optional, Union
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, Optional, Tuple, Type, Union
 
 import httpx
 from pydantic import ValidationError
 
+from ..breaker import CircuitBreaker
+from ..cache import BaseCache, make_cache_key
 from ..exceptions import (
     AccountBanned,
     BadAPIKey,
+    CircuitOpen,
     FileIsTooLarge,
     ImageInvalid,
+    LimitReached,
     LongLimitReached,
+    SauceNaoError,
     ShortLimitReached,
     TooManyFailedRequests,
     UnknownClientError,
     UnknownServerError,
 )
 from ..helper import Helper, SauceIndex
+from ..keys import KeyPool
+from ..limiter import RateLimiter
+from ..metrics import MetricsCollector, RequestTimer
+from ..perceptual import PerceptualIndex
+from ..preprocess import ImagePreprocessor
+from ..retry import RetryPolicy
 from ..types.account import AccountInfo, AccountType
 from ..types.response import Header, SauceResponse
-from ..types.result import ResultIndex, SauceResult
-from ..types.sauce import ArtSauce, BooruSauce, MangaSauce, TwitterSauce, VideoSauce
+from ..types.result import LazyResultList, ResultIndex, SauceResult
+from ..types.sauce import ArtSauce, BaseSauce, BooruSauce, MangaSauce, TwitterSauce, VideoSauce
+from ..validation import UploadValidator
 
 log = logging.getLogger(__name__)
 
+try:
+    import orjson
+
+    _default_json_loads: Callable[[bytes], Any] = orjson.loads
+except ImportError:
+    try:
+        import msgspec
+
+        _default_json_loads = msgspec.json.decode
+    except ImportError:
+        _default_json_loads = json.loads
+
 
 class _OutputType(Helper):
     HTML = 0
@@ -33,31 +60,95 @@ class _OutputType(Helper):
 
 
 IndexType = Union[SauceIndex, int]
+IndexesType = Union[IndexType, Iterable[IndexType]]
 
 
 class BaseSauceClient(ABC):
     def __init__(
         self,
-        api_key: str,
+        api_key: Union[str, Iterable[str], KeyPool],
         test_mode: bool = False,
         timeout: int = 30,
         allow_partial_success: bool = False,
+        rate_limiter: Optional[RateLimiter] = None,
+        cache: Optional[BaseCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        preprocessor: Optional[ImagePreprocessor] = None,
+        trusted_parsing: bool = False,
+        json_loads: Optional[Callable[[bytes], Any]] = None,
+        lazy_results: bool = False,
+        coalesce: bool = False,
+        limits: Optional[httpx.Limits] = None,
+        http2: bool = False,
+        transport: Union[httpx.BaseTransport, httpx.AsyncBaseTransport, None] = None,
+        metrics: Optional[MetricsCollector] = None,
+        perceptual_index: Optional[PerceptualIndex] = None,
+        validator: Optional[UploadValidator] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
     ) -> None:
         """
-        :param api_key: SauceNao API key (https://saucenao.com/user.php)
+        :param api_key: SauceNao API key (https://saucenao.com/user.php), pass many keys or
+         a :class:`saucenaopie.keys.KeyPool` to spread searches over them
         :param test_mode: Makes the API return at least 1 result to (almost) every search
          query for testing purposes
         :param timeout: Timeout for HTTP requests
         :param allow_partial_success: If True, SauceNaoPie will return results even if some indexes
           failed
+        :param rate_limiter: Hold requests locally until the 30 second window reopens,
+         look at :class:`saucenaopie.limiter.RateLimiter`
+        :param cache: Reuse the results of identical searches instead of spending the quota,
+         look at :mod:`saucenaopie.cache`
+        :param retry_policy: Retry the searches that failed because of temporary issues,
+         look at :class:`saucenaopie.retry.RetryPolicy`
+        :param preprocessor: Downscale and recompress the images before uploading them,
+         look at :class:`saucenaopie.preprocess.ImagePreprocessor`
+        :param trusted_parsing: Build the result models without validation, which makes parsing
+         several times faster. The SauceNao data is converted to the right types anyway
+        :param json_loads: Function to decode the raw response body with, by default it's orjson
+         or msgspec if one of them is installed, or the standard json module otherwise
+        :param lazy_results: Keep the raw results and only build the result objects
+         when they are accessed, look at :class:`saucenaopie.types.result.LazyResultList`
+        :param coalesce: Make concurrent searches of the same file or URL with the same params
+         share one request, they all get the same response or exception
+        :param limits: Connection pool size and keep-alive expiry, httpx defaults if None
+        :param http2: Use HTTP/2 if the server supports it, requires `pip install saucenaopie[http2]`
+        :param transport: HTTP transport to send the requests with, it can be shared by many
+         clients and is not closed with them. Limits and http2 are ignored if it's passed
+        :param metrics: Collect latency, traffic, error and quota metrics,
+         look at :class:`saucenaopie.metrics.MetricsCollector`
+        :param perceptual_index: Reuse the responses of near-duplicate images searched before,
+         look at :class:`saucenaopie.perceptual.PerceptualIndex`
+        :param validator: Check the files before uploading them, so the ones SauceNao would reject
+         fail right away, look at :class:`saucenaopie.validation.UploadValidator`
+        :param circuit_breaker: Fail the searches right away while SauceNao is down,
+         look at :class:`saucenaopie.breaker.CircuitBreaker`
         """
         self.base_url = "https://saucenao.com"
         self.timeout = timeout
         self.allow_partial_success = allow_partial_success
-        self._default_params = {
-            "api_key": api_key,
-            "output_type": _OutputType.JSON,
-        }
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.retry_policy = retry_policy
+        self.preprocessor = preprocessor
+        self.trusted_parsing = trusted_parsing
+        self.json_loads = json_loads or _default_json_loads
+        self.lazy_results = lazy_results
+        self.coalesce = coalesce
+        self.coalesced_count = 0  # Searches that waited for an identical one instead of a request
+        self.limits = limits
+        self.http2 = http2
+        self.transport = transport
+        self.metrics = metrics
+        self.perceptual_index = perceptual_index
+        self.validator = validator
+        self.circuit_breaker = circuit_breaker
+        if isinstance(api_key, KeyPool):
+            self.key_pool = api_key
+        elif isinstance(api_key, str):
+            self.key_pool = KeyPool((api_key,))
+        else:
+            self.key_pool = KeyPool(api_key)
+        self._default_params = {"output_type": _OutputType.JSON}
         if test_mode:
             self._default_params["testmode"] = 1
 
@@ -66,12 +157,38 @@ class BaseSauceClient(ABC):
         """Close the HTTP client."""
         pass
 
+    def warm_up(self, connections: int = 1) -> None:
+        """
+        Open the connections to SauceNao ahead of time, so the first searches
+        don't wait for the TLS handshake. It doesn't spend the search quota.
+        Does nothing unless the client implements it.
+
+        :param connections: Number of connections to open
+        """
+        pass
+
+    def _get_client_options(self) -> Dict[str, Any]:
+        options = {
+            "base_url": self.base_url,
+            "timeout": self.timeout,
+            "params": self._default_params,
+        }
+        if self.transport is not None:
+            # The pool belongs to the transport, and http2 would require h2 for nothing
+            options["transport"] = self.transport
+            return options
+
+        options["http2"] = self.http2
+        if self.limits is not None:
+            options["limits"] = self.limits
+        return options
+
     @abstractmethod
     def search(
         self,
         file: Union[str, Path, BinaryIO],
         *,
-        index: IndexType = SauceIndex.ALL,
+        index: IndexesType = SauceIndex.ALL,
         max_index: Optional[IndexType] = None,
         min_index: Optional[IndexType] = None,
         result_limit: int = 8,
@@ -82,8 +199,8 @@ class BaseSauceClient(ABC):
         BytesIO or URL (along with the from_url argument).
 
         :param file: File Path / BytesIO / URL (with from_url=True)
-        :param index: SauceNao database index to search in,
-         look at :class:`saucenaopie.helper.DBIndex`
+        :param index: SauceNao database index to search in, or many indexes to search in at once,
+         like `SauceIndex.get_booru_indexes()`, look at :class:`saucenaopie.helper.SauceIndex`
         :param max_index: Search all the indexes that are less or equal to the specified one
         :param min_index: Search all the indexes that are greater or equal to the specified one
         :param result_limit: Limit the number of results, 8 is the API default.
@@ -95,7 +212,7 @@ class BaseSauceClient(ABC):
     @staticmethod
     def _prepare_params(
         file: Union[str, Path, BinaryIO],
-        index: IndexType,
+        index: IndexesType,
         result_limit: int,
         max_index: Optional[IndexType],
         min_index: Optional[IndexType],
@@ -104,50 +221,204 @@ class BaseSauceClient(ABC):
         if from_url and not isinstance(file, str):
             raise AttributeError(f"The file url must be str, not {type(file).__name__}")
 
-        params = {"db": index, "numres": result_limit}
-        if max_index is not None:
-            params["dbmask"] = (2**max_index) if max_index > 0 else 1
-        if min_index is not None:
-            params["dbmaski"] = (2 ** (min_index - 1)) if max_index > 0 else 1
+        indexes = {index} if isinstance(index, int) else set(index)
+        if not indexes:
+            raise ValueError("At least one index must be specified.")
+
+        params = {"numres": result_limit}
+        if max_index is None and len(indexes) == 1:
+            params["db"] = next(iter(indexes))
+        else:
+            # SauceNao takes a bitmask of the indexes to search in, bit N enables index N
+            mask = (1 << (max_index + 1)) - 1 if max_index is not None else None
+            if SauceIndex.ALL not in indexes:
+                index_mask = sum(1 << value for value in indexes)
+                mask = index_mask if mask is None else mask & index_mask
+
+            if mask is None:
+                params["db"] = SauceIndex.ALL
+            elif mask == 0:
+                raise ValueError("None of the specified indexes is below max_index.")
+            else:
+                params["dbmask"] = mask
+        if min_index is not None and min_index > 0:
+            params["dbmaski"] = (1 << min_index) - 1  # Disables every index below min_index
 
         return params
 
-    def _process_response(self, response: httpx.Response) -> SauceResponse:
+    def _get_cache_key(
+        self, file: Union[str, Path, BinaryIO], payload: Dict[str, Any], from_url: bool
+    ) -> Tuple[Union[str, Path, BinaryIO], str]:
+        """
+        Make the key of the search, used by the cache and to coalesce identical searches.
+        The file is replaced with its content if it was read.
+        """
+        params = {**self._default_params, **payload}
+        if from_url:
+            return file, make_cache_key(file, params)
+
+        file, content = self._read_file(file)
+        return file, make_cache_key(content, params)
+
+    def _get_image_hash(self, file: Union[str, Path, BinaryIO]) -> Tuple[BinaryIO, Optional[int]]:
+        """Get the perceptual hash of the file, it's replaced with its content."""
+        file, content = self._read_file(file)
+        return file, self.perceptual_index.get_hash(content)
+
+    @staticmethod
+    def _read_file(file: Union[str, Path, BinaryIO]) -> Tuple[Union[str, Path, BinaryIO], bytes]:
+        """Read the file content, keeping the stream position or replacing the path with it."""
+        if isinstance(file, (str, Path)):
+            with open(file, "rb") as f:
+                content = f.read()
+            return io.BytesIO(content), content
+
+        position = file.tell()
+        content = file.read()
+        file.seek(position)
+        return file, content
+
+    def _preprocess(
+        self, file: Union[str, Path, BinaryIO], from_url: bool
+    ) -> Union[str, Path, BinaryIO]:
+        if self.preprocessor is None or from_url:
+            return file
+
+        if isinstance(file, (str, Path)):
+            with open(file, "rb") as f:
+                content = f.read()
+        else:
+            content = file.read()
+
+        return io.BytesIO(self.preprocessor.process(content))
+
+    @staticmethod
+    def _make_rewindable(
+        file: Union[str, Path, BinaryIO], from_url: bool
+    ) -> Tuple[Union[str, Path, BinaryIO], Optional[int]]:
+        """Remember the stream position, so the same file can be uploaded again on retry."""
+        if from_url or isinstance(file, (str, Path)):
+            return file, None  # Paths are opened again on every attempt
+        if not file.seekable():
+            file = io.BytesIO(file.read())
+
+        return file, file.tell()
+
+    def _validate_upload(self, file: BinaryIO) -> None:
+        try:
+            self.validator.validate_file(file)
+        except SauceNaoError as error:
+            if self.metrics is not None:
+                self.metrics.record_error(error)
+            raise
+
+    def _before_request(self) -> bool:
         try:
-            response.raise_for_status()
-            return self._parse_response_data(response.json())
-        except httpx.HTTPStatusError as error:
-            if error.response.status_code == 403:
-                raise BadAPIKey("The API key is invalid.")
-            elif error.response.status_code == 413:
-                raise FileIsTooLarge("The file is too large.")
-            elif error.response.status_code == 429:
-                header = response.json()["header"]
-                if header.get("status") == -2:
-                    raise TooManyFailedRequests(header.get("message"))
-
-                if "Daily" in header["message"]:
-                    raise LongLimitReached(
-                        "Daily limit reached.",
-                        long_remaining=header["long_remaining"],
-                        short_remaining=header["short_remaining"],
-                        long_limit=header["long_limit"],
-                        short_limit=header["short_limit"],
-                    )
-                raise ShortLimitReached(
-                    "30 second limit reached.",
-                    long_remaining=header["long_remaining"],
-                    short_remaining=header["short_remaining"],
-                    long_limit=header["long_limit"],
-                    short_limit=header["short_limit"],
+            return self.circuit_breaker.before_request()
+        except CircuitOpen as error:
+            if self.metrics is not None:
+                self.metrics.record_error(error)
+            raise
+
+    def _get_retry_delay(self, attempt: int, error: Exception) -> Optional[float]:
+        if self.retry_policy is None:
+            return None
+
+        window_delay = None
+        if isinstance(error, ShortLimitReached):
+            window_delay = self._get_short_limit_delay()
+        delay = self.retry_policy.get_delay(attempt, error, window_delay)
+        if delay is not None:
+            log.debug(f"Retrying the search in {delay:.1f}s after {error!r}")
+        return delay
+
+    def _get_short_limit_delay(self) -> float:
+        """Get the number of seconds until one of the keys can search again."""
+        if self.rate_limiter is not None:
+            # The limiter knows when the sent requests leave the window
+            keys = self.key_pool.get_available_keys() or self.key_pool.api_keys
+            return min(self.rate_limiter.get_delay(key) for key in keys)
+        return self.key_pool.get_recovery_delay()
+
+    def _process_response(
+        self,
+        response: httpx.Response,
+        api_key: str,
+        cache_key: Optional[str] = None,
+        timer: Optional[RequestTimer] = None,
+    ) -> SauceResponse:
+        if timer is not None:
+            self.metrics.record_response(timer, response)
+            parse_started = time.perf_counter()
+
+        try:
+            data = self._decode_response(response)
+            sauce = self._parse_response_data(data)
+        except LimitReached as error:
+            if self.rate_limiter is not None:
+                self.rate_limiter.update(
+                    api_key,
+                    short_remaining=error.short_remaining,
+                    short_limit=error.short_limit,
+                    long_remaining=error.long_remaining,
                 )
+            self.key_pool.report_error(api_key, error)
+            if timer is not None:
+                self.metrics.record_error(error)
+            raise
+        except SauceNaoError as error:
+            self.key_pool.report_error(api_key, error)
+            if timer is not None:
+                self.metrics.record_error(error)
+            raise
+
+        if timer is not None:
+            # Counted from the raw data, so the lazy results aren't built for it
+            self.metrics.record_parse(
+                time.perf_counter() - parse_started, sauce.account_info, len(data["results"])
+            )
+        self.key_pool.report_success(api_key, sauce.account_info)
+        if self.rate_limiter is not None:
+            self.rate_limiter.update_from_account_info(api_key, sauce.account_info)
+        sauce._partial = data["header"]["status"] != 0
+        if cache_key is not None and not sauce.partial:  # Partial results aren't kept
+            self.cache.set(cache_key, data)
+        return sauce
 
-            raise UnknownServerError(
-                "Server returned unknown error.", status_code=error.response.status_code
+    def _decode_response(self, response: httpx.Response) -> Dict[str, Any]:
+        status_code = response.status_code
+        if status_code < 400:
+            return self.json_loads(response.content)
+
+        if status_code == 403:
+            raise BadAPIKey("The API key is invalid.")
+        elif status_code == 413:
+            raise FileIsTooLarge("The file is too large.")
+        elif status_code == 429:
+            header = self.json_loads(response.content)["header"]
+            if header.get("status") == -2:
+                raise TooManyFailedRequests(header.get("message"))
+
+            if "Daily" in header["message"]:
+                raise LongLimitReached(
+                    "Daily limit reached.",
+                    long_remaining=int(header["long_remaining"]),
+                    short_remaining=int(header["short_remaining"]),
+                    long_limit=int(header["long_limit"]),
+                    short_limit=int(header["short_limit"]),
+                )
+            raise ShortLimitReached(
+                "30 second limit reached.",
+                long_remaining=int(header["long_remaining"]),
+                short_remaining=int(header["short_remaining"]),
+                long_limit=int(header["long_limit"]),
+                short_limit=int(header["short_limit"]),
             )
 
+        raise UnknownServerError("Server returned unknown error.", status_code=status_code)
+
     def _parse_response_data(self, data: dict) -> SauceResponse:
-        log.debug(f"SauceNao Response: {data}")
+        log.debug("SauceNao Response: %s", data)
         header = data["header"]
         if header["status"] < 0:  # Client side error
             if header["status"] == -1:
@@ -159,13 +430,6 @@ class BaseSauceClient(ABC):
         if header["status"] > 0 and not (data["results"] and self.allow_partial_success):
             raise UnknownServerError(header.get("message"))
 
-        processed_results: List[SauceResult] = []
-        for result in data["results"]:
-            try:
-                processed_results.append(self._result_to_object(result))
-            except ValidationError:
-                log.exception("Failed to parse result")
-
         numeric_account_type = int(header["account_type"])
         if numeric_account_type == 0:
             account_type = AccountType.UNREGISTERED
@@ -174,22 +438,50 @@ class BaseSauceClient(ABC):
         else:
             account_type = AccountType.ENHANCED
 
+        account_info = AccountInfo(
+            user_id=header["user_id"],
+            short_limit=header["short_limit"],
+            long_limit=header["long_limit"],
+            long_remaining=header["long_remaining"],
+            short_remaining=header["short_remaining"],
+            account_type=account_type,
+        )
+        response_header = Header(
+            results_requested=header["results_requested"],
+            search_depth=header["search_depth"],
+            min_similarity=header["minimum_similarity"],
+            results_returned=header["results_returned"],
+        )
+
+        if self.lazy_results:
+            builder = _build_trusted_result if self.trusted_parsing else self._result_to_object
+            return SauceResponse.construct(
+                account_info=account_info,
+                header=response_header,
+                results=LazyResultList(data["results"], builder),
+            )
+
+        processed_results: List[SauceResult] = []
+        if self.trusted_parsing:
+            for result in data["results"]:
+                try:
+                    processed_results.append(_build_trusted_result(result))
+                except (KeyError, TypeError, ValueError):
+                    log.exception("Failed to parse result")
+
+            processed_results.sort(key=lambda r: r.similarity, reverse=True)
+            return SauceResponse.construct(
+                account_info=account_info, header=response_header, results=processed_results
+            )
+
+        for result in data["results"]:
+            try:
+                processed_results.append(self._result_to_object(result))
+            except ValidationError:
+                log.exception("Failed to parse result")
+
         return SauceResponse(
-            account_info=AccountInfo(
-                user_id=header["user_id"],
-                short_limit=header["short_limit"],
-                long_limit=header["long_limit"],
-                long_remaining=header["long_remaining"],
-                short_remaining=header["short_remaining"],
-                account_type=account_type,
-            ),
-            header=Header(
-                results_requested=header["results_requested"],
-                search_depth=header["search_depth"],
-                min_similarity=header["minimum_similarity"],
-                results_returned=header["results_returned"],
-            ),
-            results=processed_results,
+            account_info=account_info, header=response_header, results=processed_results
         )
 
     def _result_to_object(self, result: dict) -> SauceResult:
@@ -198,7 +490,8 @@ class BaseSauceClient(ABC):
 
         title = self._get_title(data)
         urls = data.get("ext_urls", [])
-        if header["index_id"] in SauceIndex.get_video_indexes():
+        sauce_type = SauceIndex.get_sauce_type(header["index_id"])
+        if sauce_type is VideoSauce:
             sauce = VideoSauce(
                 urls=urls,
                 title=title,
@@ -206,14 +499,14 @@ class BaseSauceClient(ABC):
                 year=data.get("year"),
                 timestamp=data.get("est_time"),
             )
-        elif header["index_id"] in SauceIndex.get_manga_indexes():
+        elif sauce_type is MangaSauce:
             sauce = MangaSauce(
                 urls=urls,
                 title=title,
                 chapter=data.get("part"),
                 author=self._get_author(data),
             )
-        elif header["index_id"] in SauceIndex.get_booru_indexes():
+        elif sauce_type is BooruSauce:
             sauce = BooruSauce(
                 urls=urls,
                 title=title,
@@ -223,7 +516,7 @@ class BaseSauceClient(ABC):
                 material=data.get("material"),
                 source_url=data.get("source"),
             )
-        elif header["index_id"] == SauceIndex.TWITTER:
+        elif sauce_type is TwitterSauce:
             sauce = TwitterSauce(
                 urls=urls,
                 title=title,
@@ -232,33 +525,14 @@ class BaseSauceClient(ABC):
                 username=data["twitter_user_handle"],
             )
         else:
-            author_id = data.get("member_id")
-            if header["index_id"] in {SauceIndex.PIXIV, SauceIndex.PIXIV_HISTORICAL}:
-                author_url = f"https://www.pixiv.net/users/{author_id}"
-            elif header["index_id"] == SauceIndex.NIJIE:
-                author_url = f"https://sp.nijie.info/members.php?id={author_id}"
-            elif header["index_id"] == SauceIndex.MEDI_BANG:
-                author_url = f"https://medibang.com/author/{author_id}"
-            elif header["index_id"] in {SauceIndex.BCY_ILLUST, SauceIndex.BCY_COSPLAY}:
-                author_url = f"https://bcy.net/u/{author_id}"
-            elif header["index_id"] == SauceIndex.PORTAL_GRAPHICS:
-                author_url = (
-                    "https://web.archive.org/web/http://www.portalgraphics.net/pg"
-                    f"/profile/?user_id={author_id}"
-                )
-            elif header["index_id"] == SauceIndex.PAWOO:
-                author_url = urls[0]
-            else:
-                author_url = data.get("author_url")
-
             sauce = ArtSauce(
                 urls=urls,
                 title=title,
                 author=self._get_author(data),
-                author_url=author_url,
+                author_url=self._get_author_url(header["index_id"], data, urls),
             )
 
-        return SauceResult[type(sauce)](
+        return _RESULT_TYPES[type(sauce)](
             similarity=header["similarity"],
             thumbnail=header["thumbnail"],
             data=sauce,
@@ -268,6 +542,27 @@ class BaseSauceClient(ABC):
             ),
         )
 
+    @staticmethod
+    def _get_author_url(index_id: int, result_data: dict, urls: List[str]) -> Optional[str]:
+        author_id = result_data.get("member_id")
+        if index_id in {SauceIndex.PIXIV, SauceIndex.PIXIV_HISTORICAL}:
+            return f"https://www.pixiv.net/users/{author_id}"
+        elif index_id == SauceIndex.NIJIE:
+            return f"https://sp.nijie.info/members.php?id={author_id}"
+        elif index_id == SauceIndex.MEDI_BANG:
+            return f"https://medibang.com/author/{author_id}"
+        elif index_id in {SauceIndex.BCY_ILLUST, SauceIndex.BCY_COSPLAY}:
+            return f"https://bcy.net/u/{author_id}"
+        elif index_id == SauceIndex.PORTAL_GRAPHICS:
+            return (
+                "https://web.archive.org/web/http://www.portalgraphics.net/pg"
+                f"/profile/?user_id={author_id}"
+            )
+        elif index_id == SauceIndex.PAWOO:
+            return urls[0]
+
+        return result_data.get("author_url")
+
     @staticmethod
     def _get_title(result_data: dict) -> Optional[str]:
         keys = ("title", "eng_name", "material", "source")
@@ -290,3 +585,117 @@ class BaseSauceClient(ABC):
         for key in keys:
             if value := result_data.get(key):
                 return value
+
+
+# Trusted parsing builds the models without validation, so the builders below
+# do the type conversions that the sauce validators would do otherwise.
+
+
+def _as_str(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _as_required_str(value: Any) -> str:
+    if value is None:  # Skipped like the validation would skip it, instead of becoming "None"
+        raise TypeError("A required field is null.")
+    return str(value)
+
+
+def _as_int(value: Any) -> Optional[int]:
+    return None if value is None else int(value)
+
+
+def _first(value: Any) -> Any:
+    if isinstance(value, list):
+        return value[0] if value else None
+    return value
+
+
+def _split(value: Optional[str]) -> List[str]:
+    return value.replace(", ", ",").split(",") if value else []
+
+
+def _build_video(index_id: int, data: dict, urls: List[str], title: Optional[str]) -> VideoSauce:
+    return VideoSauce.construct(
+        urls=urls,
+        title=title,
+        episode=_as_str(data.get("part")),
+        year=_as_required_str(data["year"]),
+        timestamp=_as_required_str(data["est_time"]),
+    )
+
+
+def _build_manga(index_id: int, data: dict, urls: List[str], title: Optional[str]) -> MangaSauce:
+    return MangaSauce.construct(
+        urls=urls,
+        title=title,
+        chapter=_as_str(data.get("part")),
+        author=_first(BaseSauceClient._get_author(data)),
+    )
+
+
+def _build_booru(index_id: int, data: dict, urls: List[str], title: Optional[str]) -> BooruSauce:
+    return BooruSauce.construct(
+        urls=urls,
+        title=title,
+        gelbooru_id=_as_int(data.get("gelbooru_id")),
+        danbooru_id=_as_int(data.get("danbooru_id")),
+        characters=_split(data.get("character")),
+        material=_split(data.get("material")),
+        source_url=data.get("source"),
+    )
+
+
+def _build_twitter(
+    index_id: int, data: dict, urls: List[str], title: Optional[str]
+) -> TwitterSauce:
+    return TwitterSauce.construct(
+        urls=urls,
+        title=title,
+        tweet_id=int(data["tweet_id"]),
+        user_id=int(data["twitter_user_id"]),
+        username=_as_required_str(data["twitter_user_handle"]),
+    )
+
+
+def _build_art(index_id: int, data: dict, urls: List[str], title: Optional[str]) -> ArtSauce:
+    return ArtSauce.construct(
+        urls=urls,
+        title=title,
+        author=_first(BaseSauceClient._get_author(data)),
+        author_url=BaseSauceClient._get_author_url(index_id, data, urls),
+    )
+
+
+_SauceBuilder = Callable[[int, dict, List[str], Optional[str]], BaseSauce]
+
+_RESULT_TYPES: Dict[Type[BaseSauce], Type[SauceResult]] = {
+    sauce_type: SauceResult[sauce_type]
+    for sauce_type in (ArtSauce, BooruSauce, MangaSauce, TwitterSauce, VideoSauce)
+}
+_TRUSTED_BUILDERS: Dict[Type[BaseSauce], _SauceBuilder] = {
+    ArtSauce: _build_art,
+    BooruSauce: _build_booru,
+    MangaSauce: _build_manga,
+    TwitterSauce: _build_twitter,
+    VideoSauce: _build_video,
+}
+
+
+def _build_trusted_result(result: dict) -> SauceResult:
+    header: dict = result["header"]
+    data: dict = result["data"]
+
+    index_id = int(header["index_id"])
+    sauce_type = SauceIndex.get_sauce_type(index_id)
+    sauce = _TRUSTED_BUILDERS[sauce_type](
+        index_id, data, data.get("ext_urls", []), BaseSauceClient._get_title(data)
+    )
+    return _RESULT_TYPES[sauce_type].construct(
+        similarity=float(header["similarity"]),
+        thumbnail=_as_required_str(header["thumbnail"]),
+        data=sauce,
+        index=ResultIndex.construct(
+            id=index_id, name=SauceIndex.get_value_name(index_id, human_readable=True)
+        ),
+    )
@@ -1,48 +1,368 @@
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import BinaryIO, Optional, Union
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 import httpx
 
+from ..breaker import CircuitBreaker
+from ..cache import BaseCache
+from ..exceptions import SauceNaoError
 from ..helper import SauceIndex
-from ..types.response import SauceResponse
-from .base import BaseSauceClient, IndexType
+from ..keys import KeyPool
+from ..limiter import RateLimiter
+from ..metrics import MetricsCollector, RequestTimer
+from ..perceptual import PerceptualIndex
+from ..preprocess import ImagePreprocessor
+from ..retry import RetryPolicy
+from ..strategy import CascadeStrategy
+from ..types.response import CascadeResponse, SauceResponse
+from ..validation import UploadValidator
+from .base import BaseSauceClient, IndexesType, IndexType
+
+FileType = TypeVar("FileType", str, Path, BinaryIO)
 
 
 class SauceNao(BaseSauceClient):
     def __init__(
         self,
-        api_key: str,
+        api_key: Union[str, Iterable[str], KeyPool],
         test_mode: bool = False,
         timeout: int = 30,
         allow_partial_success: bool = False,
+        rate_limiter: Optional[RateLimiter] = None,
+        cache: Optional[BaseCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        preprocessor: Optional[ImagePreprocessor] = None,
+        trusted_parsing: bool = False,
+        json_loads: Optional[Callable[[bytes], Any]] = None,
+        lazy_results: bool = False,
+        coalesce: bool = False,
+        limits: Optional[httpx.Limits] = None,
+        http2: bool = False,
+        transport: Optional[httpx.BaseTransport] = None,
+        metrics: Optional[MetricsCollector] = None,
+        perceptual_index: Optional[PerceptualIndex] = None,
+        validator: Optional[UploadValidator] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
     ) -> None:
-        super().__init__(api_key, test_mode, timeout, allow_partial_success)
-        self._client = httpx.Client(
-            base_url=self.base_url, timeout=self.timeout, params=self._default_params
+        super().__init__(
+            api_key,
+            test_mode,
+            timeout,
+            allow_partial_success,
+            rate_limiter,
+            cache,
+            retry_policy,
+            preprocessor,
+            trusted_parsing,
+            json_loads,
+            lazy_results,
+            coalesce,
+            limits,
+            http2,
+            transport,
+            metrics,
+            perceptual_index,
+            validator,
+            circuit_breaker,
         )
+        self._in_flight: Dict[str, Future] = {}
+        self._in_flight_lock = threading.Lock()
+        self._client = httpx.Client(**self._get_client_options())
 
     def close(self) -> None:
-        self._client.close()
+        if self.transport is None:  # A passed transport may be shared with other clients
+            self._client.close()
+
+    def warm_up(self, connections: int = 1) -> None:
+        if connections < 1:
+            raise ValueError("The number of connections must be at least 1.")
+        if connections == 1:
+            self._client.head("/")
+            return
+
+        # Concurrent requests can't share a connection, so each of them opens a new one
+        with ThreadPoolExecutor(connections) as executor:
+            list(executor.map(lambda _: self._client.head("/"), range(connections)))
 
     def search(
         self,
         file: Union[str, Path, BinaryIO],
         *,
-        index: IndexType = SauceIndex.ALL,
+        index: IndexesType = SauceIndex.ALL,
         max_index: Optional[IndexType] = None,
         min_index: Optional[IndexType] = None,
         result_limit: int = 8,
         from_url: bool = False,
     ) -> SauceResponse:
         payload = self._prepare_params(file, index, result_limit, max_index, min_index, from_url)
+        if self.cache is None and not self.coalesce:
+            return self._search(file, payload, from_url, None)
+
+        file, key = self._get_cache_key(file, payload, from_url)
+        if self.cache is not None and (data := self.cache.get(key)) is not None:
+            sauce = self._parse_response_data(data)
+            sauce._from_cache = True
+            return sauce
+
+        cache_key = key if self.cache is not None else None
+        if not self.coalesce:
+            return self._search(file, payload, from_url, cache_key)
+
+        with self._in_flight_lock:
+            future = self._in_flight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = self._in_flight[key] = Future()
+            else:
+                self.coalesced_count += 1
+        if not is_leader:
+            return future.result()  # Wait for the identical search that is already running
+
+        try:
+            response = self._search(file, payload, from_url, cache_key)
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(response)
+            return response
+        finally:
+            with self._in_flight_lock:
+                del self._in_flight[key]
+
+    def _search(
+        self,
+        file: Union[str, Path, BinaryIO],
+        payload: dict,
+        from_url: bool,
+        cache_key: Optional[str],
+    ) -> SauceResponse:
+        image_hash = None
+        if self.perceptual_index is not None and not from_url:
+            file, image_hash = self._get_image_hash(file)
+            if image_hash is not None:
+                sauce = self.perceptual_index.find(image_hash, payload)
+                if sauce is not None:
+                    # A copy, so the stored response isn't marked
+                    sauce = sauce.copy()
+                    sauce._from_cache = True
+                    return sauce
+
+        file = self._preprocess(file, from_url)
+        position = None
+        if self.retry_policy is not None or self.validator is not None:
+            file, position = self._make_rewindable(file, from_url)
+        if self.validator is not None and not from_url:
+            self._validate_upload(file)
+
+        for attempt in itertools.count(1):
+            try:
+                sauce = self._request(file, payload, from_url, cache_key)
+                break
+            except (SauceNaoError, httpx.HTTPError) as error:
+                delay = self._get_retry_delay(attempt, error)
+                if delay is None:
+                    raise
+
+            time.sleep(delay)
+            if position is not None:
+                file.seek(position)
+
+        if (
+            image_hash is not None and not sauce.partial
+        ):  # Like the cache, partial results aren't kept
+            self.perceptual_index.add(image_hash, payload, sauce)
+        return sauce
+
+    def _request(
+        self,
+        file: Union[str, Path, BinaryIO],
+        payload: dict,
+        from_url: bool,
+        cache_key: Optional[str],
+    ) -> SauceResponse:
+        if self.circuit_breaker is None:
+            return self._request_once(file, payload, from_url, cache_key)
+
+        probe = self._before_request()
+        try:
+            sauce = self._request_once(file, payload, from_url, cache_key)
+        except BaseException as error:
+            self.circuit_breaker.record(error, probe)
+            raise
+
+        self.circuit_breaker.record(probe=probe)
+        return sauce
+
+    def _request_once(
+        self,
+        file: Union[str, Path, BinaryIO],
+        payload: dict,
+        from_url: bool,
+        cache_key: Optional[str],
+    ) -> SauceResponse:
+        api_key = self.key_pool.select()
+        try:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(api_key)
+
+            timer = self.metrics.start_request() if self.metrics is not None else None
+            try:
+                response = self._send(file, payload, api_key, from_url, timer)
+            except httpx.HTTPError as error:
+                self.key_pool.report_error(api_key, error)
+                if timer is not None:
+                    self.metrics.record_error(error)
+                raise
 
+            return self._process_response(response, api_key, cache_key, timer)
+        finally:
+            self.key_pool.release(api_key)
+
+    def search_cascade(
+        self,
+        file: Union[str, Path, BinaryIO],
+        strategy: CascadeStrategy,
+        *,
+        result_limit: int = 8,
+        from_url: bool = False,
+    ) -> CascadeResponse:
+        """
+        Search the strategy stages one by one, until the best result is similar enough.
+        Look at :class:`saucenaopie.strategy.CascadeStrategy`.
+
+        :param file: File Path / BytesIO / URL (with from_url=True)
+        :param strategy: Stages to search in and the similarity to stop at
+        :param result_limit: Limit the number of results of every stage
+        :param from_url: Set True if the file is a URL
+        :return: Results of all the searched stages merged into one response
+        """
+        file, position = self._make_rewindable(file, from_url)
+        responses = []
+        answered_stage = None
+        for stage, indexes in enumerate(strategy.stages):
+            if position is not None:
+                file.seek(position)
+
+            response = self.search(
+                file, index=indexes, result_limit=result_limit, from_url=from_url
+            )
+            responses.append(response)
+            if strategy.is_answered(response):
+                answered_stage = stage
+                break
+
+        return strategy.merge(responses, answered_stage)
+
+    def search_many(
+        self,
+        files: Iterable[FileType],
+        *,
+        workers: int = 4,
+        ordered: bool = False,
+        index: IndexesType = SauceIndex.ALL,
+        max_index: Optional[IndexType] = None,
+        min_index: Optional[IndexType] = None,
+        result_limit: int = 8,
+        from_url: bool = False,
+    ) -> Iterator[Tuple[FileType, Union[SauceResponse, Exception]]]:
+        """
+        Search many files on a thread pool, sharing the client connection pool.
+        The files are taken lazily, at most `workers` searches are running at the same time.
+        Errors are yielded instead of being raised, so a single bad file doesn't stop the whole batch.
+
+        :param files: Iterable of File Paths / BytesIO / URLs (with from_url=True)
+        :param workers: Number of threads to run the searches in
+        :param ordered: Yield the results in the input order instead of the completion order
+        :return: Generator of (file, SauceResponse or exception) pairs
+        """
+        if workers < 1:
+            raise ValueError("The number of workers must be at least 1.")
+
+        def run(file: FileType) -> Tuple[FileType, Union[SauceResponse, Exception]]:
+            try:
+                return file, self.search(
+                    file,
+                    index=index,
+                    max_index=max_index,
+                    min_index=min_index,
+                    result_limit=result_limit,
+                    from_url=from_url,
+                )
+            except Exception as error:
+                return file, error
+
+        iterator = iter(files)
+        queue: Deque[Future] = deque()  # Keeps the input order
+        pending: Set[Future] = set()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="saucenao") as executor:
+            try:
+                while True:
+                    while len(pending) < workers:
+                        try:
+                            future = executor.submit(run, next(iterator))
+                        except StopIteration:
+                            break
+                        pending.add(future)
+                        if ordered:
+                            queue.append(future)
+
+                    if not pending:
+                        break
+
+                    if ordered:
+                        done = {queue.popleft()}
+                        wait(done)
+                    else:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pending.discard(future)
+                        yield future.result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _send(
+        self,
+        file: Union[str, Path, BinaryIO],
+        payload: dict,
+        api_key: str,
+        from_url: bool,
+        timer: Optional[RequestTimer] = None,
+    ) -> httpx.Response:
+        params = {"api_key": api_key}
+        extensions = {"trace": timer.trace} if timer is not None else None
         if from_url:
-            payload["url"] = file
-            response = self._client.post("search.php", params=payload)
+            params.update(payload, url=file)
+            return self._client.post("search.php", params=params, extensions=extensions)
         elif isinstance(file, (str, Path)):
             with open(file, "rb") as f:
-                response = self._client.post("search.php", data=payload, files={"file": f})
-        else:
-            response = self._client.post("search.php", data=payload, files={"file": file})
+                return self._client.post(
+                    "search.php",
+                    params=params,
+                    data=payload,
+                    files={"file": f},
+                    extensions=extensions,
+                )
 
-        return self._process_response(response)
+        return self._client.post(
+            "search.php", params=params, data=payload, files={"file": file}, extensions=extensions
+        )
@@ -58,3 +58,11 @@ class FileIsTooLarge(ImageInvalid):
 
 class AccountBanned(SauceNaoError):
     pass
+
+
+class QueueFull(SauceNaoError):
+    pass
+
+
+class CircuitOpen(SauceNaoError):
+    pass
@@ -0,0 +1,181 @@
+import asyncio
+import heapq
+import itertools
+from collections import deque
+from pathlib import Path
+from typing import Any, BinaryIO, Deque, Dict, Hashable, List, Optional, Tuple, Union
+
+from .client import AsyncSauceNao
+from .exceptions import QueueFull
+from .types.response import SauceResponse
+
+
+class FairQueue:
+    """
+    Shares an async client between many tenants, like the users of a bot, so a single one
+    can't take all the searches. Queued searches are served by weighted fair queuing:
+    every tenant gets its share of the searches no matter how many it sends,
+    and a tenant with weight 2 gets twice as many as a tenant with weight 1.
+
+    Every tenant can only have a few searches queued, the rest are rejected with
+    :class:`saucenaopie.exceptions.QueueFull`. When the whole queue is full, the newest search
+    of the tenant with the most queued searches is shed to make room.
+    """
+
+    def __init__(
+        self,
+        client: AsyncSauceNao,
+        concurrency: int = 1,
+        max_queued_per_tenant: int = 3,
+        max_queued: int = 100,
+        max_wait: Optional[float] = None,
+        weights: Optional[Dict[Hashable, float]] = None,
+    ) -> None:
+        """
+        :param client: Client to search with
+        :param concurrency: Number of searches running at the same time
+        :param max_queued_per_tenant: Number of searches a tenant can have queued
+        :param max_queued: Number of searches that can be queued in total
+        :param max_wait: Seconds a search can wait in the queue before it's shed, None for no limit
+        :param weights: Tenant weights, the tenants that aren't listed have weight 1
+        """
+        if concurrency < 1:
+            raise ValueError("The concurrency must be at least 1.")
+        if max_queued_per_tenant < 0 or max_queued < 0:
+            raise ValueError("The queue limits can't be negative.")
+
+        self.client = client
+        self.concurrency = concurrency
+        self.max_queued_per_tenant = max_queued_per_tenant
+        self.max_queued = max_queued
+        self.max_wait = max_wait
+        self.weights: Dict[Hashable, float] = dict(weights or {})
+        self.shed_count = 0
+        self._heap: List[Tuple[float, int, Hashable, asyncio.Future]] = []
+        self._tenants: Dict[Hashable, Deque[asyncio.Future]] = {}
+        self._last_tags: Dict[Hashable, float] = {}
+        self._virtual_time = 0.0
+        self._counter = itertools.count()
+        self._running = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of searches waiting for their turn."""
+        return sum(len(waiters) for waiters in self._tenants.values())
+
+    def get_queue_depths(self) -> Dict[Hashable, int]:
+        """Get the number of waiting searches of every tenant."""
+        return {tenant: len(waiters) for tenant, waiters in self._tenants.items()}
+
+    async def search(
+        self, tenant: Hashable, file: Union[str, Path, BinaryIO], **kwargs: Any
+    ) -> SauceResponse:
+        """
+        Search when it's the tenant's turn. Takes the same arguments as `AsyncSauceNao.search`.
+
+        :param tenant: Key of the tenant, like the user or chat ID
+        :param file: File Path / BytesIO / URL (with from_url=True)
+        :raises QueueFull: If the search was rejected or shed
+        """
+        try:
+            await self._wait_turn(tenant)
+        except QueueFull as error:
+            if self.client.metrics is not None:
+                self.client.metrics.record_error(error)
+            raise
+
+        try:
+            return await self.client.search(file, **kwargs)
+        finally:
+            self._finish()
+
+    def shed(self, tenant: Optional[Hashable] = None) -> int:
+        """
+        Reject the queued searches with :class:`saucenaopie.exceptions.QueueFull`.
+
+        :param tenant: Only reject the searches of this tenant, all of them if None
+        :return: Number of rejected searches
+        """
+        tenants = list(self._tenants) if tenant is None else [tenant]
+        shed = 0
+        for key in tenants:
+            for waiter in list(self._tenants.get(key, ())):
+                self._shed(key, waiter, "The search was shed.")
+                shed += 1
+        return shed
+
+    async def _wait_turn(self, tenant: Hashable) -> None:
+        waiter = self._enqueue(tenant)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.max_wait)
+        except asyncio.TimeoutError:
+            if not waiter.done():
+                self._shed(tenant, waiter, "The search waited in the queue for too long.")
+            if waiter.exception() is not None:
+                raise waiter.exception() from None
+        except asyncio.CancelledError:
+            if not waiter.done():
+                self._tenants[tenant].remove(waiter)
+                self._forget_tenant(tenant)
+                waiter.cancel()
+            elif waiter.exception() is None:
+                self._finish()  # The turn came, but the search won't use it
+            raise
+
+    def _enqueue(self, tenant: Hashable) -> asyncio.Future:
+        # The limits only apply to the searches that have to wait for a free slot
+        if self._running >= self.concurrency:
+            self._make_room(tenant)
+
+        # The tenant's searches are served in the order of their virtual finish times,
+        # so a busy tenant falls behind the others instead of delaying them
+        start = max(self._virtual_time, self._last_tags.get(tenant, 0.0))
+        tag = start + 1 / self.weights.get(tenant, 1.0)
+        self._last_tags[tenant] = tag
+        waiter = asyncio.get_running_loop().create_future()
+        self._tenants.setdefault(tenant, deque()).append(waiter)
+        heapq.heappush(self._heap, (tag, next(self._counter), tenant, waiter))
+        self._release()
+        return waiter
+
+    def _make_room(self, tenant: Hashable) -> None:
+        queued = len(self._tenants.get(tenant, ()))
+        if queued >= self.max_queued_per_tenant:
+            self.shed_count += 1
+            raise QueueFull("Too many searches of this tenant are queued.")
+        if self.queue_depth < self.max_queued:
+            return
+
+        # Make room at the expense of the tenant that queued the most
+        longest = max(self._tenants, key=lambda key: len(self._tenants[key]), default=None)
+        if longest is None or queued >= len(self._tenants[longest]):
+            self.shed_count += 1
+            raise QueueFull("The search queue is full.")
+        self._shed(longest, self._tenants[longest][-1], "The search queue is full.")
+
+    def _release(self) -> None:
+        while self._running < self.concurrency and self._heap:
+            tag, _, tenant, waiter = heapq.heappop(self._heap)
+            if waiter.done():  # Shed or cancelled
+                continue
+
+            self._tenants[tenant].remove(waiter)
+            self._forget_tenant(tenant)
+            self._virtual_time = tag
+            self._running += 1
+            waiter.set_result(None)
+
+    def _finish(self) -> None:
+        self._running -= 1
+        self._release()
+
+    def _shed(self, tenant: Hashable, waiter: asyncio.Future, message: str) -> None:
+        self._tenants[tenant].remove(waiter)
+        self._forget_tenant(tenant)
+        waiter.set_exception(QueueFull(message))
+        self.shed_count += 1
+
+    def _forget_tenant(self, tenant: Hashable) -> None:
+        if not self._tenants[tenant]:
+            del self._tenants[tenant]
+            del self._last_tags[tenant]
@@ -1,11 +1,30 @@
-from typing import Any, List, Sequence
+from typing import Any, Dict, FrozenSet, List, Sequence, Tuple, Type
+
+from .types.sauce import ArtSauce, BaseSauce, BooruSauce, MangaSauce, TwitterSauce, VideoSauce
 
 
 class Helper:
+    # Filled once the subclass is created, so lookups don't scan the class every time
+    _values: List[Any] = []
+    _names: Dict[Any, str] = {}
+    _human_names: Dict[Any, str] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._values = [getattr(cls, name) for name in dir(cls) if name.isupper()]
+        cls._names = {}
+        for name in dir(cls):
+            if name.isupper():
+                cls._names.setdefault(getattr(cls, name), name)
+        cls._human_names = {
+            value: "".join(word.capitalize() for word in name.split("_"))
+            for value, name in cls._names.items()
+        }
+
     @classmethod
     def get_all_values(cls) -> List[Any]:
         """Get all available consts."""
-        return [getattr(cls, name) for name in dir(cls) if name.isupper()]
+        return list(cls._values)
 
     @classmethod
     def get_value_name(cls, value: int, human_readable: bool = False) -> str:
@@ -16,16 +35,9 @@ class Helper:
         :param human_readable: Whether to make the name human-readable or leave it untouched
         :return:
         """
-        for name in dir(cls):
-            if not name.isupper():
-                continue
-            if getattr(cls, name) == value:
-                if human_readable:
-                    return "".join(word.capitalize() for word in name.split("_"))
-                else:
-                    return name
-
-        return "Unknown"
+        if human_readable:
+            return cls._human_names.get(value, "Unknown")
+        return cls._names.get(value, "Unknown")
 
 
 class SauceIndex(Helper):
@@ -97,10 +109,48 @@ class SauceIndex(Helper):
     @classmethod
     def get_art_indexes(cls) -> Sequence[int]:
         """Returns all art source indexes, like Pixiv and DeviantArt."""
-        excluded = (
-            cls.get_manga_indexes()
-            + cls.get_booru_indexes()
-            + cls.get_video_indexes()
-            + (cls.TWITTER, cls.ALL)
-        )
-        return [value for value in cls.get_all_values() if value not in excluded]
+        return list(_ART_INDEX_LIST)
+
+    @classmethod
+    def get_sauce_type(cls, index_id: int) -> Type[BaseSauce]:
+        """Returns the sauce type that results of the index have, ArtSauce for unknown indexes."""
+        return _SAUCE_TYPES.get(index_id, ArtSauce)
+
+    @classmethod
+    def is_booru_index(cls, index_id: int) -> bool:
+        """Check if the index is a booru source."""
+        return index_id in _BOORU_INDEXES
+
+    @classmethod
+    def is_video_index(cls, index_id: int) -> bool:
+        """Check if the index is an anime/video source."""
+        return index_id in _VIDEO_INDEXES
+
+    @classmethod
+    def is_manga_index(cls, index_id: int) -> bool:
+        """Check if the index is a manga source."""
+        return index_id in _MANGA_INDEXES
+
+    @classmethod
+    def is_art_index(cls, index_id: int) -> bool:
+        """Check if the index is an art source, like Pixiv and DeviantArt."""
+        return index_id in _ART_INDEXES
+
+
+_BOORU_INDEXES: FrozenSet[int] = frozenset(SauceIndex.get_booru_indexes())
+_VIDEO_INDEXES: FrozenSet[int] = frozenset(SauceIndex.get_video_indexes())
+_MANGA_INDEXES: FrozenSet[int] = frozenset(SauceIndex.get_manga_indexes())
+_NOT_ART_INDEXES = (
+    _BOORU_INDEXES | _VIDEO_INDEXES | _MANGA_INDEXES | {SauceIndex.TWITTER, SauceIndex.ALL}
+)
+_ART_INDEX_LIST: Tuple[int, ...] = tuple(
+    value for value in SauceIndex.get_all_values() if value not in _NOT_ART_INDEXES
+)
+_ART_INDEXES: FrozenSet[int] = frozenset(_ART_INDEX_LIST)
+_SAUCE_TYPES: Dict[int, Type[BaseSauce]] = {
+    **dict.fromkeys(_ART_INDEXES, ArtSauce),
+    **dict.fromkeys(_BOORU_INDEXES, BooruSauce),
+    **dict.fromkeys(_VIDEO_INDEXES, VideoSauce),
+    **dict.fromkeys(_MANGA_INDEXES, MangaSauce),
+    SauceIndex.TWITTER: TwitterSauce,
+}
@@ -0,0 +1,145 @@
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .exceptions import AccountBanned, BadAPIKey, LongLimitReached, ShortLimitReached
+from .types.account import AccountInfo
+
+
+class _KeyState:
+    __slots__ = (
+        "short_limit",
+        "short_remaining",
+        "long_remaining",
+        "reserved",
+        "updated_at",
+        "disabled_until",
+    )
+
+    def __init__(self) -> None:
+        self.short_limit: Optional[int] = None
+        self.short_remaining: Optional[int] = None
+        self.long_remaining: Optional[int] = None
+        self.reserved = 0  # Searches in flight
+        self.updated_at = 0.0
+        self.disabled_until = 0.0
+
+
+class KeyPool:
+    """
+    A pool of SauceNao API keys. Every search goes to the key with the most
+    remaining quota, keys that hit a limit or got rejected are skipped until they recover.
+    """
+
+    def __init__(
+        self,
+        api_keys: Iterable[str],
+        short_cooldown: float = 30.0,
+        long_cooldown: float = 3600.0,
+        failure_cooldown: float = 86400.0,
+    ) -> None:
+        """
+        :param api_keys: SauceNao API keys (https://saucenao.com/user.php)
+        :param short_cooldown: Seconds to skip a key for after it reached the 30 second limit
+        :param long_cooldown: Seconds to skip a key for after it reached the daily limit
+        :param failure_cooldown: Seconds to skip a key for after it was rejected or banned
+        """
+        self.short_cooldown = short_cooldown
+        self.long_cooldown = long_cooldown
+        self.failure_cooldown = failure_cooldown
+        self._states: Dict[str, _KeyState] = {key: _KeyState() for key in api_keys}
+        if not self._states:
+            raise ValueError("The key pool needs at least one API key.")
+        self._lock = threading.Lock()
+
+    @property
+    def api_keys(self) -> List[str]:
+        """Get all the keys in the pool."""
+        return list(self._states)
+
+    def get_available_keys(self) -> List[str]:
+        """Get the keys that are not skipped right now."""
+        now = time.monotonic()
+        with self._lock:
+            return [key for key, state in self._states.items() if state.disabled_until <= now]
+
+    def get_recovery_delay(self) -> float:
+        """Get the number of seconds until a key can be used, 0 if one can be used right now."""
+        now = time.monotonic()
+        with self._lock:
+            disabled_until = min(state.disabled_until for state in self._states.values())
+        return max(disabled_until - now, 0.0)
+
+    def select(self) -> str:
+        """
+        Pick the key for the next search. If every key is skipped,
+        the one that recovers first is returned.
+        The key is reserved until :meth:`release` is called, whatever the search ends with.
+        """
+        with self._lock:
+            now = time.monotonic()
+            available = [
+                (key, state) for key, state in self._states.items() if state.disabled_until <= now
+            ]
+            if available:
+                key, state = max(available, key=lambda item: self._get_score(item[1], now))
+            else:
+                key, state = min(self._states.items(), key=lambda item: item[1].disabled_until)
+            # Reserve the quota right away, so concurrent searches spread over the keys
+            state.reserved += 1
+            return key
+
+    def release(self, api_key: str) -> None:
+        """Release the key reserved by :meth:`select` once its search is over."""
+        with self._lock:
+            state = self._states.get(api_key)
+            if state is not None:
+                state.reserved = max(state.reserved - 1, 0)
+
+    def report_success(self, api_key: str, account_info: AccountInfo) -> None:
+        """Update the key quota with the account info of its last response."""
+        with self._lock:
+            state = self._states.get(api_key)
+            if state is None:
+                return
+
+            state.short_limit = account_info.short_limit
+            state.short_remaining = account_info.short_remaining
+            state.long_remaining = account_info.long_remaining
+            state.updated_at = time.monotonic()
+            state.disabled_until = 0.0
+
+    def report_error(self, api_key: str, error: Exception) -> None:
+        """Skip the key for a while if the error says it can't be used right now."""
+        with self._lock:
+            state = self._states.get(api_key)
+            if state is None:
+                return
+
+            now = time.monotonic()
+            if isinstance(error, ShortLimitReached):
+                state.short_limit = error.short_limit
+                state.short_remaining = 0
+                state.long_remaining = error.long_remaining
+                state.updated_at = now
+                state.disabled_until = now + self.short_cooldown
+            elif isinstance(error, LongLimitReached):
+                state.long_remaining = 0
+                state.disabled_until = now + self.long_cooldown
+            elif isinstance(error, (BadAPIKey, AccountBanned)):
+                state.disabled_until = now + self.failure_cooldown
+
+    def _get_short_remaining(self, state: _KeyState, now: float) -> Optional[int]:
+        if state.short_remaining is None:
+            return None
+        if now - state.updated_at >= self.short_cooldown:
+            return state.short_limit  # The 30 second window must have reopened by now
+        return state.short_remaining
+
+    def _get_score(self, state: _KeyState, now: float) -> Tuple[bool, float, float, int]:
+        short_remaining = self._get_short_remaining(state, now)
+        long_remaining = state.long_remaining
+        # Keys without a known quota are treated as unused
+        short_left = float("inf") if short_remaining is None else short_remaining - state.reserved
+        long_left = float("inf") if long_remaining is None else long_remaining - state.reserved
+        return short_left > 0, long_left, short_left, -state.reserved
@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from .types.account import AccountInfo
+
+
+class _Window:
+    __slots__ = ("short_limit", "long_remaining", "sent", "blocked_until")
+
+    def __init__(self) -> None:
+        self.short_limit: Optional[int] = None
+        self.long_remaining: Optional[int] = None
+        self.sent: Deque[float] = deque()
+        self.blocked_until = 0.0
+
+
+class RateLimiter:
+    """
+    Client-side guard for the SauceNao 30 second limit.
+
+    The limiter keeps track of the requests sent with every API key and of the limits
+    SauceNao reports back, holding new requests locally until the short window reopens
+    instead of sending requests that are certain to fail.
+    One instance can be shared between several sync and async clients.
+    """
+
+    def __init__(self, short_period: float = 30.0) -> None:
+        """
+        :param short_period: Length of the SauceNao short limit window in seconds
+        """
+        self.short_period = short_period
+        self._windows: Dict[str, _Window] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, api_key: str) -> None:
+        """Block the current thread until a request with this key can be sent."""
+        while (delay := self._reserve(api_key)) > 0:
+            time.sleep(delay)
+
+    async def async_acquire(self, api_key: str) -> None:
+        """Wait without blocking the event loop until a request with this key can be sent."""
+        while (delay := self._reserve(api_key)) > 0:
+            await asyncio.sleep(delay)
+
+    def update(
+        self,
+        api_key: str,
+        short_remaining: int,
+        short_limit: int,
+        long_remaining: Optional[int] = None,
+    ) -> None:
+        """
+        Sync the local state with the limits reported by SauceNao.
+
+        :param api_key: API key the limits belong to
+        :param short_remaining: Requests left in the current 30 second window
+        :param short_limit: Maximum number of requests per 30 seconds
+        :param long_remaining: Requests left for the day
+        """
+        with self._lock:
+            now = time.monotonic()
+            window = self._get_window(api_key, now)
+            window.short_limit = short_limit
+            if long_remaining is not None:
+                window.long_remaining = long_remaining
+
+            # Someone else may be using the same key, trust the server if it counted more
+            used = short_limit - short_remaining
+            while len(window.sent) < used:
+                window.sent.append(now)
+            if short_remaining <= 0:
+                window.blocked_until = max(window.blocked_until, now + self.short_period)
+
+    def update_from_account_info(self, api_key: str, account_info: AccountInfo) -> None:
+        """Shortcut for :meth:`update` that takes the limits from a response."""
+        self.update(
+            api_key,
+            short_remaining=account_info.short_remaining,
+            short_limit=account_info.short_limit,
+            long_remaining=account_info.long_remaining,
+        )
+
+    def get_delay(self, api_key: str) -> float:
+        """Get the number of seconds a new request with this key would be held for."""
+        with self._lock:
+            now = time.monotonic()
+            return self._get_delay(self._get_window(api_key, now), now)
+
+    def get_long_remaining(self, api_key: str) -> Optional[int]:
+        """Get the last known number of daily requests left, None if unknown."""
+        with self._lock:
+            window = self._windows.get(api_key)
+            return window.long_remaining if window else None
+
+    def _reserve(self, api_key: str) -> float:
+        with self._lock:
+            now = time.monotonic()
+            window = self._get_window(api_key, now)
+            delay = self._get_delay(window, now)
+            if delay <= 0:
+                window.sent.append(now)
+            return delay
+
+    def _get_delay(self, window: _Window, now: float) -> float:
+        if window.blocked_until > now:
+            return window.blocked_until - now
+        if window.short_limit is not None and len(window.sent) >= window.short_limit:
+            return window.sent[0] + self.short_period - now
+        return 0.0
+
+    def _get_window(self, api_key: str, now: float) -> _Window:
+        window = self._windows.get(api_key)
+        if window is None:
+            window = self._windows[api_key] = _Window()
+
+        expired = now - self.short_period
+        while window.sent and window.sent[0] <= expired:
+            window.sent.popleft()
+        return window
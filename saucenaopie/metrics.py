@@ -0,0 +1,188 @@
+import inspect
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+
+from . import exceptions
+from .exceptions import LimitReached, SauceNaoError
+from .types.account import AccountInfo
+
+PHASES = ("upload", "server", "parse")
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """Cumulative histogram with fixed buckets, like the Prometheus one."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "buckets": dict(zip(self.buckets, self.counts)),
+            "sum": self.sum,
+            "count": self.count,
+        }
+
+
+class RequestTimer:
+    """
+    Times a single request. It's passed to httpcore as the `trace` extension
+    to learn when the upload is over and the server starts processing it.
+    """
+
+    __slots__ = ("started", "uploaded")
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.uploaded: Optional[float] = None
+
+    def trace(self, event: str, info: Dict[str, Any]) -> None:
+        if event.endswith("send_request_body.complete"):
+            self.uploaded = time.perf_counter()
+
+    async def async_trace(self, event: str, info: Dict[str, Any]) -> None:
+        self.trace(event, info)
+
+
+class MetricsCollector:
+    """
+    Collects the client metrics: request latency by phase, transferred bytes, result counts,
+    errors by exception class and the remaining quota of the latest response.
+    The errors raised before sending, like a rejected upload or an open circuit, are counted too.
+    Pass it to a client to enable it, it can be shared by many clients.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """
+        :param buckets: Upper bounds of the latency histogram buckets, in seconds
+        """
+        self.latency = {phase: Histogram(buckets) for phase in PHASES}
+        self.requests = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.results_returned = 0  # Before the parsing skips the broken results
+        # Every library exception is listed, so the exported series don't appear out of nowhere
+        self.errors: Dict[str, int] = {
+            name: 0
+            for name, value in inspect.getmembers(exceptions, inspect.isclass)
+            if issubclass(value, SauceNaoError)
+        }
+        self.short_remaining: Optional[int] = None
+        self.long_remaining: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def start_request() -> RequestTimer:
+        return RequestTimer()
+
+    def record_response(self, timer: RequestTimer, response: httpx.Response) -> None:
+        """Record the upload and server phases of the request that got the response."""
+        now = time.perf_counter()
+        uploaded = timer.uploaded if timer.uploaded is not None else timer.started
+        request_bytes = int(response.request.headers.get("Content-Length", 0))
+        with self._lock:
+            self.requests += 1
+            self.request_bytes += request_bytes
+            self.response_bytes += len(response.content)
+            self.latency["upload"].observe(uploaded - timer.started)
+            self.latency["server"].observe(now - uploaded)
+
+    def record_parse(
+        self, duration: float, account_info: AccountInfo, results_returned: int
+    ) -> None:
+        with self._lock:
+            self.latency["parse"].observe(duration)
+            self.results_returned += results_returned
+            self.short_remaining = account_info.short_remaining
+            self.long_remaining = account_info.long_remaining
+
+    def record_error(self, error: Exception) -> None:
+        name = type(error).__name__
+        with self._lock:
+            self.errors[name] = self.errors.get(name, 0) + 1
+            if isinstance(error, LimitReached):
+                self.short_remaining = error.short_remaining
+                self.long_remaining = error.long_remaining
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get a consistent copy of all the metrics."""
+        with self._lock:
+            return {
+                "latency": {phase: hist.snapshot() for phase, hist in self.latency.items()},
+                "requests": self.requests,
+                "request_bytes": self.request_bytes,
+                "response_bytes": self.response_bytes,
+                "results_returned": self.results_returned,
+                "errors": dict(self.errors),
+                "short_remaining": self.short_remaining,
+                "long_remaining": self.long_remaining,
+            }
+
+
+def to_prometheus_text(collector: MetricsCollector, namespace: str = "saucenaopie") -> str:
+    """
+    Export the metrics in the Prometheus text format, to serve them on a /metrics endpoint.
+
+    :param collector: Metrics to export
+    :param namespace: Prefix of the metric names
+    """
+    snapshot = collector.snapshot()
+    lines: List[str] = []
+
+    def add(name: str, kind: str, description: str, samples: List[str]) -> None:
+        lines.append(f"# HELP {namespace}_{name} {description}")
+        lines.append(f"# TYPE {namespace}_{name} {kind}")
+        lines.extend(f"{namespace}_{sample}" for sample in samples)
+
+    latency_samples = []
+    for phase, hist in snapshot["latency"].items():
+        name = "request_duration_seconds"
+        for bound, count in hist["buckets"].items():
+            latency_samples.append(f'{name}_bucket{{phase="{phase}",le="{bound}"}} {count}')
+        latency_samples.append(f'{name}_bucket{{phase="{phase}",le="+Inf"}} {hist["count"]}')
+        latency_samples.append(f'{name}_sum{{phase="{phase}"}} {hist["sum"]}')
+        latency_samples.append(f'{name}_count{{phase="{phase}"}} {hist["count"]}')
+    add("request_duration_seconds", "histogram", "Search latency by phase.", latency_samples)
+
+    for name, description in (
+        ("requests", "Requests that got a response."),
+        ("request_bytes", "Bytes sent in request bodies."),
+        ("response_bytes", "Bytes received in response bodies."),
+        ("results_returned", "Results returned by the API, including the ones parsing skipped."),
+    ):
+        add(f"{name}_total", "counter", description, [f"{name}_total {snapshot[name]}"])
+
+    add(
+        "errors_total",
+        "counter",
+        "Errors by exception class.",
+        [
+            f'errors_total{{exception="{name}"}} {count}'
+            for name, count in snapshot["errors"].items()
+        ],
+    )
+    for name in ("short_remaining", "long_remaining"):
+        if snapshot[name] is not None:
+            add(
+                name,
+                "gauge",
+                "Remaining searches of the latest response.",
+                [f"{name} {snapshot[name]}"],
+            )
+
+    return "\n".join(lines) + "\n"
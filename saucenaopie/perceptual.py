@@ -0,0 +1,236 @@
+import io
+import itertools
+import json
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+from .types.response import SauceResponse
+
+T = TypeVar("T")
+FileType = TypeVar("FileType", str, Path, BinaryIO)
+
+
+def get_hash_distance(first: int, second: int) -> int:
+    """Get the number of differing bits of the two hashes."""
+    return bin(first ^ second).count("1")
+
+
+class BKTree(Generic[T]):
+    """Burkhard-Keller tree of image hashes, finds the hashes within a Hamming distance."""
+
+    def __init__(self) -> None:
+        self._root: Optional[Tuple[int, T, Dict[int, Any]]] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, image_hash: int, value: T) -> None:
+        self._size += 1
+        if self._root is None:
+            self._root = (image_hash, value, {})
+            return
+
+        node = self._root
+        while True:
+            distance = get_hash_distance(node[0], image_hash)
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = (image_hash, value, {})
+                return
+            node = child
+
+    def find(
+        self,
+        image_hash: int,
+        max_distance: int,
+        accept: Optional[Callable[[T], bool]] = None,
+    ) -> Optional[Tuple[int, T]]:
+        """
+        Get the (distance, value) of the closest hash, None if none is close enough.
+
+        :param accept: Skip the values it returns False for
+        """
+        best: Optional[Tuple[int, T]] = None
+        nodes = [self._root] if self._root is not None else []
+        while nodes:
+            node_hash, value, children = nodes.pop()
+            distance = get_hash_distance(node_hash, image_hash)
+            if (
+                distance <= max_distance
+                and (best is None or distance < best[0])
+                and (accept is None or accept(value))
+            ):
+                best = (distance, value)
+                if distance == 0:
+                    break
+            # The triangle inequality rules out every other subtree
+            nodes.extend(
+                child
+                for child_distance, child in children.items()
+                if abs(child_distance - distance) <= max_distance
+            )
+        return best
+
+
+class PerceptualIndex:
+    """
+    Finds the images that were already searched, even if they were re-encoded, resized
+    or slightly edited, by their difference hash (dHash). The stored response is returned
+    instead of searching again. Unlike the cache, it only works for the uploaded files.
+    The oldest responses are evicted by size and TTL.
+
+    Requires Pillow, install it with `pip install saucenaopie[images]`.
+    """
+
+    def __init__(
+        self,
+        max_distance: int = 6,
+        hash_size: int = 8,
+        maxsize: int = 1024,
+        ttl: Optional[float] = 86400.0,
+    ) -> None:
+        """
+        :param max_distance: Maximum number of differing hash bits for the images to match,
+         out of `hash_size` squared
+        :param hash_size: Side of the hash grid, the hash has `hash_size` squared bits
+        :param maxsize: Maximum number of stored responses
+        :param ttl: Seconds to keep a response for, None to keep it until it's evicted by size
+        """
+        try:
+            from PIL import Image
+        except ImportError:
+            raise ImportError(
+                "Pillow is required for the perceptual index, "
+                "install it with `pip install saucenaopie[images]`."
+            ) from None
+
+        self._image = Image
+        self.max_distance = max_distance
+        self.hash_size = hash_size
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Entry ID -> (created, params key, hash, response), the oldest first
+        self._entries: "OrderedDict[int, Tuple[float, str, int, SauceResponse]]" = OrderedDict()
+        # The trees only hold entry IDs, evicted ones stay there until the trees are rebuilt
+        self._trees: Dict[str, BKTree[int]] = {}
+        self._tree_size = 0
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_hash(self, content: bytes) -> Optional[int]:
+        """Get the difference hash of the image, None if it can't be decoded."""
+        try:
+            with self._image.open(io.BytesIO(content)) as image:
+                image.draft("L", (self.hash_size * 4, self.hash_size * 4))  # Faster JPEG decoding
+                pixels = list(
+                    image.convert("L")
+                    .resize((self.hash_size + 1, self.hash_size), self._image.LANCZOS)
+                    .getdata()
+                )
+        except (OSError, ValueError, self._image.DecompressionBombError):
+            return None
+
+        image_hash = 0
+        width = self.hash_size + 1
+        for row in range(self.hash_size):
+            for column in range(self.hash_size):
+                left = pixels[row * width + column]
+                image_hash = (image_hash << 1) | (left > pixels[row * width + column + 1])
+        return image_hash
+
+    def find(self, image_hash: int, params: Dict[str, Any]) -> Optional[SauceResponse]:
+        """
+        Get the stored response of a similar image searched with the same params.
+
+        :param image_hash: Hash of the image
+        :param params: Search params that affect the results, like db and numres
+        """
+        with self._lock:
+            self._evict(time.monotonic())
+            tree = self._trees.get(self._get_params_key(params))
+            match = None
+            if tree is not None:
+                match = tree.find(image_hash, self.max_distance, self._entries.__contains__)
+            if match is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return self._entries[match[1]][3]
+
+    def add(self, image_hash: int, params: Dict[str, Any], response: SauceResponse) -> None:
+        """Store the response of the image."""
+        with self._lock:
+            now = time.monotonic()
+            entry_id = next(self._ids)
+            params_key = self._get_params_key(params)
+            self._entries[entry_id] = (now, params_key, image_hash, response)
+            self._trees.setdefault(params_key, BKTree()).add(image_hash, entry_id)
+            self._tree_size += 1
+            self._evict(now)
+
+    def clear(self) -> None:
+        """Remove all the stored responses."""
+        with self._lock:
+            self._entries.clear()
+            self._trees.clear()
+            self._tree_size = 0
+
+    def _evict(self, now: float) -> None:
+        while self._entries:
+            entry_id, (created, *_) = next(iter(self._entries.items()))
+            expired = self.ttl is not None and now - created > self.ttl
+            if not expired and len(self._entries) <= self.maxsize:
+                break
+            del self._entries[entry_id]
+            self.evictions += 1
+
+        if self._tree_size > 2 * len(self._entries) + 64:
+            # A BK-tree can't remove nodes, so it's rebuilt from the entries that are left
+            self._trees = {}
+            for entry_id, (_, params_key, image_hash, _) in self._entries.items():
+                self._trees.setdefault(params_key, BKTree()).add(image_hash, entry_id)
+            self._tree_size = len(self._entries)
+
+    def group_duplicates(self, files: Iterable[FileType]) -> List[List[FileType]]:
+        """
+        Group the near-duplicate files, so only the first file of every group has to be searched.
+        Files that can't be decoded get their own groups.
+
+        :param files: File Paths / BytesIO to group
+        :return: Groups of files in the input order
+        """
+        groups: List[List[FileType]] = []
+        tree: BKTree[int] = BKTree()
+        for file in files:
+            if isinstance(file, (str, Path)):
+                content = Path(file).read_bytes()
+            else:
+                position = file.tell()
+                content = file.read()
+                file.seek(position)
+
+            image_hash = self.get_hash(content)
+            match = tree.find(image_hash, self.max_distance) if image_hash is not None else None
+            if match is not None:
+                groups[match[1]].append(file)
+                continue
+
+            if image_hash is not None:
+                tree.add(image_hash, len(groups))
+            groups.append([file])
+        return groups
+
+    @staticmethod
+    def _get_params_key(params: Dict[str, Any]) -> str:
+        return json.dumps(params, sort_keys=True, default=str)
@@ -0,0 +1,105 @@
+import random
+import threading
+import time
+from collections import deque
+from typing import Deque, Optional
+
+import httpx
+
+from .exceptions import ShortLimitReached, UnknownServerError
+
+
+class RetryPolicy:
+    """
+    Decides whether a failed search should be sent again and when.
+
+    The 30 second limit is retried once the window reopens, or right away with another key
+    of the pool. Server errors and timeouts are retried with exponential backoff and jitter.
+    Everything else, like the daily limit, bad API key or invalid image, is never retried
+    because it would fail again. Network errors are only retried if you allow it, because
+    SauceNao may have counted the search before the connection broke.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        jitter: float = 0.5,
+        short_period: float = 30.0,
+        retry_budget: Optional[int] = 10,
+        budget_period: float = 60.0,
+        retry_network_errors: bool = False,
+    ) -> None:
+        """
+        :param max_attempts: Maximum number of attempts for a single search, including the first one
+        :param backoff: Delay before the first retry of a server error or timeout, in seconds
+        :param max_backoff: Maximum delay between the retries, in seconds
+        :param jitter: Random part of the backoff delay, from 0 to 1
+        :param short_period: Length of the SauceNao short limit window in seconds
+        :param retry_budget: Maximum number of retries per `budget_period` for all the searches
+         that use this policy, so retries don't lead to TooManyFailedRequests. None for no limit
+        :param budget_period: Retry budget period in seconds
+        :param retry_network_errors: Retry the network errors too, a search may be counted twice
+        """
+        if max_attempts < 1:
+            raise ValueError("The number of attempts must be at least 1.")
+
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.short_period = short_period
+        self.retry_budget = retry_budget
+        self.budget_period = budget_period
+        self.retry_network_errors = retry_network_errors
+        self._retries: Deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def is_retryable(self, error: Exception) -> bool:
+        """Check if the error is worth retrying at all."""
+        if isinstance(error, httpx.NetworkError):
+            return self.retry_network_errors
+        return isinstance(error, (ShortLimitReached, UnknownServerError, httpx.TimeoutException))
+
+    def get_delay(
+        self, attempt: int, error: Exception, window_delay: Optional[float] = None
+    ) -> Optional[float]:
+        """
+        Get the delay before the next attempt, in seconds.
+
+        :param attempt: Number of the attempt that failed, starting from 1
+        :param error: Exception raised by the failed attempt
+        :param window_delay: Seconds until a key can search again after the 30 second limit,
+         if the client knows it. `short_period` is waited if None
+        :return: None if the search must not be retried
+        """
+        if attempt >= self.max_attempts or not self.is_retryable(error):
+            return None
+        if not self._spend_budget():
+            return None
+
+        if isinstance(error, ShortLimitReached):
+            if window_delay is None:
+                window_delay = self.short_period
+            elif window_delay <= 0:
+                return 0.0  # Another key can search right away
+            # Wait for the window to reopen, the jitter keeps parallel retries apart
+            return window_delay + random.uniform(0, self.backoff)
+
+        delay = min(self.backoff * 2 ** (attempt - 1), self.max_backoff)
+        return delay * (1 - self.jitter * random.random())
+
+    def _spend_budget(self) -> bool:
+        if self.retry_budget is None:
+            return True
+
+        with self._lock:
+            now = time.monotonic()
+            while self._retries and self._retries[0] <= now - self.budget_period:
+                self._retries.popleft()
+            if len(self._retries) >= self.retry_budget:
+                return False
+
+            self._retries.append(now)
+            return True
@@ -0,0 +1,190 @@
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple, Union
+
+from .client import AsyncSauceNao
+from .exceptions import LongLimitReached
+from .helper import Helper
+from .types.response import SauceResponse
+
+
+class Priority(Helper):
+    HIGH = 0  # Sent right away, may use the headroom
+    NORMAL = 1
+    LOW = 2
+
+
+class BudgetScheduler:
+    """
+    Paces the searches of an async client, so the daily limit lasts the whole day.
+
+    The remaining daily searches, except for the headroom, are spread evenly over the rest
+    of the window. High priority searches are sent right away and may use the headroom,
+    the others wait in a queue, normal ones before the low ones, and are released at the
+    pacing rate. Once the budget is spent, they wait for the next window instead of failing.
+
+    It's made for a single API key, with a key pool the budget of the last used key is followed.
+    """
+
+    def __init__(
+        self,
+        client: AsyncSauceNao,
+        headroom: float = 0.2,
+        period: float = 86400.0,
+        long_limit: Optional[int] = None,
+    ) -> None:
+        """
+        :param client: Client to search with
+        :param headroom: Part of the daily limit that is kept for high priority searches
+        :param period: Length of the budget window in seconds, the window starts now
+        :param long_limit: Daily limit of the key, learned from the first response if None
+        """
+        self.client = client
+        self.headroom = headroom
+        self.period = period
+        self.long_limit = long_limit
+        self.long_remaining = long_limit
+        self.window_end = time.monotonic() + period
+        self._queue: List[Tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self._last_release = float("-inf")
+        self._probing = False  # A search was sent to learn the unknown budget
+        self._changed: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Future] = None
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of searches waiting for their turn."""
+        return sum(1 for _, _, waiter in self._queue if not waiter.done())
+
+    def get_queue_depths(self) -> Dict[str, int]:
+        """Get the number of waiting searches of every priority."""
+        depths = {Priority.get_value_name(value): 0 for value in Priority.get_all_values()}
+        for priority, _, waiter in self._queue:
+            if not waiter.done():
+                depths[Priority.get_value_name(priority)] += 1
+        return depths
+
+    @property
+    def pacing_rate(self) -> Optional[float]:
+        """Searches per second the queued searches are released at, None if the budget is unknown."""
+        now = time.monotonic()
+        self._roll_window(now)
+        available = self._get_available()
+        if available is None:
+            return None
+        return max(available, 0) / max(self.window_end - now, 1e-9)
+
+    async def search(
+        self,
+        file: Union[str, Path, BinaryIO],
+        *,
+        priority: int = Priority.NORMAL,
+        **kwargs: Any,
+    ) -> SauceResponse:
+        """
+        Search once the budget allows it. Takes the same arguments as `AsyncSauceNao.search`.
+
+        :param file: File Path / BytesIO / URL (with from_url=True)
+        :param priority: Search priority, look at :class:`Priority`
+        """
+        probe = False
+        if priority == Priority.HIGH:
+            self._spend()
+        else:
+            probe = await self._wait_turn(priority)
+
+        used_quota = True
+        try:
+            response = await self.client.search(file, **kwargs)
+        except LongLimitReached as error:
+            self.long_limit = error.long_limit
+            self.long_remaining = 0
+            raise
+        else:
+            # The account info of a reused response is as old as the response itself
+            if response.from_cache:
+                used_quota = False
+            else:
+                self.long_limit = response.account_info.long_limit
+                self.long_remaining = response.account_info.long_remaining
+            return response
+        finally:
+            self._finish(used_quota, probe)
+
+    async def _wait_turn(self, priority: int) -> bool:
+        """Wait until the search is released, return True if it's the search that learns the budget."""
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._counter), waiter))
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.ensure_future(self._dispatch())
+        try:
+            return await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The turn came, but the search won't use it
+                self._finish(used_quota=False, probe=waiter.result())
+            raise
+
+    async def _dispatch(self) -> None:
+        while self._queue:
+            delay = self._get_delay(time.monotonic())
+            if delay > 0:
+                self._changed.clear()
+                try:
+                    await asyncio.wait_for(self._changed.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, _, waiter = heapq.heappop(self._queue)
+            if not waiter.done():  # Cancelled searches are skipped
+                self._probing = self._get_available() is None
+                self._spend()
+                self._last_release = time.monotonic()
+                waiter.set_result(self._probing)
+
+    def _get_delay(self, now: float) -> float:
+        """Get the seconds to wait before the next queued search can be sent."""
+        self._roll_window(now)
+        available = self._get_available()
+        if available is None:
+            # Nothing is known yet, a single search is sent to learn the budget
+            return self.period if self._probing else 0.0
+        if available <= 0:
+            return self.window_end - now
+
+        interval = (self.window_end - now) / available
+        return max(self._last_release + interval - now, 0.0)
+
+    def _get_available(self) -> Optional[int]:
+        if self.long_remaining is None or self.long_limit is None:
+            return None
+        return self.long_remaining - math.ceil(self.long_limit * self.headroom)
+
+    def _roll_window(self, now: float) -> None:
+        if now < self.window_end:
+            return
+
+        while self.window_end <= now:
+            self.window_end += self.period
+        self.long_remaining = self.long_limit  # The daily limit is restored
+
+    def _finish(self, used_quota: bool, probe: bool) -> None:
+        if probe:
+            self._probing = False
+        if not used_quota and self.long_remaining is not None:
+            self.long_remaining = min(self.long_remaining + 1, self.long_limit)  # Give it back
+        if self._changed is not None:
+            self._changed.set()
+
+    def _spend(self) -> None:
+        # Counted right away, so the searches in flight are not paced as if they were free
+        if self.long_remaining is not None:
+            self.long_remaining = max(self.long_remaining - 1, 0)
@@ -0,0 +1,94 @@
+import threading
+from typing import Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from .helper import SauceIndex
+from .types.response import CascadeResponse, Header, SauceResponse
+from .types.result import SauceResult
+
+_IndexType = Union[SauceIndex, int]
+_StageType = Union[_IndexType, Iterable[_IndexType]]
+
+
+class CascadeStrategy:
+    """
+    Searches the targeted indexes first and falls back to the wider ones only on a miss.
+
+    Every stage is a full search and spends the quota like any other. The next stage is
+    only searched if the best result so far is below the minimum similarity, so a hit in
+    the first stage gives fewer, more relevant results, while a miss costs several searches.
+    The strategy counts which stage answered, to help you pick the stages.
+    """
+
+    def __init__(
+        self,
+        stages: Sequence[_StageType] = (
+            (SauceIndex.PIXIV, SauceIndex.TWITTER),
+            SauceIndex.ALL,
+        ),
+        min_similarity: Optional[float] = None,
+    ) -> None:
+        """
+        :param stages: Indexes to search in for every stage, a stage can be an index
+         or an iterable of indexes
+        :param min_similarity: Similarity that the best result must have to stop the search,
+         the min similarity from the response header is used if None
+        """
+        if not stages:
+            raise ValueError("At least one stage must be specified.")
+
+        self.stages: Tuple[_StageType, ...] = tuple(
+            stage if isinstance(stage, int) else tuple(stage) for stage in stages
+        )
+        self.min_similarity = min_similarity
+        self.answered_counts = [0] * len(self.stages)
+        self.miss_count = 0
+        self._lock = threading.Lock()
+
+    def is_answered(self, response: SauceResponse) -> bool:
+        """Check if the best result of the response is similar enough."""
+        if not response.results:
+            return False
+
+        min_similarity = self.min_similarity
+        if min_similarity is None:
+            min_similarity = response.header.min_similarity
+        return response.results[0].similarity >= min_similarity
+
+    def merge(
+        self, responses: List[SauceResponse], answered_stage: Optional[int]
+    ) -> CascadeResponse:
+        """
+        Merge the stage responses into one, dropping the results that were found twice.
+
+        :param responses: Responses of the searched stages, in order
+        :param answered_stage: Number of the stage whose result was similar enough
+        """
+        with self._lock:
+            if answered_stage is None:
+                self.miss_count += 1
+            else:
+                self.answered_counts[answered_stage] += 1
+
+        seen: Set[Tuple[int, str]] = set()
+        results: List[SauceResult] = []
+        for response in responses:
+            for result in response.results:
+                key = (result.index.id, result.thumbnail)
+                if key not in seen:
+                    seen.add(key)
+                    results.append(result)
+        results.sort(key=lambda r: r.similarity, reverse=True)
+
+        last = responses[-1]
+        return CascadeResponse.construct(
+            header=Header.construct(
+                results_requested=sum(r.header.results_requested for r in responses),
+                search_depth=last.header.search_depth,
+                min_similarity=last.header.min_similarity,
+                results_returned=len(results),
+            ),
+            account_info=last.account_info,
+            results=results,
+            answered_stage=answered_stage,
+            searched_stages=len(responses),
+        )
@@ -0,0 +1,219 @@
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Type, Union
+
+from .helper import SauceIndex
+from .types.response import SauceResponse
+from .types.sauce import BaseSauce
+
+try:
+    import numpy as np
+except ImportError:  # Filters fall back to plain loops
+    np = None
+
+_IndexType = Union[SauceIndex, int]
+
+_COLUMNS = {
+    "similarity": "f",
+    "index_id": "H",
+    "min_similarity": "f",
+    "response": "I",
+    "url_id": "i",
+}
+
+
+class ResultRow(NamedTuple):
+    """A single result of the table."""
+
+    response: int
+    similarity: float
+    index_id: int
+    min_similarity: float
+    url: Optional[str]
+
+
+class ResultTable:
+    """
+    Compact columnar storage for the results of many responses, made for bulk analytics.
+
+    Every result takes about 20 bytes: similarity, index ID, minimum similarity of its
+    response, response ordinal and the first URL, which is interned. The filters work
+    on whole columns at once and are vectorized if NumPy is installed.
+    """
+
+    def __init__(self) -> None:
+        self._columns: Dict[str, array] = {
+            name: array(typecode) for name, typecode in _COLUMNS.items()
+        }
+        self._urls: List[str] = []
+        self._url_ids: Dict[str, int] = {}
+        self.response_count = 0
+
+    @classmethod
+    def from_responses(cls, responses: Iterable[SauceResponse]) -> "ResultTable":
+        """Build a table from many responses."""
+        table = cls()
+        for response in responses:
+            table.add_response(response)
+        return table
+
+    def add_response(self, response: SauceResponse) -> int:
+        """
+        Append the response results to the table. Lazy results are built for it,
+        so the results that fail to parse are skipped like in a regular response.
+
+        :return: Ordinal of the response in the table
+        """
+        ordinal = self.response_count
+        self.response_count += 1
+        min_similarity = response.header.min_similarity
+        columns = self._columns
+        for result in response.results:
+            columns["similarity"].append(result.similarity)
+            columns["index_id"].append(result.index.id)
+            columns["min_similarity"].append(min_similarity)
+            columns["response"].append(ordinal)
+            columns["url_id"].append(self._intern_url(result.data.first_url))
+
+        return ordinal
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the columns, without the interned URLs."""
+        return sum(column.itemsize * len(column) for column in self._columns.values())
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """Get copies of the columns as NumPy arrays."""
+        if np is None:
+            raise ImportError("NumPy is required, install it with `pip install numpy`.")
+        return {name: view.copy() for name, view in self._get_views().items()}
+
+    def get_url(self, row: int) -> Optional[str]:
+        """Get the first URL of the result by its row number."""
+        url_id = self._columns["url_id"][row]
+        return self._urls[url_id] if url_id >= 0 else None
+
+    def get_likely_results(self, must_have_url: bool = False) -> "ResultTable":
+        """
+        Get all the results that are above the minimum similarity of their responses.
+
+        :param must_have_url: Only return results that have at least one URL
+        """
+        if np is not None:
+            columns = self._get_views()
+            mask = columns["similarity"] >= columns["min_similarity"]
+            if must_have_url:
+                mask &= columns["url_id"] >= 0
+            return self._take(mask)
+
+        return self._take(
+            [
+                similarity >= min_similarity and (not must_have_url or url_id >= 0)
+                for similarity, min_similarity, url_id in zip(
+                    self._columns["similarity"],
+                    self._columns["min_similarity"],
+                    self._columns["url_id"],
+                )
+            ]
+        )
+
+    def filter_results_by_index(
+        self, index: Union[Iterable[_IndexType], _IndexType], above_min_similarity: bool = True
+    ) -> "ResultTable":
+        """
+        Get all results of the specified index(es).
+
+        :param index: Sauce index, can pass many as iterable.
+        :param above_min_similarity: Only include results that are above the min similarity
+        """
+        indexes = {index} if isinstance(index, int) else set(index)
+        if np is not None:
+            columns = self._get_views()
+            mask = np.isin(columns["index_id"], list(indexes))
+            if above_min_similarity:
+                mask &= columns["similarity"] >= columns["min_similarity"]
+            return self._take(mask)
+
+        return self._take(
+            [
+                index_id in indexes and (not above_min_similarity or similarity >= min_similarity)
+                for index_id, similarity, min_similarity in zip(
+                    self._columns["index_id"],
+                    self._columns["similarity"],
+                    self._columns["min_similarity"],
+                )
+            ]
+        )
+
+    def filter_results_by_type(
+        self, result_type: Type[BaseSauce], above_min_similarity: bool = True
+    ) -> "ResultTable":
+        """
+        Get all results of the specified sauce type.
+
+        :param result_type: Type of sauce that is required
+        :param above_min_similarity: Only include results that are above the min similarity
+        """
+        indexes = [
+            index_id
+            for index_id in set(self._columns["index_id"])
+            if issubclass(SauceIndex.get_sauce_type(index_id), result_type)
+        ]
+        return self.filter_results_by_index(indexes, above_min_similarity)
+
+    def _get_views(self) -> Dict[str, Any]:
+        # Zero-copy views, they must not outlive the call, or the columns can't grow
+        return {
+            name: np.frombuffer(column, dtype=column.typecode)
+            for name, column in self._columns.items()
+        }
+
+    def _intern_url(self, url: Optional[str]) -> int:
+        if url is None:
+            return -1
+
+        url_id = self._url_ids.get(url)
+        if url_id is None:
+            url_id = self._url_ids[url] = len(self._urls)
+            self._urls.append(url)
+        return url_id
+
+    def _take(self, mask: Any) -> "ResultTable":
+        """Make a table of the rows where the mask is true, sharing the interned URLs."""
+        table = ResultTable()
+        table._urls = self._urls
+        table._url_ids = self._url_ids
+        table.response_count = self.response_count
+        if np is not None:
+            rows = np.flatnonzero(mask)
+            for name, view in self._get_views().items():
+                table._columns[name] = array(_COLUMNS[name], view[rows].tobytes())
+        else:
+            for name, column in self._columns.items():
+                table._columns[name] = array(
+                    column.typecode, (value for value, keep in zip(column, mask) if keep)
+                )
+
+        return table
+
+    def __len__(self) -> int:
+        return len(self._columns["similarity"])
+
+    def __iter__(self) -> Iterator[ResultRow]:
+        columns = self._columns
+        for similarity, index_id, min_similarity, response, url_id in zip(
+            columns["similarity"],
+            columns["index_id"],
+            columns["min_similarity"],
+            columns["response"],
+            columns["url_id"],
+        ):
+            yield ResultRow(
+                response=response,
+                similarity=similarity,
+                index_id=index_id,
+                min_similarity=min_similarity,
+                url=self._urls[url_id] if url_id >= 0 else None,
+            )
+
+    def __repr__(self) -> str:
+        return f"ResultTable({len(self)} results from {self.response_count} responses)"
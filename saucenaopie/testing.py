@@ -0,0 +1,352 @@
+"""
+A local stand-in for the SauceNao API, to test and benchmark code that uses the library
+without spending the search quota or depending on the network.
+"""
+
+import asyncio
+import itertools
+import json
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+import httpx
+
+_BODY_HEAD_SIZE = 4096  # Enough for the multipart form fields
+
+# Made-up search results shaped like the SauceNao ones, one per sauce type. The IDs, names
+# and URLs are fabricated, so don't use them as real fixtures for the parser
+
+RESULTS: List[Dict[str, Any]] = [
+    {
+        "header": {
+            "similarity": "93.27",
+            "thumbnail": "https://img1.saucenao.com/res/pixiv/8523/85235017_p0_master1200.jpg",
+            "index_id": 5,
+            "index_name": "Index #5: Pixiv Images - 85235017_p0_master1200.jpg",
+            "dupes": 0,
+            "hidden": 0,
+        },
+        "data": {
+            "ext_urls": ["https://www.pixiv.net/member_illust.php?mode=medium&illust_id=85235017"],
+            "title": "夏の終わり",
+            "pixiv_id": 85235017,
+            "member_name": "AO",
+            "member_id": 1234567,
+        },
+    },
+    {
+        "header": {
+            "similarity": "91.04",
+            "thumbnail": "https://img3.saucenao.com/booru/2/8/28f0d9c1a5b8e3a1_2.jpg",
+            "index_id": 9,
+            "index_name": "Index #9: Danbooru - 28f0d9c1a5b8e3a1.jpg",
+            "dupes": 1,
+            "hidden": 0,
+        },
+        "data": {
+            "ext_urls": [
+                "https://danbooru.donmai.us/post/show/4135211",
+                "https://gelbooru.com/index.php?page=post&s=view&id=5622911",
+            ],
+            "danbooru_id": 4135211,
+            "gelbooru_id": 5622911,
+            "creator": "ao (flowerclasse)",
+            "material": "original",
+            "characters": "iren lovel",
+            "source": "https://i.pximg.net/img-original/img/2020/10/26/00/00/06/85235017_p0.png",
+        },
+    },
+    {
+        "header": {
+            "similarity": "88.51",
+            "thumbnail": "https://img3.saucenao.com/twitter/1321/1321452313093738496_1.jpg",
+            "index_id": 41,
+            "index_name": "Index #41: Twitter - 1321452313093738496_1.jpg",
+            "dupes": 0,
+            "hidden": 0,
+        },
+        "data": {
+            "ext_urls": ["https://twitter.com/i/web/status/1321452313093738496"],
+            "created_at": "2020-10-28T14:00:06Z",
+            "tweet_id": "1321452313093738496",
+            "twitter_user_id": "1012311244",
+            "twitter_user_handle": "ao_flowerclasse",
+        },
+    },
+    {
+        "header": {
+            "similarity": "72.38",
+            "thumbnail": "https://img3.saucenao.com/anime/4503/45031.jpg",
+            "index_id": 21,
+            "index_name": "Index #21: Anime - 45031",
+            "dupes": 0,
+            "hidden": 0,
+        },
+        "data": {
+            "ext_urls": ["https://anidb.net/anime/4503"],
+            "source": "Suzumiya Haruhi no Yuuutsu",
+            "anidb_aid": 4503,
+            "mal_id": 849,
+            "anilist_id": 849,
+            "part": "03",
+            "year": "2006-2006",
+            "est_time": "00:08:14 / 00:24:32",
+        },
+    },
+    {
+        "header": {
+            "similarity": "65.17",
+            "thumbnail": "https://img3.saucenao.com/mangadex/1034/1034562.jpg",
+            "index_id": 37,
+            "index_name": "Index #37: MangaDex - 1034562",
+            "dupes": 0,
+            "hidden": 0,
+        },
+        "data": {
+            "ext_urls": ["https://mangadex.org/chapter/ab7dd2f6-9c2a-4e5b-a9e4-79f0c4b4d8a2/"],
+            "md_id": "ab7dd2f6-9c2a-4e5b-a9e4-79f0c4b4d8a2",
+            "mu_id": 112333,
+            "source": "Yotsuba to!",
+            "part": " - Chapter 101",
+            "artist": "Azuma Kiyohiko",
+            "author": "Azuma Kiyohiko",
+        },
+    },
+    {
+        "header": {
+            "similarity": "58.93",
+            "thumbnail": "https://img3.saucenao.com/deviantart/768/76801135.jpg",
+            "index_id": 34,
+            "index_name": "Index #34: deviantArt - 76801135",
+            "dupes": 0,
+            "hidden": 0,
+        },
+        "data": {
+            "ext_urls": ["https://deviantart.com/view/768011350"],
+            "title": "Autumn Leaves",
+            "da_id": "768011350",
+            "author_name": "someartist",
+            "author_url": "https://www.deviantart.com/someartist",
+        },
+    },
+    {
+        "header": {
+            "similarity": "47.75",
+            "thumbnail": "https://img3.saucenao.com/ehentai/3f/3f28b26a.jpg",
+            "index_id": 38,
+            "index_name": "Index #38: E-Hentai - 3f28b26a",
+            "dupes": 0,
+            "hidden": 0,
+        },
+        "data": {
+            "ext_urls": [],
+            "source": "(C97) [Circle] Some Doujinshi (Original)",
+            "creator": ["circle", "artist"],
+            "eng_name": "(C97) [Circle] Some Doujinshi (Original)",
+            "jp_name": "(C97) [サークル] 同人誌 (オリジナル)",
+        },
+    },
+    {
+        "header": {
+            "similarity": "41.02",
+            "thumbnail": "https://img3.saucenao.com/artstation/0/0a1b2c3d.jpg",
+            "index_id": 39,
+            "index_name": "Index #39: Artstation - 0a1b2c3d",
+            "dupes": 0,
+            "hidden": 0,
+        },
+        "data": {
+            "ext_urls": ["https://www.artstation.com/artwork/0a1b2c3d"],
+            "as_project": "0a1b2c3d",
+            "title": "Evening",
+            "author_name": "Some Artist",
+            "author_url": "https://www.artstation.com/someartist",
+        },
+    },
+]
+
+
+def make_payload(result_count: int) -> Dict[str, Any]:
+    """Make a successful search response with the given number of results."""
+    return {
+        "header": {
+            "user_id": "57001",
+            "account_type": "1",
+            "short_limit": "4",
+            "long_limit": "100",
+            "long_remaining": 96,
+            "short_remaining": 3,
+            "status": 0,
+            "results_requested": result_count,
+            "index": {},
+            "search_depth": "128",
+            "minimum_similarity": 51.22,
+            "query_image_display": "/userdata/xxxx.jpg.png",
+            "query_image": "xxxx.jpg",
+            "results_returned": result_count,
+        },
+        "results": list(itertools.islice(itertools.cycle(RESULTS), result_count)),
+    }
+
+
+class FakeSauceNao:
+    """
+    Serves `search.php` through an httpx mock transport. It keeps the 30 second and daily
+    limits of every API key and answers with the same errors as SauceNao does.
+
+    Pass it to a client with `SauceNao(api_key, transport=fake.transport())` or
+    `AsyncSauceNao(api_key, transport=fake.async_transport())`.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        result_count: int = 8,
+        short_limit: int = 4,
+        long_limit: int = 100,
+        short_period: float = 30.0,
+        api_keys: Optional[Iterable[str]] = None,
+    ) -> None:
+        """
+        :param latency: Seconds to wait before every response
+        :param result_count: Number of results if the search doesn't set its own limit
+        :param short_limit: Searches per key allowed in `short_period`
+        :param long_limit: Searches per key allowed in total, like the daily limit
+        :param short_period: Length of the short limit window in seconds
+        :param api_keys: Accepted API keys, any key is accepted if None
+        """
+        self.latency = latency
+        self.result_count = result_count
+        self.short_limit = short_limit
+        self.long_limit = long_limit
+        self.short_period = short_period
+        self.api_keys = None if api_keys is None else set(api_keys)
+        self.request_count = 0  # Search requests that reached the fake, answered or not
+        self._sent: Dict[str, Deque[float]] = {}
+        self._long_used: Dict[str, int] = {}
+        self._encoded_results: Dict[int, bytes] = {}
+        self._lock = threading.Lock()
+
+    def transport(self) -> httpx.MockTransport:
+        """Make a transport for the sync client."""
+        return httpx.MockTransport(self.handle)
+
+    def async_transport(self) -> httpx.AsyncBaseTransport:
+        """
+        Make a transport for the async client. Its latency doesn't block the event loop,
+        and the uploads are read chunk by chunk, like a socket would send them.
+        """
+        return _AsyncFakeTransport(self)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self._count_request(request)
+        if self.latency:
+            time.sleep(self.latency)
+        return self.respond(request)
+
+    async def async_handle(
+        self, request: httpx.Request, body: Optional[bytes] = None
+    ) -> httpx.Response:
+        self._count_request(request)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.respond(request, body)
+
+    def respond(self, request: httpx.Request, body: Optional[bytes] = None) -> httpx.Response:
+        """
+        Make the SauceNao response to the request.
+
+        :param request: Request to the API
+        :param body: Start of the request body, it's taken from the request if None
+        """
+        if request.url.path != "/search.php":
+            return httpx.Response(200)  # Like the main page requested by warm_up()
+
+        api_key = request.url.params.get("api_key", "")
+        if self.api_keys is not None and api_key not in self.api_keys:
+            return httpx.Response(403, text="Invalid API key.")
+
+        with self._lock:
+            now = time.monotonic()
+            sent = self._sent.setdefault(api_key, deque())
+            while sent and sent[0] <= now - self.short_period:
+                sent.popleft()
+            long_remaining = self.long_limit - self._long_used.get(api_key, 0)
+            if long_remaining <= 0:
+                return self._limit_response("Daily Search Limit Exceeded.", len(sent), 0)
+            if len(sent) >= self.short_limit:
+                return self._limit_response("Search Rate Too High.", len(sent), long_remaining)
+
+            sent.append(now)
+            self._long_used[api_key] = self._long_used.get(api_key, 0) + 1
+            short_remaining = self.short_limit - len(sent)
+            long_remaining -= 1
+
+        result_count = self._get_result_count(request, body)
+        header = make_payload(0)["header"]
+        header.update(
+            short_limit=str(self.short_limit),
+            long_limit=str(self.long_limit),
+            short_remaining=short_remaining,
+            long_remaining=long_remaining,
+            results_requested=result_count,
+            results_returned=result_count,
+        )
+        # Only the small header is encoded per request, so the benchmarks measure the client
+        content = b'{"header": %s, "results": %s}' % (
+            json.dumps(header).encode(),
+            self._get_encoded_results(result_count),
+        )
+        return httpx.Response(200, content=content, headers={"Content-Type": "application/json"})
+
+    def _count_request(self, request: httpx.Request) -> None:
+        # Counted before respond(), so the responses of subclasses are counted too
+        if request.url.path == "/search.php":
+            with self._lock:
+                self.request_count += 1
+
+    def _get_encoded_results(self, result_count: int) -> bytes:
+        encoded = self._encoded_results.get(result_count)
+        if encoded is None:
+            encoded = json.dumps(make_payload(result_count)["results"]).encode()
+            self._encoded_results[result_count] = encoded
+        return encoded
+
+    def _get_result_count(self, request: httpx.Request, body: Optional[bytes]) -> int:
+        if "numres" in request.url.params:
+            return int(request.url.params["numres"])
+        # Uploads send the params as multipart form fields, which come before the file
+        if body is None:
+            body = request.content[:_BODY_HEAD_SIZE]
+        match = re.search(rb'name="numres"\r\n\r\n(\d+)', body)
+        return int(match.group(1)) if match else self.result_count
+
+    def _limit_response(
+        self, message: str, short_used: int, long_remaining: int
+    ) -> httpx.Response:
+        header = {
+            "status": -1,
+            "message": message,
+            "short_limit": str(self.short_limit),
+            "long_limit": str(self.long_limit),
+            "short_remaining": max(self.short_limit - short_used, 0),
+            "long_remaining": long_remaining,
+        }
+        return httpx.Response(429, json={"header": header})
+
+
+class _AsyncFakeTransport(httpx.AsyncBaseTransport):
+    def __init__(self, fake: FakeSauceNao) -> None:
+        self._fake = fake
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        # Unlike httpx.MockTransport, the body isn't joined in memory, only its start is kept
+        body = b""
+        async for chunk in request.stream:
+            if len(body) < _BODY_HEAD_SIZE:
+                body += chunk[: _BODY_HEAD_SIZE - len(body)]
+            await asyncio.sleep(0)
+        return await self._fake.async_handle(request, body)
@@ -1,10 +1,10 @@
-from typing import Iterable, List, Type, Union
+from typing import Any, Dict, Iterable, List, Optional, Type, Union
 
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, PrivateAttr, validator
 
 from ..helper import SauceIndex
 from .account import AccountInfo
-from .result import GenericSauce, SauceResult
+from .result import GenericSauce, LazyResultList, SauceResult
 
 _IndexType = Union[SauceIndex, int]
 
@@ -27,11 +27,37 @@ class SauceResponse(BaseModel):
     header: Header
     account_info: AccountInfo
     results: List[SauceResult]
+    _from_cache: bool = PrivateAttr(default=False)
+    _partial: bool = PrivateAttr(default=False)
+
+    @property
+    def from_cache(self) -> bool:
+        """True if the response was reused from the cache or the perceptual index."""
+        return self._from_cache
+
+    @property
+    def partial(self) -> bool:
+        """True if some indexes failed, only possible with `allow_partial_success`."""
+        return self._partial
 
     @validator("results")
     def _sort_results(cls, v: List[SauceResult]) -> List[SauceResult]:
         return sorted(v, key=lambda r: r.similarity, reverse=True)
 
+    def materialize(self) -> "SauceResponse":
+        """Build all the lazy results and keep them as a regular list."""
+        if isinstance(self.results, LazyResultList):
+            self.results = list(self.results)
+        return self
+
+    def dict(self, **kwargs) -> Dict[str, Any]:
+        self.materialize()  # Serializing needs every result anyway
+        return super().dict(**kwargs)
+
+    def json(self, **kwargs) -> str:
+        self.materialize()
+        return super().json(**kwargs)
+
     def get_likely_results(self, must_have_url: bool = False) -> List[SauceResult]:
         """
         Returns all the results that are above
@@ -39,6 +65,12 @@ class SauceResponse(BaseModel):
 
         :param must_have_url: Only return results that have at least one URL
         """
+        if isinstance(self.results, LazyResultList):
+            results = self.results.filter(min_similarity=self.header.min_similarity)
+            if must_have_url:
+                return [result for result in results if result.data.first_url]
+            return results
+
         if must_have_url:
             return [
                 result
@@ -57,6 +89,12 @@ class SauceResponse(BaseModel):
         :param above_min_similarity: Only include URLs of results that are above the min similarity
         """
         urls = []
+        if isinstance(self.results, LazyResultList):
+            min_similarity = self.header.min_similarity if above_min_similarity else None
+            for result in self.results.filter(min_similarity=min_similarity):
+                urls += result.data.urls
+            return urls
+
         for result in self.results:
             if above_min_similarity and result.similarity < self.header.min_similarity:
                 continue
@@ -74,6 +112,16 @@ class SauceResponse(BaseModel):
         :param above_min_similarity: Only include results that are above the min similarity
         :return:
         """
+        if isinstance(self.results, LazyResultList):
+            return self.results.filter(
+                min_similarity=self.header.min_similarity if above_min_similarity else None,
+                indexes={
+                    index_id
+                    for index_id in set(self.results.index_ids)
+                    if issubclass(SauceIndex.get_sauce_type(index_id), result_type)
+                },
+            )
+
         required_results: List[SauceResult[result_type]] = []
         for result in self.results:
             if isinstance(result.data, result_type):
@@ -97,6 +145,11 @@ class SauceResponse(BaseModel):
         """
         if isinstance(index, int):
             index = (index,)
+        if isinstance(self.results, LazyResultList):
+            return self.results.filter(
+                min_similarity=self.header.min_similarity if above_min_similarity else None,
+                indexes=set(index),
+            )
 
         required_results: List[SauceResult] = []
         for result in self.results:
@@ -106,3 +159,13 @@ class SauceResponse(BaseModel):
                 required_results.append(result)
 
         return required_results
+
+
+class CascadeResponse(SauceResponse):
+    """
+    Merged response of a cascading search, the results of every searched stage are combined.
+    Look at :class:`saucenaopie.strategy.CascadeStrategy`.
+    """
+
+    answered_stage: Optional[int]  # None if no stage had a result above the min similarity
+    searched_stages: int
@@ -1,10 +1,24 @@
-from typing import Generic, TypeVar
+import logging
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+)
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 from pydantic.generics import GenericModel
 
 from .sauce import ArtSauce, BaseSauce, BooruSauce, MangaSauce, TwitterSauce, VideoSauce
 
+log = logging.getLogger(__name__)
+
 GenericSauce = TypeVar(
     "GenericSauce", BaseSauce, ArtSauce, VideoSauce, BooruSauce, MangaSauce, TwitterSauce
 )
@@ -30,3 +44,120 @@ class SauceResult(GenericModel, Generic[GenericSauce]):  # TODO: Add some data m
     similarity: float
     thumbnail: str
     index: ResultIndex
+
+
+_NOT_BUILT = object()
+
+
+class LazyResultList(Sequence[SauceResult]):
+    """
+    Results that keep the raw SauceNao data and only build SauceResult objects
+    when they are accessed. The raw results are sorted by similarity right away,
+    so reading the first results or filtering them doesn't build the rest.
+
+    Results that fail to parse are skipped, just like in regular responses. They are only
+    known once they are built, so `len()` builds all the results to stay the same
+    afterwards, while iterating, indexing and slicing build only as many as they need.
+    """
+
+    def __init__(self, raw_results: List[Dict[str, Any]], builder: Callable[[dict], SauceResult]):
+        """
+        :param raw_results: Results from the SauceNao response
+        :param builder: Function that turns a raw result into SauceResult
+        """
+        keyed = sorted(
+            (
+                (float(result["header"]["similarity"]), int(result["header"]["index_id"]), result)
+                for result in raw_results
+            ),
+            key=lambda item: item[0],
+            reverse=True,
+        )
+        self._similarities = [item[0] for item in keyed]
+        self._index_ids = [item[1] for item in keyed]
+        self._raw_results = [item[2] for item in keyed]
+        self._built: List[Any] = [_NOT_BUILT] * len(keyed)
+        self._parsed: List[SauceResult] = []  # Results that didn't fail, in order
+        self._scanned = 0  # Raw results checked for _parsed
+        self._builder = builder
+
+    @property
+    def raw_results(self) -> List[Dict[str, Any]]:
+        """Raw SauceNao results, sorted by similarity."""
+        return self._raw_results
+
+    @property
+    def index_ids(self) -> List[int]:
+        """Index IDs of the raw results, sorted by similarity."""
+        return self._index_ids
+
+    def filter(
+        self, min_similarity: Optional[float] = None, indexes: Optional[Collection[int]] = None
+    ) -> List[SauceResult]:
+        """
+        Build only the results that match the filters.
+
+        :param min_similarity: Minimum result similarity
+        :param indexes: Indexes the results must belong to
+        """
+        results = []
+        for position, similarity in enumerate(self._similarities):
+            if min_similarity is not None and similarity < min_similarity:
+                break  # The rest are even less similar
+            if indexes is not None and self._index_ids[position] not in indexes:
+                continue
+            if (result := self._build(position)) is not None:
+                results.append(result)
+
+        return results
+
+    def _build(self, position: int) -> Optional[SauceResult]:
+        result = self._built[position]
+        if result is _NOT_BUILT:
+            try:
+                result = self._builder(self._raw_results[position])
+            except (ValidationError, KeyError, TypeError, ValueError):
+                log.exception("Failed to parse result")
+                result = None
+            self._built[position] = result
+
+        return result
+
+    def _parse(self, count: Optional[int] = None) -> None:
+        """Build the results in order until `count` of them are parsed, all of them if None."""
+        while self._scanned < len(self._raw_results) and (
+            count is None or len(self._parsed) < count
+        ):
+            if (result := self._build(self._scanned)) is not None:
+                self._parsed.append(result)
+            self._scanned += 1
+
+    def __iter__(self) -> Iterator[SauceResult]:
+        number = 0
+        while True:
+            self._parse(number + 1)
+            if number >= len(self._parsed):
+                return
+            yield self._parsed[number]
+            number += 1
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            stop = item.stop
+            if stop is None or stop < 0 or (item.start or 0) < 0 or (item.step or 1) < 0:
+                stop = None  # Counted from the end, so every result is needed
+            self._parse(stop)
+        else:
+            self._parse(item + 1 if item >= 0 else None)
+        return self._parsed[item]
+
+    def __len__(self) -> int:
+        self._parse()
+        return len(self._parsed)
+
+    def __bool__(self) -> bool:
+        self._parse(1)
+        return bool(self._parsed)
+
+    def __repr__(self) -> str:
+        return f"LazyResultList({len(self._raw_results)} raw results)"
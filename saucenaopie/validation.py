@@ -0,0 +1,141 @@
+import os
+import struct
+from pathlib import Path
+from typing import BinaryIO, Collection, NamedTuple, Optional, Tuple, Union
+
+from .exceptions import FileIsTooLarge, ImageInvalid
+
+HEAD_SIZE = 256 * 1024  # Enough to get past the EXIF and ICC data of most JPEG files
+
+
+class ImageInfo(NamedTuple):
+    """Image format and dimensions read from the file header."""
+
+    format: str
+    width: Optional[int]  # None if they aren't in the header part that was read
+    height: Optional[int]
+
+
+def sniff_image(head: bytes) -> Optional[ImageInfo]:
+    """
+    Detect the image format by its magic bytes and read the dimensions from the header,
+    without decoding the image.
+
+    :param head: First bytes of the file
+    :return: None if the format is not known
+    """
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        if len(head) >= 24 and head[12:16] != b"IHDR":
+            return ImageInfo("PNG", 0, 0)  # The header chunk must be the first one
+        return ImageInfo("PNG", *_unpack(">II", head, 16))
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return ImageInfo("GIF", *_unpack("<HH", head, 6))
+    if head.startswith(b"\xff\xd8\xff"):
+        return ImageInfo("JPEG", *_get_jpeg_size(head))
+    if head.startswith(b"RIFF") and head[8:12] == b"WEBP":
+        return ImageInfo("WEBP", *_get_webp_size(head))
+    if head.startswith(b"BM"):
+        width, height = _unpack("<ii", head, 18)
+        return ImageInfo("BMP", width, None if height is None else abs(height))
+    return None
+
+
+def _unpack(fmt: str, head: bytes, offset: int) -> Tuple[Optional[int], ...]:
+    size = struct.calcsize(fmt)
+    if len(head) < offset + size:
+        return (None,) * len(fmt[1:])
+    return struct.unpack_from(fmt, head, offset)
+
+
+def _get_jpeg_size(head: bytes) -> Tuple[Optional[int], Optional[int]]:
+    position = 2
+    while position + 9 <= len(head):
+        if head[position] != 0xFF:
+            return 0, 0  # Broken marker
+        marker = head[position + 1]
+        if marker == 0xFF:  # Fill byte
+            position += 1
+            continue
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):  # Start of frame
+            height, width = struct.unpack_from(">HH", head, position + 5)
+            return width, height
+        if marker == 0xD9:  # End of image before any frame
+            return 0, 0
+        position += 2 + struct.unpack_from(">H", head, position + 2)[0]
+    return None, None
+
+
+def _get_webp_size(head: bytes) -> Tuple[Optional[int], Optional[int]]:
+    chunk = head[12:16]
+    if chunk == b"VP8 " and len(head) >= 30:
+        width, height = struct.unpack_from("<HH", head, 26)
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L" and len(head) >= 25:
+        bits = int.from_bytes(head[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X" and len(head) >= 30:
+        return int.from_bytes(head[24:27], "little") + 1, int.from_bytes(head[27:30], "little") + 1
+    return None, None
+
+
+class UploadValidator:
+    """
+    Checks the files before they are uploaded, so the files SauceNao would reject
+    don't cost an upload and don't count as failed requests.
+    Only the file header is read, the image is not decoded.
+    """
+
+    def __init__(
+        self,
+        max_bytes: Optional[int] = 15 * 1024 * 1024,
+        formats: Collection[str] = ("JPEG", "PNG", "GIF", "WEBP", "BMP"),
+        max_pixels: Optional[int] = None,
+    ) -> None:
+        """
+        :param max_bytes: Maximum file size, SauceNao takes files up to 15 MiB. None for no limit
+        :param formats: Image formats that may be uploaded
+        :param max_pixels: Maximum width multiplied by height, None for no limit
+        """
+        self.max_bytes = max_bytes
+        self.formats = {image_format.upper() for image_format in formats}
+        self.max_pixels = max_pixels
+
+    def validate(self, head: bytes, size: int) -> ImageInfo:
+        """
+        Check the file by its first bytes and size.
+
+        :param head: First bytes of the file, up to `HEAD_SIZE`
+        :param size: File size in bytes
+        :raises FileIsTooLarge: If the file is too large
+        :raises ImageInvalid: If the file is not an image of the allowed formats or is broken
+        """
+        if self.max_bytes is not None and size > self.max_bytes:
+            raise FileIsTooLarge("The file is too large.")
+
+        info = sniff_image(head)
+        if info is None or info.format not in self.formats:
+            raise ImageInvalid("The file is not a supported image.")
+        if info.width == 0 or info.height == 0:
+            raise ImageInvalid("The image header is broken.")
+        if (
+            self.max_pixels is not None
+            and info.width is not None
+            and info.height is not None
+            and info.width * info.height > self.max_pixels
+        ):
+            raise ImageInvalid("The image dimensions are too large.")
+        return info
+
+    def validate_file(self, file: Union[str, Path, BinaryIO]) -> ImageInfo:
+        """Check the file by path or seekable stream, the stream position is kept."""
+        if isinstance(file, (str, Path)):
+            with open(file, "rb") as f:
+                return self.validate(f.read(HEAD_SIZE), os.fstat(f.fileno()).st_size)
+
+        position = file.tell()
+        try:
+            head = file.read(HEAD_SIZE)
+            size = file.seek(0, os.SEEK_END) - position
+        finally:
+            file.seek(position)
+        return self.validate(head, size)
@@ -0,0 +1,127 @@
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from saucenaopie import AsyncSauceNao, SauceNao
+from saucenaopie.breaker import CircuitBreaker, CircuitState
+from saucenaopie.exceptions import CircuitOpen, UnknownServerError
+from saucenaopie.testing import FakeSauceNao
+
+URL = "https://example.com/image.png"
+
+
+class FlakySauceNao(FakeSauceNao):
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.down = True
+
+    def respond(self, request: httpx.Request, body=None) -> httpx.Response:
+        if self.down:
+            return httpx.Response(503)
+        return super().respond(request, body)
+
+
+def test_opens_and_recovers():
+    fake = FlakySauceNao()
+    transitions = []
+    breaker = CircuitBreaker(
+        failure_threshold=3,
+        recovery_timeout=0.1,
+        on_state_change=lambda old, new: transitions.append((old, new)),
+    )
+    client = SauceNao("api_key", transport=fake.transport(), circuit_breaker=breaker)
+    for _ in range(3):
+        with pytest.raises(UnknownServerError):
+            client.search(URL, from_url=True)
+    with pytest.raises(CircuitOpen):
+        client.search(URL, from_url=True)
+    assert fake.request_count == 3 and breaker.state == CircuitState.OPEN
+
+    fake.down = False
+    threading.Event().wait(0.15)
+    client.search(URL, from_url=True)
+    assert breaker.state == CircuitState.CLOSED
+    assert transitions == [
+        (CircuitState.CLOSED, CircuitState.OPEN),
+        (CircuitState.OPEN, CircuitState.HALF_OPEN),
+        (CircuitState.HALF_OPEN, CircuitState.CLOSED),
+    ]
+
+
+def test_half_open_sends_a_single_probe():
+    async def main():
+        fake = FlakySauceNao(latency=0.05)
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+        client = AsyncSauceNao(
+            "api_key", transport=fake.async_transport(), circuit_breaker=breaker
+        )
+        with pytest.raises(UnknownServerError):
+            await client.search(URL, from_url=True)
+        fake.down = False
+        await asyncio.sleep(0.06)
+        results = await asyncio.gather(
+            *(client.search(f"{URL}?{number}", from_url=True) for number in range(5)),
+            return_exceptions=True,
+        )
+        await client.close()
+        return results, fake.request_count
+
+    results, request_count = asyncio.run(main())
+    assert request_count == 2  # The failure and the probe
+    assert sum(isinstance(result, CircuitOpen) for result in results) == 4
+
+
+def test_only_the_probe_drives_half_open():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+    stale = breaker.before_request()  # Sent while the circuit was closed
+    breaker.record(UnknownServerError("Down."), breaker.before_request())
+    assert breaker.state == CircuitState.OPEN
+
+    probe = breaker.before_request()
+    assert probe and breaker.state == CircuitState.HALF_OPEN
+    breaker.record(probe=stale)  # A late success must not close the circuit
+    assert breaker.state == CircuitState.HALF_OPEN
+    with pytest.raises(CircuitOpen):
+        breaker.before_request()  # The probe is still in flight
+
+    breaker.record(probe=probe)
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_callback_may_use_the_breaker():
+    states = []
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+    breaker.on_state_change = lambda old, new: states.append(
+        (breaker.state, breaker.failure_count)
+    )
+    thread = threading.Thread(
+        target=lambda: breaker.record(UnknownServerError("Down."), breaker.before_request())
+    )
+    thread.start()
+    thread.join(1)
+    assert not thread.is_alive()
+    assert states == [(CircuitState.OPEN, 1)]
+
+
+def test_outage_drains_concurrent_searches():
+    async def main():
+        fake = FlakySauceNao(latency=0.05)
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+        client = AsyncSauceNao(
+            "api_key", transport=fake.async_transport(), circuit_breaker=breaker
+        )
+        await asyncio.gather(
+            *(client.search(URL, from_url=True) for _ in range(2)), return_exceptions=True
+        )
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                *(client.search(URL, from_url=True) for _ in range(50)), return_exceptions=True
+            ),
+            0.04,  # Less than a single request takes
+        )
+        await client.close()
+        return results
+
+    assert all(isinstance(result, CircuitOpen) for result in asyncio.run(main()))
@@ -0,0 +1,96 @@
+import asyncio
+import io
+import time
+
+import pytest
+
+from saucenaopie import AsyncSauceNao, SauceNao
+from saucenaopie.cache import MemoryCache, SQLiteCache, make_cache_key
+from saucenaopie.testing import FakeSauceNao
+
+URL = "https://example.com/image.png"
+IMAGE = b"image bytes " * 64
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_cache(request, tmp_path):
+    caches = []
+
+    def make(**kwargs):
+        if request.param == "memory":
+            cache = MemoryCache(**kwargs)
+        else:
+            cache = SQLiteCache(tmp_path / "cache.sqlite3", **kwargs)
+        caches.append(cache)
+        return cache
+
+    yield make
+    for cache in caches:
+        cache.close()
+
+
+def test_least_recently_used_is_evicted(make_cache):
+    cache = make_cache(maxsize=2, ttl=None)
+    cache.set("a", {"value": 1})
+    time.sleep(0.01)
+    cache.set("b", {"value": 2})
+    time.sleep(0.01)
+    assert cache.get("a") == {"value": 1}  # "b" is the least recently used now
+    time.sleep(0.01)
+    cache.set("c", {"value": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"value": 1} and cache.get("c") == {"value": 3}
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.evictions) == (3, 1, 1)
+
+
+def test_expired_responses_are_evicted(make_cache):
+    cache = make_cache(ttl=0.05)
+    cache.set("a", {"value": 1})
+    assert cache.get("a") == {"value": 1}
+    time.sleep(0.1)
+    assert cache.get("a") is None
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.evictions) == (1, 1, 1)
+
+
+def test_sqlite_cache_survives_restarts(tmp_path):
+    cache = SQLiteCache(tmp_path / "cache.sqlite3")
+    cache.set("a", {"value": 1})
+    cache.close()
+    cache = SQLiteCache(tmp_path / "cache.sqlite3")
+    assert cache.get("a") == {"value": 1}
+    cache.close()
+
+
+def test_cache_keys():
+    params = {"db": 999, "numres": 8}
+    assert make_cache_key("HTTPS://Example.com/image.png#top", params) == make_cache_key(
+        URL, params
+    )
+    assert make_cache_key(URL, params) != make_cache_key(URL, {"db": 5, "numres": 8})
+    assert make_cache_key(URL, params) != make_cache_key(URL.encode(), params)
+
+
+def test_repeated_searches_are_answered_from_the_cache(make_cache):
+    fake = FakeSauceNao()
+    cache = make_cache()
+    client = SauceNao("api_key", transport=fake.transport(), cache=cache)
+    first = client.search(io.BytesIO(IMAGE))
+    second = client.search(io.BytesIO(IMAGE))
+    assert not first.from_cache and second.from_cache
+    assert second.results == first.results
+    client.search(io.BytesIO(IMAGE), index=5)  # Different params aren't reused
+    assert fake.request_count == 2
+    assert (cache.stats.hits, cache.stats.misses) == (1, 2)
+
+
+def test_async_client_uses_the_cache(make_cache):
+    async def main():
+        fake = FakeSauceNao()
+        client = AsyncSauceNao("api_key", transport=fake.async_transport(), cache=make_cache())
+        for _ in range(3):
+            await client.search(URL, from_url=True)
+        await client.close()
+        return fake.request_count
+
+    assert asyncio.run(main()) == 1
@@ -0,0 +1,83 @@
+import asyncio
+import io
+
+import httpx
+import pytest
+
+from saucenaopie import AsyncSauceNao, SauceNao
+from saucenaopie.helper import SauceIndex
+from saucenaopie.strategy import CascadeStrategy
+from saucenaopie.testing import FakeSauceNao
+
+IMAGE = b"image bytes " * 64
+STAGES = [SauceIndex.PIXIV, (SauceIndex.DANBOORU, SauceIndex.TWITTER), SauceIndex.ALL]
+
+
+class TargetedSauceNao(FakeSauceNao):
+    """Finds nothing outside of the ALL index, so the targeted stages miss."""
+
+    def __init__(self) -> None:
+        super().__init__(short_limit=100)
+        self.uploads = []
+
+    def respond(self, request: httpx.Request, body=None) -> httpx.Response:
+        body = request.content if body is None else body
+        self.uploads.append(body)
+        response = super().respond(request, body)
+        if b'name="db"\r\n\r\n999' in body:
+            return response
+
+        data = response.json()
+        data["results"] = []
+        data["header"]["results_returned"] = 0
+        return httpx.Response(200, json=data)
+
+
+class Unseekable(io.RawIOBase):
+    def __init__(self, content: bytes) -> None:
+        self._stream = io.BytesIO(content)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        return self._stream.readinto(buffer)
+
+
+@pytest.mark.parametrize("make_file", [io.BytesIO, Unseekable], ids=["seekable", "unseekable"])
+def test_falls_back_until_a_stage_answers(make_file):
+    fake = TargetedSauceNao()
+    client = SauceNao("api_key", transport=fake.transport())
+    strategy = CascadeStrategy(stages=STAGES)
+    response = client.search_cascade(make_file(IMAGE), strategy)
+
+    assert response.answered_stage == 2 and response.searched_stages == 3
+    assert len(response.results) == 8
+    assert strategy.answered_counts == [0, 0, 1]
+    # The stream is rewound, so every stage uploads the whole image
+    assert len(fake.uploads) == 3
+    assert all(IMAGE in upload for upload in fake.uploads)
+
+
+def test_stops_at_the_answered_stage():
+    async def main():
+        fake = TargetedSauceNao()
+        client = AsyncSauceNao("api_key", transport=fake.async_transport())
+        strategy = CascadeStrategy(stages=[SauceIndex.ALL, SauceIndex.PIXIV])
+        response = await client.search_cascade(io.BytesIO(IMAGE), strategy)
+        await client.close()
+        return response, fake.request_count, strategy
+
+    response, request_count, strategy = asyncio.run(main())
+    assert response.answered_stage == 0 and response.searched_stages == 1
+    assert request_count == 1
+    assert strategy.answered_counts == [1, 0]
+
+
+def test_miss_searches_every_stage():
+    fake = TargetedSauceNao()
+    client = SauceNao("api_key", transport=fake.transport())
+    strategy = CascadeStrategy(stages=STAGES, min_similarity=99)
+    response = client.search_cascade(io.BytesIO(IMAGE), strategy)
+    assert response.answered_stage is None and response.searched_stages == 3
+    assert fake.request_count == 3 and strategy.miss_count == 1
@@ -0,0 +1,89 @@
+import asyncio
+import io
+import time
+
+import httpx
+import pytest
+
+from saucenaopie import AsyncSauceNao, SauceNao
+from saucenaopie.cassette import Cassette, RecordingTransport, ReplayTransport
+from saucenaopie.exceptions import ShortLimitReached
+from saucenaopie.testing import FakeSauceNao
+
+URL = "https://example.com/image.png"
+IMAGE = b"image bytes " * 64
+
+
+def record(fake: FakeSauceNao, path, *searches) -> list:
+    cassette = Cassette()
+    client = SauceNao("api_key", transport=RecordingTransport(cassette, fake.transport()))
+    responses = []
+    for kwargs in searches:
+        file = io.BytesIO(IMAGE) if "from_url" not in kwargs else URL
+        try:
+            responses.append(client.search(file, **kwargs))
+        except ShortLimitReached as error:
+            responses.append(error)
+    cassette.save(path)
+    return responses
+
+
+def test_recorded_searches_are_replayed(tmp_path):
+    fake = FakeSauceNao()
+    path = tmp_path / "searches.jsonl.gz"
+    recorded = record(fake, path, {"from_url": True}, {}, {"result_limit": 3})
+    assert fake.request_count == 3
+
+    cassette = Cassette.load(path)
+    assert len(cassette) == 3
+    # Another key and another multipart boundary still match the recording
+    client = SauceNao("another_key", transport=ReplayTransport(cassette))
+    assert client.search(URL, from_url=True).results == recorded[0].results
+    assert client.search(io.BytesIO(IMAGE)).results == recorded[1].results
+    assert len(client.search(io.BytesIO(IMAGE), result_limit=3).results) == 3
+    assert fake.request_count == 3
+
+
+def test_limit_errors_are_replayed(tmp_path):
+    path = tmp_path / "limits.jsonl.gz"
+    recorded = record(FakeSauceNao(short_limit=1), path, {"from_url": True}, {"from_url": True})
+    assert isinstance(recorded[1], ShortLimitReached)
+
+    # Responses to the same request are served in the recorded order, over and over
+    client = SauceNao("api_key", transport=ReplayTransport(Cassette.load(path)))
+    assert client.search(URL, from_url=True).results
+    with pytest.raises(ShortLimitReached):
+        client.search(URL, from_url=True)
+    assert client.search(URL, from_url=True).results
+
+
+def test_unknown_requests(tmp_path):
+    path = tmp_path / "searches.jsonl.gz"
+    record(FakeSauceNao(), path, {"from_url": True})
+
+    client = SauceNao("api_key", transport=ReplayTransport(Cassette.load(path)))
+    with pytest.raises(httpx.TransportError):
+        client.search(io.BytesIO(IMAGE))
+
+    client = SauceNao("api_key", transport=ReplayTransport(Cassette.load(path), fallback=True))
+    assert client.search(io.BytesIO(IMAGE)).results
+
+
+def test_async_recording_and_latency(tmp_path):
+    async def main():
+        fake = FakeSauceNao(latency=0.1)
+        cassette = Cassette()
+        transport = RecordingTransport(cassette, fake.async_transport())
+        client = AsyncSauceNao("api_key", transport=transport)
+        await client.search(URL, from_url=True)
+        await client.close()
+
+        client = AsyncSauceNao("api_key", transport=ReplayTransport(cassette, replay_latency=True))
+        started = time.monotonic()
+        response = await client.search(URL, from_url=True)
+        await client.close()
+        return response, time.monotonic() - started, fake.request_count
+
+    response, duration, request_count = asyncio.run(main())
+    assert response.results and request_count == 1
+    assert duration >= 0.09
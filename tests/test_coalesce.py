@@ -0,0 +1,93 @@
+import asyncio
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from saucenaopie import AsyncSauceNao, SauceNao
+from saucenaopie.exceptions import UnknownServerError
+from saucenaopie.testing import FakeSauceNao
+
+URL = "https://example.com/image.png"
+IMAGE = b"image bytes " * 64
+
+
+class DownSauceNao(FakeSauceNao):
+    def respond(self, request: httpx.Request, body=None) -> httpx.Response:
+        return httpx.Response(503)
+
+
+def make_client(fake: FakeSauceNao) -> AsyncSauceNao:
+    return AsyncSauceNao("api_key", transport=fake.async_transport(), coalesce=True)
+
+
+def test_identical_searches_share_a_request():
+    async def main():
+        fake = FakeSauceNao(latency=0.1, short_limit=100)
+        client = make_client(fake)
+        responses = await asyncio.gather(
+            *(client.search(URL, from_url=True) for _ in range(4)),
+            *(client.search(io.BytesIO(IMAGE)) for _ in range(3)),
+            client.search(URL, from_url=True, result_limit=4),  # Different params
+        )
+        await client.search(URL, from_url=True)  # Nothing is in flight any more
+        await client.close()
+        return responses, fake.request_count, client.coalesced_count
+
+    responses, request_count, coalesced_count = asyncio.run(main())
+    assert request_count == 4 and coalesced_count == 5
+    assert all(response.results == responses[0].results for response in responses[:7])
+    assert len(responses[-1].results) == 4
+
+
+def test_cancelled_search_does_not_cancel_the_others():
+    async def main():
+        fake = FakeSauceNao(latency=0.1)
+        client = make_client(fake)
+        first = asyncio.ensure_future(client.search(URL, from_url=True))
+        second = asyncio.ensure_future(client.search(URL, from_url=True))
+        await asyncio.sleep(0.02)
+        first.cancel()
+        response = await second
+        await client.close()
+        return first, response, fake.request_count
+
+    first, response, request_count = asyncio.run(main())
+    assert first.cancelled() and response.results
+    assert request_count == 1
+
+
+def test_errors_are_shared():
+    async def main():
+        fake = DownSauceNao(latency=0.05)
+        client = make_client(fake)
+        results = await asyncio.gather(
+            *(client.search(URL, from_url=True) for _ in range(3)), return_exceptions=True
+        )
+        await client.close()
+        return results, fake.request_count
+
+    results, request_count = asyncio.run(main())
+    assert all(isinstance(result, UnknownServerError) for result in results)
+    assert request_count == 1
+
+
+def test_threads_share_a_request():
+    fake = FakeSauceNao(latency=0.2)
+    client = SauceNao("api_key", transport=fake.transport(), coalesce=True)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        responses = list(executor.map(lambda _: client.search(URL, from_url=True), range(4)))
+    assert fake.request_count == 1 and client.coalesced_count == 3
+    assert all(response.results == responses[0].results for response in responses)
+
+
+def test_thread_errors_are_shared():
+    fake = DownSauceNao(latency=0.2)
+    client = SauceNao("api_key", transport=fake.transport(), coalesce=True)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [executor.submit(client.search, URL, from_url=True) for _ in range(3)]
+    for future in futures:
+        with pytest.raises(UnknownServerError):
+            future.result()
+    assert fake.request_count == 1
@@ -0,0 +1,95 @@
+import asyncio
+import importlib.util
+
+import httpx
+import pytest
+
+from saucenaopie import AsyncSauceNao, SauceNao
+from saucenaopie.client.base import BaseSauceClient
+from saucenaopie.testing import FakeSauceNao
+
+URL = "https://example.com/image.png"
+
+
+class WarmUpLog:
+    def __init__(self) -> None:
+        self.fake = FakeSauceNao()
+        self.opened = 0
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "HEAD":
+            self.opened += 1
+        return self.fake.handle(request)
+
+    async def async_handle(self, request: httpx.Request) -> httpx.Response:
+        return self.handle(request)
+
+
+@pytest.fixture
+def client_options(monkeypatch):
+    options = []
+    client_class = httpx.Client
+
+    def make_client(**kwargs):
+        options.append(kwargs)
+        return client_class(**{key: kwargs[key] for key in kwargs if key != "http2"})
+
+    monkeypatch.setattr(httpx, "Client", make_client)
+    return options
+
+
+def test_pool_options_reach_httpx(client_options):
+    limits = httpx.Limits(max_connections=3)
+    SauceNao("api_key", limits=limits, http2=True)
+    assert client_options[0]["limits"] is limits and client_options[0]["http2"] is True
+
+
+def test_transport_replaces_the_pool_options(client_options):
+    transport = FakeSauceNao().transport()
+    SauceNao("api_key", limits=httpx.Limits(max_connections=3), http2=True, transport=transport)
+    assert client_options[0]["transport"] is transport
+    assert "limits" not in client_options[0] and "http2" not in client_options[0]
+
+
+@pytest.mark.skipif(importlib.util.find_spec("h2") is not None, reason="h2 is installed")
+def test_http2_is_ignored_with_a_transport():
+    with pytest.raises(ImportError):
+        SauceNao("api_key", http2=True)
+
+    fake = FakeSauceNao()
+    client = SauceNao("api_key", http2=True, transport=fake.transport())
+    assert client.search(URL, from_url=True).results
+
+
+@pytest.mark.parametrize("connections", [1, 3])
+def test_warm_up(connections):
+    log = WarmUpLog()
+    client = SauceNao("api_key", transport=httpx.MockTransport(log.handle))
+    client.warm_up(connections)
+    assert log.opened == connections
+    assert log.fake.request_count == 0  # The quota isn't spent
+
+
+def test_async_warm_up():
+    async def main():
+        log = WarmUpLog()
+        client = AsyncSauceNao("api_key", transport=httpx.MockTransport(log.async_handle))
+        await client.warm_up(3)
+        with pytest.raises(ValueError):
+            await client.warm_up(0)
+        await client.close()
+        return log
+
+    log = asyncio.run(main())
+    assert log.opened == 3 and log.fake.request_count == 0
+
+
+def test_subclasses_do_not_need_warm_up():
+    class Client(BaseSauceClient):
+        def close(self):
+            pass
+
+        def search(self, file, **kwargs):
+            pass
+
+    assert Client("api_key").warm_up() is None
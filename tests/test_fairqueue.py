@@ -0,0 +1,153 @@
+import asyncio
+
+import pytest
+
+from saucenaopie import AsyncSauceNao
+from saucenaopie.exceptions import QueueFull
+from saucenaopie.fairqueue import FairQueue
+from saucenaopie.testing import FakeSauceNao
+
+URL = "https://example.com/image.png"
+
+
+def make_queue(latency: float = 0.01, **kwargs) -> FairQueue:
+    fake = FakeSauceNao(latency=latency, short_limit=100)
+    return FairQueue(AsyncSauceNao("api_key", transport=fake.async_transport()), **kwargs)
+
+
+async def search_logged(queue: FairQueue, tenant: str, number: int, served: list) -> None:
+    await queue.search(tenant, f"{URL}?{tenant}{number}", from_url=True)
+    served.append(tenant)
+
+
+async def wait_queued(queue: FairQueue, depth: int) -> None:
+    while queue.queue_depth < depth:
+        await asyncio.sleep(0)
+
+
+def test_weighted_order():
+    async def main():
+        queue = make_queue(max_queued_per_tenant=10, weights={"a": 2})
+        served = []
+        blocker = asyncio.ensure_future(search_logged(queue, "blocker", 0, served))
+        tasks = [
+            asyncio.ensure_future(search_logged(queue, tenant, number, served))
+            for tenant in ("a", "b")
+            for number in range(4)
+        ]
+        await asyncio.gather(blocker, *tasks)
+        await queue.client.close()
+        return "".join(served[1:])
+
+    # Tenant "a" has weight 2, so it's served twice as often while both are queued
+    assert asyncio.run(main()) == "aabaabbb"
+
+
+def test_tenant_limit():
+    async def main():
+        queue = make_queue(latency=0.05, max_queued_per_tenant=2)
+        tasks = [
+            asyncio.ensure_future(queue.search("a", f"{URL}?{number}", from_url=True))
+            for number in range(4)
+        ]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        await queue.client.close()
+        return results, queue.shed_count
+
+    results, shed_count = asyncio.run(main())
+    # The first search runs right away, two wait and the last one is rejected
+    assert [isinstance(result, QueueFull) for result in results] == [False, False, False, True]
+    assert shed_count == 1
+
+
+def test_zero_tenant_limit():
+    async def main():
+        queue = make_queue(latency=0.05, max_queued_per_tenant=0)
+        first = asyncio.ensure_future(queue.search("a", URL, from_url=True))
+        await asyncio.sleep(0)
+        with pytest.raises(QueueFull):
+            await queue.search("b", f"{URL}?b", from_url=True)
+        await first
+        await queue.client.close()
+
+    asyncio.run(main())
+
+
+def test_full_queue_sheds_the_longest_tenant():
+    async def main():
+        queue = make_queue(latency=0.05, max_queued=3)
+        blocker = asyncio.ensure_future(queue.search("blocker", URL, from_url=True))
+        a_tasks = [
+            asyncio.ensure_future(queue.search("a", f"{URL}?a{number}", from_url=True))
+            for number in range(3)
+        ]
+        await wait_queued(queue, 3)
+        b_task = asyncio.ensure_future(queue.search("b", f"{URL}?b", from_url=True))
+        results = await asyncio.gather(*a_tasks, b_task, return_exceptions=True)
+        await blocker
+        await queue.client.close()
+        return results
+
+    results = asyncio.run(main())
+    # The newest search of "a" made room for "b"
+    assert [isinstance(result, QueueFull) for result in results] == [False, False, True, False]
+
+
+def test_full_queue_rejects_when_nothing_can_be_shed():
+    async def main():
+        queue = make_queue(latency=0.05, max_queued=0)
+        first = await queue.search("a", URL, from_url=True)  # A free slot is never refused
+        blocker = asyncio.ensure_future(queue.search("a", f"{URL}?1", from_url=True))
+        await asyncio.sleep(0)
+        with pytest.raises(QueueFull):
+            await queue.search("b", f"{URL}?2", from_url=True)
+        await blocker
+        await queue.client.close()
+        return first
+
+    assert asyncio.run(main()).results
+
+
+def test_negative_limits_are_rejected():
+    with pytest.raises(ValueError):
+        make_queue(max_queued=-1)
+
+
+def test_max_wait():
+    async def main():
+        queue = make_queue(latency=0.2, max_wait=0.05)
+        blocker = asyncio.ensure_future(queue.search("a", URL, from_url=True))
+        await asyncio.sleep(0)
+        with pytest.raises(QueueFull):
+            await queue.search("b", f"{URL}?b", from_url=True)
+        await blocker
+        await queue.client.close()
+        return queue
+
+    queue = asyncio.run(main())
+    assert queue.shed_count == 1 and queue.queue_depth == 0
+
+
+def test_cancelled_searches_free_their_slots():
+    async def main():
+        queue = make_queue(latency=0.05)
+        running = asyncio.ensure_future(queue.search("a", URL, from_url=True))
+        queued = asyncio.ensure_future(queue.search("b", f"{URL}?b", from_url=True))
+        await wait_queued(queue, 1)
+        queued.cancel()
+        await asyncio.sleep(0)
+        assert queue.queue_depth == 0
+        running.cancel()
+        await asyncio.gather(running, queued, return_exceptions=True)
+
+        # Neither of the cancelled searches holds a slot, so the next ones run at once
+        await asyncio.wait_for(
+            asyncio.gather(
+                queue.search("c", f"{URL}?c", from_url=True),
+                queue.search("d", f"{URL}?d", from_url=True),
+            ),
+            0.5,
+        )
+        await queue.client.close()
+
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+import asyncio
+
+import httpx
+import pytest
+
+from saucenaopie import AsyncSauceNao, SauceNao
+from saucenaopie.exceptions import BadAPIKey
+from saucenaopie.keys import KeyPool
+from saucenaopie.testing import FakeSauceNao
+from saucenaopie.types.account import AccountInfo, AccountType
+
+URL = "https://example.com/image.png"
+
+
+def is_released(pool: KeyPool, api_key: str) -> bool:
+    """
+    Whether the key has no searches reserved. The key is left with a single search
+    in its window but the most daily quota, so it's only picked if nothing holds that search.
+    """
+    for key in pool.api_keys:
+        pool.report_success(
+            key,
+            AccountInfo(
+                user_id=1,
+                account_type=AccountType.FREE,
+                short_limit=1000,
+                short_remaining=1 if key == api_key else 1000,
+                long_limit=1000,
+                long_remaining=1000 if key == api_key else 10,
+            ),
+        )
+    key = pool.select()
+    pool.release(key)
+    return key == api_key
+
+
+def is_all_released(pool: KeyPool) -> bool:
+    return all(is_released(pool, key) for key in pool.api_keys)
+
+
+def test_cancelled_searches_release_their_keys():
+    async def main():
+        pool = KeyPool(["a", "b"])
+        client = AsyncSauceNao(pool, transport=FakeSauceNao(latency=0.2).async_transport())
+        for _ in range(5):
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(client.search(URL, from_url=True), 0.05)
+        await client.close()
+        return pool
+
+    assert is_all_released(asyncio.run(main()))
+
+
+def test_unexpected_errors_release_their_keys():
+    pool = KeyPool(["a", "b"])
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=b"not json"))
+    client = SauceNao(pool, transport=transport)
+    with pytest.raises(ValueError):
+        client.search(URL, from_url=True)
+    assert is_all_released(pool)
+
+
+def test_disabled_keys_are_reserved_too():
+    pool = KeyPool(["a", "b"])
+    for key in ("a", "b"):
+        pool.report_error(key, BadAPIKey("Bad key."))
+    assert pool.get_available_keys() == []
+    key = pool.select()
+    assert not is_released(pool, key)
+    pool.release(key)
+    assert is_all_released(pool)
@@ -0,0 +1,65 @@
+import copy
+
+import pytest
+
+from saucenaopie import SauceNao
+from saucenaopie.testing import FakeSauceNao, make_payload
+from saucenaopie.types.result import LazyResultList
+
+
+def make_client(**kwargs) -> SauceNao:
+    return SauceNao("api_key", transport=FakeSauceNao().transport(), lazy_results=True, **kwargs)
+
+
+def make_broken_response():
+    data = copy.deepcopy(make_payload(8))
+    data["results"][3]["data"]["year"] = None  # The fourth most similar result fails to parse
+    return make_client()._parse_response_data(data)
+
+
+def test_failed_result_in_the_middle():
+    response = make_broken_response()
+    results = response.results
+    assert results[3].index.id == 37  # The next one takes its place
+    assert len(results) == 7
+    assert [results[i].index.id for i in range(len(results))] == [5, 9, 41, 37, 34, 38, 39]
+    assert [result.index.id for result in results[2:4]] == [41, 37]
+    assert results[-1].index.id == 39
+    with pytest.raises(IndexError):
+        results[7]
+
+    response.materialize()
+    assert isinstance(response.results, list)
+    assert [result.index.id for result in response.results] == [5, 9, 41, 37, 34, 38, 39]
+
+
+@pytest.mark.parametrize("first_read", [len, list])
+def test_length_does_not_change(first_read):
+    results = make_broken_response().results
+    first_read(results)
+    assert len(results) == len(list(results)) == 7
+
+
+def test_only_the_read_results_are_built():
+    built = []
+
+    def builder(raw: dict) -> int:
+        built.append(raw)
+        return int(raw["header"]["index_id"])
+
+    results = LazyResultList(make_payload(8)["results"], builder)
+    assert results[0] == 5 and results[:2] == [5, 9] and results
+    assert len(built) == 2
+    assert results.filter(min_similarity=90) == [5, 9]
+    assert len(built) == 2
+
+    assert len(results) == 8 and len(built) == 8
+
+
+def test_serialization_matches_regular_responses():
+    data = make_payload(8)
+    lazy = make_client()._parse_response_data(data)
+    regular = SauceNao("api_key")._parse_response_data(data)
+    assert lazy.json() == regular.json()
+    assert lazy.dict() == regular.dict()
+    assert isinstance(lazy.results, list)
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from saucenaopie import AsyncSauceNao, SauceNao
+from saucenaopie.exceptions import ShortLimitReached
+from saucenaopie.limiter import RateLimiter
+from saucenaopie.testing import FakeSauceNao
+
+URL = "https://example.com/image.png"
+
+
+def test_requests_are_held_until_the_window_reopens():
+    fake = FakeSauceNao(short_limit=2, short_period=0.3)
+    client = SauceNao("api_key", transport=fake.transport(), rate_limiter=RateLimiter(0.3))
+    started = time.monotonic()
+    for _ in range(5):
+        assert client.search(URL, from_url=True).results
+    # Two windows were waited for, and SauceNao never answered with the limit error
+    assert 0.55 < time.monotonic() - started < 2
+    assert fake.request_count == 5
+
+
+def test_without_a_limiter_the_limit_is_reached():
+    fake = FakeSauceNao(short_limit=2, short_period=0.3)
+    client = SauceNao("api_key", transport=fake.transport())
+    for _ in range(2):
+        client.search(URL, from_url=True)
+    with pytest.raises(ShortLimitReached):
+        client.search(URL, from_url=True)
+
+
+def test_limit_reached_elsewhere_holds_the_next_request():
+    fake = FakeSauceNao(short_limit=1, short_period=0.3)
+    SauceNao("api_key", transport=fake.transport()).search(URL, from_url=True)
+
+    limiter = RateLimiter(short_period=0.3)
+    client = SauceNao("api_key", transport=fake.transport(), rate_limiter=limiter)
+    with pytest.raises(ShortLimitReached):
+        client.search(URL, from_url=True)
+    assert 0.2 < limiter.get_delay("api_key") <= 0.3
+    assert limiter.get_delay("another_key") == 0
+    assert client.search(URL, from_url=True).results  # Held, not rejected
+    assert fake.request_count == 3
+
+
+def test_window_is_shared_between_threads():
+    fake = FakeSauceNao(short_limit=3, short_period=0.3)
+    limiter = RateLimiter(short_period=0.3)
+    limiter.update("api_key", short_remaining=3, short_limit=3)
+    client = SauceNao("api_key", transport=fake.transport(), rate_limiter=limiter)
+    errors = []
+
+    def search() -> None:
+        try:
+            client.search(URL, from_url=True)
+        except ShortLimitReached as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=search) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == [] and fake.request_count == 6
+
+
+def test_async_requests_are_held():
+    async def main():
+        fake = FakeSauceNao(short_limit=2, short_period=0.3)
+        limiter = RateLimiter(short_period=0.3)
+        limiter.update("api_key", short_remaining=2, short_limit=2)
+        client = AsyncSauceNao("api_key", transport=fake.async_transport(), rate_limiter=limiter)
+        started = time.monotonic()
+        await asyncio.gather(*(client.search(URL, from_url=True) for _ in range(4)))
+        await client.close()
+        return time.monotonic() - started, fake.request_count
+
+    duration, request_count = asyncio.run(main())
+    assert 0.25 < duration < 2 and request_count == 4
+
+
+def test_long_remaining():
+    limiter = RateLimiter()
+    assert limiter.get_long_remaining("api_key") is None
+    limiter.update("api_key", short_remaining=3, short_limit=4, long_remaining=96)
+    assert limiter.get_long_remaining("api_key") == 96
+    assert limiter.get_delay("api_key") == 0
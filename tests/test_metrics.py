@@ -0,0 +1,80 @@
+import asyncio
+import copy
+import io
+
+import httpx
+import pytest
+
+from saucenaopie import AsyncSauceNao, SauceNao
+from saucenaopie.breaker import CircuitBreaker
+from saucenaopie.exceptions import CircuitOpen, ImageInvalid, QueueFull, UnknownServerError
+from saucenaopie.fairqueue import FairQueue
+from saucenaopie.metrics import MetricsCollector, to_prometheus_text
+from saucenaopie.testing import FakeSauceNao, make_payload
+from saucenaopie.validation import UploadValidator
+
+URL = "https://example.com/image.png"
+
+
+@pytest.mark.parametrize("lazy_results", [False, True])
+def test_results_returned_include_skipped_results(lazy_results):
+    data = copy.deepcopy(make_payload(8))
+    data["results"][2]["data"]["twitter_user_handle"] = None  # Skipped by the parsing
+    metrics = MetricsCollector()
+    client = SauceNao(
+        "api_key",
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, json=data)),
+        metrics=metrics,
+        lazy_results=lazy_results,
+    )
+    response = client.search(URL, from_url=True)
+    assert len(list(response.results)) == 7
+    assert metrics.snapshot()["results_returned"] == 8
+    assert "saucenaopie_results_returned_total 8\n" in to_prometheus_text(metrics)
+
+
+def test_circuit_open_is_counted():
+    metrics = MetricsCollector()
+    client = SauceNao(
+        "api_key",
+        transport=httpx.MockTransport(lambda request: httpx.Response(503)),
+        metrics=metrics,
+        circuit_breaker=CircuitBreaker(failure_threshold=1),
+    )
+    with pytest.raises(UnknownServerError):
+        client.search(URL, from_url=True)
+    with pytest.raises(CircuitOpen):
+        client.search(URL, from_url=True)
+    errors = metrics.snapshot()["errors"]
+    assert errors["UnknownServerError"] == errors["CircuitOpen"] == 1
+    assert metrics.snapshot()["requests"] == 1
+
+
+def test_rejected_uploads_are_counted():
+    metrics = MetricsCollector()
+    fake = FakeSauceNao()
+    client = SauceNao(
+        "api_key", transport=fake.transport(), metrics=metrics, validator=UploadValidator()
+    )
+    with pytest.raises(ImageInvalid):
+        client.search(io.BytesIO(b"not an image"))
+    assert metrics.snapshot()["errors"]["ImageInvalid"] == 1
+    assert fake.request_count == 0
+
+
+def test_queue_full_is_counted():
+    async def main():
+        metrics = MetricsCollector()
+        client = AsyncSauceNao(
+            "api_key", transport=FakeSauceNao(latency=0.05).async_transport(), metrics=metrics
+        )
+        queue = FairQueue(client, max_queued=0)
+        blocker = asyncio.ensure_future(queue.search("a", URL, from_url=True))
+        await asyncio.sleep(0)
+        with pytest.raises(QueueFull):
+            await queue.search("a", f"{URL}?1", from_url=True)
+        await blocker
+        await client.close()
+        return metrics.snapshot()["errors"]["QueueFull"]
+
+    assert asyncio.run(main()) == 1
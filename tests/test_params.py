@@ -0,0 +1,66 @@
+import httpx
+import pytest
+
+from saucenaopie import SauceNao
+from saucenaopie.helper import SauceIndex
+from saucenaopie.testing import FakeSauceNao
+
+URL = "https://example.com/image.png"
+
+
+def get_index_params(**kwargs) -> dict:
+    fake = FakeSauceNao(short_limit=100)
+    sent = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        sent.append(request.url.params)
+        return fake.handle(request)
+
+    client = SauceNao("api_key", transport=httpx.MockTransport(handle))
+    client.search(URL, from_url=True, **kwargs)
+    return {
+        key: int(value) for key, value in sent[0].items() if key in {"db", "dbmask", "dbmaski"}
+    }
+
+
+@pytest.mark.parametrize(
+    "kwargs, params",
+    [
+        ({}, {"db": SauceIndex.ALL}),
+        ({"index": SauceIndex.PIXIV}, {"db": 5}),
+        (
+            {"index": [SauceIndex.PIXIV, SauceIndex.DANBOORU, SauceIndex.TWITTER]},
+            {"dbmask": 1 << 5 | 1 << 9 | 1 << 41},
+        ),
+        # Every index up to and including max_index
+        ({"max_index": SauceIndex.YANDERE}, {"dbmask": 0b1111111111111}),
+        ({"max_index": SauceIndex.H_MAGAZINES}, {"dbmask": 1}),
+        (
+            {"index": [SauceIndex.PIXIV, SauceIndex.TWITTER], "max_index": SauceIndex.YANDERE},
+            {"dbmask": 1 << 5},
+        ),
+        # Every index below min_index is disabled
+        ({"min_index": SauceIndex.DOUJINSHI_DB}, {"db": SauceIndex.ALL, "dbmaski": 0b111}),
+        ({"min_index": SauceIndex.H_MAGAZINES}, {"db": SauceIndex.ALL}),
+        (
+            {"max_index": SauceIndex.YANDERE, "min_index": SauceIndex.PIXIV},
+            {"dbmask": 0b1111111111111, "dbmaski": 0b11111},
+        ),
+        (
+            {"index": SauceIndex.TWITTER, "min_index": SauceIndex.PIXIV},
+            {"db": SauceIndex.TWITTER, "dbmaski": 0b11111},
+        ),
+    ],
+)
+def test_index_params(kwargs, params):
+    assert get_index_params(**kwargs) == params
+
+
+def test_no_index_below_max_index():
+    with pytest.raises(ValueError):
+        get_index_params(index=[SauceIndex.TWITTER], max_index=SauceIndex.YANDERE)
+
+
+def test_empty_index_set():
+    with pytest.raises(ValueError):
+        get_index_params(index=[])
@@ -0,0 +1,28 @@
+import copy
+
+import pytest
+
+from saucenaopie import SauceNao
+from saucenaopie.helper import SauceIndex
+from saucenaopie.testing import make_payload
+from saucenaopie.types.sauce import TwitterSauce, VideoSauce
+
+
+def parse(data: dict, **kwargs):
+    return SauceNao("api_key", **kwargs)._parse_response_data(data)
+
+
+@pytest.mark.parametrize(
+    "sauce_type, field",
+    [(VideoSauce, "year"), (VideoSauce, "est_time"), (TwitterSauce, "twitter_user_handle")],
+)
+def test_trusted_parsing_skips_the_same_results(sauce_type, field):
+    data = copy.deepcopy(make_payload(8))  # The payload shares the fake results
+    for result in data["results"]:
+        if SauceIndex.get_sauce_type(int(result["header"]["index_id"])) is sauce_type:
+            result["data"][field] = None
+
+    validated = parse(data)
+    trusted = parse(data, trusted_parsing=True)
+    assert len(validated.results) == len(trusted.results) < 8
+    assert validated.dict() == trusted.dict()
@@ -0,0 +1,103 @@
+import io
+import random
+import time
+
+import httpx
+import pytest
+
+from saucenaopie import SauceNao
+from saucenaopie.perceptual import BKTree, PerceptualIndex, get_hash_distance
+from saucenaopie.testing import FakeSauceNao
+
+PARAMS = {"db": 999, "numres": 8}
+
+
+class PartialSauceNao(FakeSauceNao):
+    """Answers with some of the indexes failing."""
+
+    def respond(self, request: httpx.Request, body=None) -> httpx.Response:
+        data = super().respond(request, body).json()
+        data["header"]["status"] = 1
+        return httpx.Response(200, json=data)
+
+
+def make_image(fmt: str) -> io.BytesIO:
+    image_module = pytest.importorskip("PIL.Image")
+    image = image_module.new("L", (64, 64))
+    image.putdata([(x * 4 + y) % 256 for y in range(64) for x in range(64)])
+    file = io.BytesIO()
+    image.save(file, fmt)
+    file.seek(0)
+    return file
+
+
+def test_tree_matches_brute_force():
+    rng = random.Random(1)
+    hashes = [rng.getrandbits(64) for _ in range(500)]
+    tree = BKTree()
+    for number, image_hash in enumerate(hashes):
+        tree.add(image_hash, number)
+
+    for _ in range(50):
+        query = hashes[rng.randrange(len(hashes))] ^ (1 << rng.randrange(64))
+        distance, _ = tree.find(query, 6)
+        assert distance == min(get_hash_distance(query, image_hash) for image_hash in hashes)
+
+
+def test_oldest_responses_are_evicted_by_size():
+    rng = random.Random(2)
+    hashes = [rng.getrandbits(64) for _ in range(1000)]
+    index = PerceptualIndex(max_distance=2, maxsize=100, ttl=None)
+    for number, image_hash in enumerate(hashes):
+        index.add(image_hash, PARAMS, f"response {number}")
+
+    assert len(index) == 100
+    assert index.evictions == 900
+    assert index.find(hashes[5], PARAMS) is None
+    assert all(index.find(image_hash, PARAMS) is not None for image_hash in hashes[900:])
+    assert index.find(hashes[950], PARAMS) == "response 950"
+
+
+def test_evicted_match_does_not_hide_a_live_one():
+    index = PerceptualIndex(max_distance=6, maxsize=1, ttl=None)
+    index.add(0b1, PARAMS, "evicted")
+    index.add(0b111, PARAMS, "kept")
+    assert index.find(0b1, PARAMS) == "kept"
+
+
+def test_expired_responses_are_evicted():
+    index = PerceptualIndex(ttl=0.05)
+    index.add(1, PARAMS, "response")
+    assert index.find(1, PARAMS) == "response"
+    time.sleep(0.1)
+    assert index.find(1, PARAMS) is None
+    assert len(index) == 0
+
+
+def test_near_duplicates_get_the_same_hash():
+    index = PerceptualIndex()
+    first = index.get_hash(make_image("PNG").getvalue())
+    second = index.get_hash(make_image("JPEG").getvalue())
+    assert first is not None and get_hash_distance(first, second) <= index.max_distance
+    assert index.get_hash(b"not an image") is None
+
+
+def test_near_duplicate_upload_is_served_from_the_index():
+    fake = FakeSauceNao()
+    client = SauceNao("api_key", transport=fake.transport(), perceptual_index=PerceptualIndex())
+    first = client.search(make_image("PNG"))
+    second = client.search(make_image("JPEG"))  # Re-encoded, so the bytes differ
+    assert not first.from_cache and second.from_cache
+    assert second.results == first.results
+    assert fake.request_count == 1
+
+
+def test_partial_responses_are_not_stored():
+    fake = PartialSauceNao()
+    index = PerceptualIndex()
+    client = SauceNao(
+        "api_key", transport=fake.transport(), perceptual_index=index, allow_partial_success=True
+    )
+    assert client.search(make_image("PNG")).partial
+    assert not client.search(make_image("PNG")).from_cache
+    assert len(index) == 0 and fake.request_count == 2
@@ -0,0 +1,77 @@
+import asyncio
+import io
+import random
+
+import httpx
+import pytest
+
+from saucenaopie import AsyncSauceNao, SauceNao
+from saucenaopie.preprocess import ImagePreprocessor
+from saucenaopie.testing import FakeSauceNao
+
+Image = pytest.importorskip("PIL.Image")
+
+
+class UploadLog(FakeSauceNao):
+    def __init__(self) -> None:
+        super().__init__()
+        self.uploads = []
+
+    def respond(self, request: httpx.Request, body=None) -> httpx.Response:
+        self.uploads.append(request.content if body is None else body)
+        return super().respond(request, body)
+
+
+def make_image(width: int = 1200, height: int = 900) -> bytes:
+    rng = random.Random(1)
+    image = Image.new("L", (width, height))
+    image.putdata([rng.randrange(256) for _ in range(width * height)])
+    file = io.BytesIO()
+    image.save(file, "PNG")
+    return file.getvalue()
+
+
+@pytest.fixture(scope="module")
+def large_image() -> bytes:
+    return make_image()
+
+
+def test_large_images_are_shrunk(large_image):
+    processed = ImagePreprocessor(max_side=600).process(large_image)
+    assert len(processed) < len(large_image)
+    with Image.open(io.BytesIO(processed)) as image:
+        assert image.format == "JPEG" and image.size == (600, 450)
+
+
+def test_small_and_broken_files_are_kept():
+    preprocessor = ImagePreprocessor(min_bytes=1024)
+    small = make_image(16, 16)
+    assert preprocessor.process(small) == small
+    broken = b"not an image" * 1024
+    assert preprocessor.process(broken) == broken
+
+
+def test_output_is_never_larger():
+    image = Image.new("RGB", (64, 64), "white")
+    file = io.BytesIO()
+    image.save(file, "PNG")
+    content = file.getvalue()  # A flat PNG is smaller than any JPEG of it
+    assert ImagePreprocessor(min_bytes=None).process(content) == content
+
+
+def test_clients_upload_the_processed_image(large_image):
+    fake = UploadLog()
+    client = SauceNao("api_key", transport=fake.transport(), preprocessor=ImagePreprocessor())
+    assert client.search(io.BytesIO(large_image)).results
+
+    async def main():
+        client = AsyncSauceNao(
+            "api_key", transport=fake.async_transport(), preprocessor=ImagePreprocessor()
+        )
+        await client.search(io.BytesIO(large_image))
+        await client.close()
+
+    asyncio.run(main())
+    assert len(fake.uploads) == 2
+    for upload in fake.uploads:
+        assert len(upload) < len(large_image) and b"\xff\xd8\xff" in upload
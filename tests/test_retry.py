@@ -0,0 +1,133 @@
+import io
+import time
+
+import httpx
+import pytest
+
+from saucenaopie import SauceNao
+from saucenaopie.exceptions import (
+    BadAPIKey,
+    LongLimitReached,
+    ShortLimitReached,
+    UnknownServerError,
+)
+from saucenaopie.keys import KeyPool
+from saucenaopie.limiter import RateLimiter
+from saucenaopie.retry import RetryPolicy
+from saucenaopie.testing import FakeSauceNao
+
+URL = "https://example.com/image.png"
+IMAGE = b"image bytes " * 64
+
+
+def make_limit_error(error_type=ShortLimitReached):
+    return error_type(
+        "Limit reached.", long_remaining=10, short_remaining=0, long_limit=100, short_limit=4
+    )
+
+
+class FailingSauceNao(FakeSauceNao):
+    """Answers the first searches with server errors and records every upload."""
+
+    def __init__(self, failures: int, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.failures = failures
+        self.uploads = []
+
+    def respond(self, request: httpx.Request, body=None) -> httpx.Response:
+        self.uploads.append(request.content if body is None else body)
+        if len(self.uploads) <= self.failures:
+            return httpx.Response(503)
+        return super().respond(request, body)
+
+
+def test_backoff():
+    policy = RetryPolicy(max_attempts=5, backoff=1, max_backoff=3, jitter=0, retry_budget=None)
+    error = UnknownServerError("Down.")
+    assert [policy.get_delay(attempt, error) for attempt in range(1, 6)] == [1, 2, 3, 3, None]
+
+
+def test_jitter_shortens_the_delay():
+    policy = RetryPolicy(backoff=1, jitter=0.5, retry_budget=None)
+    delays = [policy.get_delay(1, httpx.ReadTimeout("Timeout.")) for _ in range(20)]
+    assert all(0.5 <= delay <= 1 for delay in delays)
+
+
+@pytest.mark.parametrize(
+    "error",
+    [make_limit_error(LongLimitReached), BadAPIKey("Bad key."), httpx.ConnectError("Reset.")],
+)
+def test_permanent_errors_are_not_retried(error):
+    assert RetryPolicy().get_delay(1, error) is None
+
+
+def test_network_errors_are_opt_in():
+    policy = RetryPolicy(backoff=1, jitter=0, retry_network_errors=True)
+    assert policy.get_delay(1, httpx.ConnectError("Reset.")) == 1
+
+
+def test_retry_budget():
+    policy = RetryPolicy(max_attempts=10, backoff=0, retry_budget=2, budget_period=60)
+    error = UnknownServerError("Down.")
+    assert [policy.get_delay(1, error) for _ in range(3)] == [0, 0, None]
+
+
+def test_short_limit_waits_for_the_window():
+    policy = RetryPolicy(backoff=1, short_period=30)
+    error = make_limit_error()
+    assert policy.get_delay(1, error, window_delay=0) == 0
+    assert 5 <= policy.get_delay(1, error, window_delay=5) <= 6
+    assert 30 <= policy.get_delay(1, error) <= 31
+
+
+def test_server_errors_are_retried_with_the_stream_rewound():
+    fake = FailingSauceNao(failures=2)
+    client = SauceNao(
+        "api_key", transport=fake.transport(), retry_policy=RetryPolicy(backoff=0.01)
+    )
+    assert client.search(io.BytesIO(IMAGE)).results
+    assert len(fake.uploads) == 3
+    assert all(IMAGE in upload for upload in fake.uploads)
+
+
+def test_network_errors_are_not_resent():
+    sent = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        sent.append(request)
+        raise httpx.ReadError("Connection reset.")
+
+    client = SauceNao(
+        "api_key", transport=httpx.MockTransport(handle), retry_policy=RetryPolicy(backoff=0)
+    )
+    with pytest.raises(httpx.ReadError):
+        client.search(URL, from_url=True)
+    assert len(sent) == 1
+
+
+def spend_the_window(fake: FakeSauceNao, api_key: str) -> None:
+    SauceNao(api_key, transport=fake.transport()).search(URL, from_url=True)
+
+
+def test_short_limit_tries_another_key():
+    fake = FakeSauceNao(short_limit=1)
+    spend_the_window(fake, "a")  # Another client used up the window of the first key
+    client = SauceNao(KeyPool(["a", "b"]), transport=fake.transport(), retry_policy=RetryPolicy())
+    started = time.monotonic()
+    assert client.search(URL, from_url=True).results
+    assert time.monotonic() - started < 1
+    assert fake.request_count == 3
+
+
+def test_short_limit_waits_for_the_limiter_window():
+    fake = FakeSauceNao(short_limit=1, short_period=0.3)
+    spend_the_window(fake, "a")
+    client = SauceNao(
+        "a",
+        transport=fake.transport(),
+        rate_limiter=RateLimiter(short_period=0.3),
+        retry_policy=RetryPolicy(backoff=0.01),
+    )
+    started = time.monotonic()
+    assert client.search(URL, from_url=True).results
+    assert 0.25 < time.monotonic() - started < 2  # Not the default 30 seconds
@@ -0,0 +1,116 @@
+import asyncio
+import time
+
+from saucenaopie import AsyncSauceNao
+from saucenaopie.cache import MemoryCache
+from saucenaopie.scheduler import BudgetScheduler, Priority
+from saucenaopie.testing import FakeSauceNao
+
+URL = "https://example.com/image.png"
+
+
+def make_scheduler(fake: FakeSauceNao, **kwargs) -> BudgetScheduler:
+    client_kwargs = {"cache": kwargs.pop("cache")} if "cache" in kwargs else {}
+    client = AsyncSauceNao("api_key", transport=fake.async_transport(), **client_kwargs)
+    return BudgetScheduler(client, **kwargs)
+
+
+async def search_timed(scheduler: BudgetScheduler, url: str, finished: list, **kwargs) -> None:
+    await scheduler.search(url, from_url=True, **kwargs)
+    finished.append((url, time.monotonic()))
+
+
+def test_searches_are_paced_over_the_window():
+    async def main():
+        fake = FakeSauceNao(short_limit=100, long_limit=5)
+        scheduler = make_scheduler(fake, headroom=0, period=1.0, long_limit=5)
+        finished = []
+        started = time.monotonic()
+        await asyncio.gather(
+            *(search_timed(scheduler, f"{URL}?{number}", finished) for number in range(4))
+        )
+        await scheduler.client.close()
+        return [moment - started for _, moment in finished]
+
+    moments = asyncio.run(main())
+    assert moments[0] < 0.1  # The first one is released right away
+    gaps = [second - first for first, second in zip(moments, moments[1:])]
+    assert all(gap > 0.15 for gap in gaps), gaps  # 5 searches over 1 second
+
+
+def test_priority_order():
+    async def main():
+        fake = FakeSauceNao(short_limit=100, long_limit=10)
+        scheduler = make_scheduler(fake, headroom=0.1, period=2.0, long_limit=10)
+        finished = []
+        queued = [
+            search_timed(scheduler, f"{URL}?low1", finished, priority=Priority.LOW),
+            search_timed(scheduler, f"{URL}?normal1", finished),
+            search_timed(scheduler, f"{URL}?low2", finished, priority=Priority.LOW),
+            search_timed(scheduler, f"{URL}?normal2", finished),
+        ]
+        tasks = [asyncio.ensure_future(coroutine) for coroutine in queued]
+        await asyncio.sleep(0.05)  # The first queued search is released by now
+        await search_timed(scheduler, f"{URL}?high", finished, priority=Priority.HIGH)
+        await asyncio.gather(*tasks)
+        await scheduler.client.close()
+        return [url.rsplit("?", 1)[1] for url, _ in finished]
+
+    assert asyncio.run(main()) == ["normal1", "high", "normal2", "low1", "low2"]
+
+
+def test_cancelled_probe_releases_the_queue():
+    async def main():
+        fake = FakeSauceNao(latency=0.05)
+        scheduler = make_scheduler(fake)  # The budget is unknown, the first search probes it
+        first = asyncio.ensure_future(scheduler.search(f"{URL}?1", from_url=True))
+        second = asyncio.ensure_future(scheduler.search(f"{URL}?2", from_url=True))
+        while fake.request_count == 0:  # The probe is in flight
+            await asyncio.sleep(0)
+        first.cancel()
+
+        response = await asyncio.wait_for(second, 2)
+        await scheduler.client.close()
+        return first, response, scheduler
+
+    first, response, scheduler = asyncio.run(main())
+    assert first.cancelled()
+    assert response.account_info.long_remaining == scheduler.long_remaining
+    assert scheduler.pacing_rate is not None and scheduler.queue_depth == 0
+
+
+def test_cancelled_queued_search_is_skipped():
+    async def main():
+        fake = FakeSauceNao(short_limit=100, long_limit=10)
+        scheduler = make_scheduler(fake, headroom=0, period=2.0, long_limit=10)
+        tasks = [
+            asyncio.ensure_future(scheduler.search(f"{URL}?{number}", from_url=True))
+            for number in range(3)
+        ]
+        await asyncio.sleep(0.05)
+        tasks[1].cancel()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        await scheduler.client.close()
+        return results, fake.request_count
+
+    results, request_count = asyncio.run(main())
+    assert isinstance(results[1], asyncio.CancelledError)
+    assert request_count == 2
+
+
+def test_cached_responses_do_not_spend_the_budget():
+    async def main():
+        fake = FakeSauceNao(short_limit=100, long_limit=50)
+        scheduler = make_scheduler(fake, cache=MemoryCache(), period=10.0, long_limit=50)
+        first = await scheduler.search(URL, from_url=True)
+        await scheduler.search(f"{URL}?other", from_url=True)
+        remaining = scheduler.long_remaining
+        # The cached response still says 49 searches are left
+        second = await scheduler.search(URL, from_url=True, priority=Priority.HIGH)
+        third = await scheduler.search(URL, from_url=True)
+        await scheduler.client.close()
+        return first, second, third, remaining, scheduler.long_remaining
+
+    first, second, third, remaining, final_remaining = asyncio.run(main())
+    assert not first.from_cache and second.from_cache and third.from_cache
+    assert remaining == final_remaining == 48
@@ -0,0 +1,167 @@
+import asyncio
+import itertools
+import threading
+import time
+
+import httpx
+import pytest
+
+from saucenaopie import AsyncSauceNao, SauceNao
+from saucenaopie.exceptions import UnknownServerError
+from saucenaopie.testing import FakeSauceNao
+
+URL = "https://example.com/image.png"
+
+
+class SlowSauceNao(FakeSauceNao):
+    """Takes longer to answer the earlier files and fails the ones marked as bad."""
+
+    def __init__(self) -> None:
+        super().__init__(short_limit=1000)
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self._start()
+        try:
+            time.sleep(self._get_delay(request))
+        finally:
+            self._finish()
+        return self.respond(request)
+
+    async def async_handle(self, request: httpx.Request, body=None) -> httpx.Response:
+        self._start()
+        try:
+            await asyncio.sleep(self._get_delay(request))
+        finally:
+            self._finish()
+        return self.respond(request, body)
+
+    def respond(self, request: httpx.Request, body=None) -> httpx.Response:
+        if "bad" in request.url.params["url"]:
+            return httpx.Response(503)
+        return super().respond(request, body)
+
+    def _start(self) -> None:
+        with self._lock:
+            self.request_count += 1
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+
+    def _finish(self) -> None:
+        with self._lock:
+            self.running -= 1
+
+    @staticmethod
+    def _get_delay(request: httpx.Request) -> float:
+        number = int(request.url.params["url"].rpartition("=")[2])
+        return 0.02 * (5 - number % 5)
+
+
+def make_urls(count=None):
+    numbers = range(count) if count is not None else itertools.count()
+    return (f"{URL}?n={number}" for number in numbers)
+
+
+def run_async(fake: SlowSauceNao, files, limit=None, **kwargs) -> list:
+    async def main():
+        client = AsyncSauceNao("api_key", transport=fake.async_transport())
+        found = []
+        results = client.search_many(files, from_url=True, **kwargs)
+        async for file, result in results:
+            found.append((file, result))
+            if len(found) == limit:
+                break
+        await results.aclose()
+        await client.close()
+        return found
+
+    return asyncio.run(main())
+
+
+def run_sync(fake: SlowSauceNao, files, limit=None, **kwargs) -> list:
+    client = SauceNao("api_key", transport=fake.transport())
+    found = []
+    results = client.search_many(files, from_url=True, **kwargs)
+    for file, result in results:
+        found.append((file, result))
+        if len(found) == limit:
+            break
+    results.close()
+    client.close()
+    return found
+
+
+def test_async_concurrency_is_bounded():
+    fake = SlowSauceNao()
+    found = run_async(fake, make_urls(10), concurrency=3)
+    assert sorted(file for file, _ in found) == sorted(make_urls(10))
+    assert all(result.results for _, result in found)
+    assert fake.max_running == 3
+
+
+def test_async_results_are_yielded_as_they_finish():
+    found = run_async(SlowSauceNao(), make_urls(5), concurrency=5)
+    assert [file for file, _ in found] == list(make_urls(5))[::-1]
+
+
+def test_async_files_are_taken_lazily():
+    fake = SlowSauceNao()
+    found = run_async(fake, make_urls(), limit=4, concurrency=2)
+    assert len(found) == 4
+    assert fake.request_count <= 4 + 2
+
+
+def test_async_iterables_are_accepted():
+    async def generate():
+        for url in make_urls(4):
+            yield url
+
+    assert len(run_async(SlowSauceNao(), generate(), concurrency=2)) == 4
+
+
+def test_async_errors_are_yielded():
+    files = [f"{URL}?n=0", f"{URL}?bad&n=1", f"{URL}?n=2"]
+    found = dict(run_async(SlowSauceNao(), files))
+    assert isinstance(found[files[1]], UnknownServerError)
+    assert found[files[0]].results and found[files[2]].results
+
+
+def test_async_concurrency_must_be_positive():
+    with pytest.raises(ValueError):
+        run_async(SlowSauceNao(), make_urls(1), concurrency=0)
+
+
+def test_workers_are_bounded():
+    fake = SlowSauceNao()
+    found = run_sync(fake, make_urls(10), workers=3)
+    assert sorted(file for file, _ in found) == sorted(make_urls(10))
+    assert fake.max_running == 3
+
+
+@pytest.mark.parametrize("ordered", [False, True])
+def test_results_order(ordered):
+    found = run_sync(SlowSauceNao(), make_urls(5), workers=5, ordered=ordered)
+    expected = list(make_urls(5))
+    assert [file for file, _ in found] == (expected if ordered else expected[::-1])
+
+
+def test_files_are_taken_lazily():
+    fake = SlowSauceNao()
+    found = run_sync(fake, make_urls(), limit=4, workers=2, ordered=True)
+    assert [file for file, _ in found] == list(make_urls(4))
+    assert fake.request_count <= 4 + 2
+
+
+def test_errors_are_yielded():
+    files = [f"{URL}?n=0", f"{URL}?bad&n=1", f"{URL}?n=2"]
+    found = run_sync(SlowSauceNao(), files, ordered=True)
+    assert [file for file, _ in found] == files
+    assert isinstance(found[1][1], UnknownServerError)
+    assert found[0][1].results and found[2][1].results
+
+
+def test_workers_must_be_positive():
+    with pytest.raises(ValueError):
+        run_sync(SlowSauceNao(), make_urls(1), workers=0)
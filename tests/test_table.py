@@ -0,0 +1,68 @@
+import copy
+
+import pytest
+
+from saucenaopie import SauceNao, table
+from saucenaopie.table import ResultTable
+from saucenaopie.testing import make_payload
+from saucenaopie.types.sauce import BooruSauce
+
+
+def make_data() -> dict:
+    data = copy.deepcopy(make_payload(8))
+    data["results"][3]["data"]["year"] = None  # Skipped by the parsing
+    return data
+
+
+def make_table(**kwargs) -> ResultTable:
+    client = SauceNao("api_key", **kwargs)
+    return ResultTable.from_responses(client._parse_response_data(make_data()) for _ in range(2))
+
+
+@pytest.fixture(params=["numpy", "plain"])
+def backend(request, monkeypatch):
+    if request.param == "plain":
+        monkeypatch.setattr(table, "np", None)
+    else:
+        pytest.importorskip("numpy")
+
+
+def test_lazy_results_give_the_same_table():
+    regular = make_table()
+    assert len(regular) == 14 and regular.response_count == 2
+    assert list(make_table(lazy_results=True)) == list(regular)
+    assert list(make_table(lazy_results=True, trusted_parsing=True)) == list(regular)
+
+
+def test_rows(backend):
+    rows = list(make_table())
+    assert [row.response for row in rows] == [0] * 7 + [1] * 7
+    assert rows[0].index_id == 5 and rows[0].similarity == pytest.approx(93.27)
+    assert rows[0].url == rows[7].url == make_data()["results"][0]["data"]["ext_urls"][0]
+    min_similarity = SauceNao("api_key")._parse_response_data(make_data()).header.min_similarity
+    assert rows[0].min_similarity == pytest.approx(min_similarity)
+
+
+def test_likely_results(backend):
+    results = make_table()
+    likely = results.get_likely_results()
+    assert [row.index_id for row in likely] == [5, 9, 41, 37, 34] * 2
+    assert len(results.get_likely_results(must_have_url=True)) == 10
+
+
+def test_filters(backend):
+    results = make_table()
+    assert [row.index_id for row in results.filter_results_by_index([5, 41])] == [5, 41] * 2
+    assert len(results.filter_results_by_index(38)) == 0  # Below the min similarity
+    assert len(results.filter_results_by_index(38, above_min_similarity=False)) == 2
+    assert [row.index_id for row in results.filter_results_by_type(BooruSauce)] == [9, 9]
+
+
+def test_missing_url(backend):
+    rows = list(make_table().filter_results_by_index(38, above_min_similarity=False))
+    assert len(rows) == 2 and all(row.url is None for row in rows)
+
+
+def test_nbytes():
+    results = make_table()
+    assert results.nbytes == len(results) * 18
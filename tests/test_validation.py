@@ -0,0 +1,100 @@
+import asyncio
+import io
+import struct
+
+import pytest
+
+from saucenaopie import AsyncSauceNao, SauceNao
+from saucenaopie.exceptions import FileIsTooLarge, ImageInvalid
+from saucenaopie.testing import FakeSauceNao
+from saucenaopie.validation import ImageInfo, UploadValidator, sniff_image
+
+
+def make_png(width: int, height: int, size: int = 64) -> bytes:
+    head = (
+        b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + struct.pack(">II", width, height)
+    )
+    return head.ljust(size, b"\0")
+
+
+def make_jpeg(width: int, height: int) -> bytes:
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\0".ljust(14, b"\0")
+    frame = b"\xff\xc0" + struct.pack(">HBHH", 17, 8, height, width) + b"\0" * 10
+    return b"\xff\xd8" + app0 + frame + b"\0" * 32
+
+
+@pytest.mark.parametrize(
+    "head, info",
+    [
+        (make_png(640, 480), ImageInfo("PNG", 640, 480)),
+        (make_jpeg(800, 600), ImageInfo("JPEG", 800, 600)),
+        (b"GIF89a" + struct.pack("<HH", 32, 16) + b"\0" * 16, ImageInfo("GIF", 32, 16)),
+        (b"BM" + b"\0" * 16 + struct.pack("<ii", 10, -20) + b"\0" * 8, ImageInfo("BMP", 10, 20)),
+        (b"\x89PNG\r\n\x1a\n", ImageInfo("PNG", None, None)),  # Too short to have the size
+        (b"%PDF-1.7", None),
+    ],
+)
+def test_sniff_image(head, info):
+    assert sniff_image(head) == info
+
+
+def test_size_limit():
+    validator = UploadValidator(max_bytes=100)
+    assert validator.validate(make_png(1, 1), 100).format == "PNG"
+    with pytest.raises(FileIsTooLarge):
+        validator.validate(make_png(1, 1), 101)
+
+
+@pytest.mark.parametrize(
+    "head",
+    [b"%PDF-1.7" + b"\0" * 64, make_png(0, 10), b"\xff\xd8\xff\xd9" + b"\0" * 16],
+    ids=["not an image", "empty png", "jpeg without a frame"],
+)
+def test_invalid_images(head):
+    with pytest.raises(ImageInvalid):
+        UploadValidator().validate(head, len(head))
+
+
+def test_formats_and_dimensions():
+    with pytest.raises(ImageInvalid):
+        UploadValidator(formats=["jpeg"]).validate(make_png(1, 1), 64)
+    validator = UploadValidator(max_pixels=100 * 100)
+    assert validator.validate(make_jpeg(100, 100), 64).width == 100
+    with pytest.raises(ImageInvalid):
+        validator.validate(make_jpeg(101, 100), 64)
+
+
+def test_files_are_checked_in_place(tmp_path):
+    path = tmp_path / "image.png"
+    path.write_bytes(make_png(2, 2, size=200))
+    validator = UploadValidator(max_bytes=150)
+    with pytest.raises(FileIsTooLarge):
+        validator.validate_file(path)
+
+    stream = io.BytesIO(b"prefix" + make_png(2, 2, size=100))
+    stream.seek(6)
+    assert validator.validate_file(stream).format == "PNG"  # Only the part left is counted
+    assert stream.tell() == 6
+
+
+def test_rejected_uploads_are_not_sent():
+    fake = FakeSauceNao()
+    client = SauceNao("api_key", transport=fake.transport(), validator=UploadValidator())
+    with pytest.raises(ImageInvalid):
+        client.search(io.BytesIO(b"not an image" * 16))
+    assert client.search(io.BytesIO(make_png(64, 64))).results
+    assert fake.request_count == 1
+
+
+def test_async_rejected_uploads_are_not_sent():
+    async def main():
+        fake = FakeSauceNao()
+        client = AsyncSauceNao(
+            "api_key", transport=fake.async_transport(), validator=UploadValidator(max_bytes=10)
+        )
+        with pytest.raises(FileIsTooLarge):
+            await client.search(io.BytesIO(make_png(64, 64)))
+        await client.close()
+        return fake.request_count
+
+    assert asyncio.run(main()) == 0